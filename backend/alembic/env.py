@@ -20,10 +20,14 @@ from app.models.dietary import (  # noqa: F401
 )
 from app.models.google_calendar import GoogleCalendarConnection  # noqa: F401
 from app.models.meal import Meal, ScheduleItemAlternative  # noqa: F401
+from app.models.meal_plan_job import MealPlanJob  # noqa: F401
 from app.models.progress import (  # noqa: F401
     UserArchivedGoal,
     UserWeightLog,
 )
+from app.models.recipe_cache import RecipePoolCacheEntry  # noqa: F401
+from app.models.recipe_catalog import CatalogRecipe  # noqa: F401
+from app.models.recipe_detail import RecipeDetailEntry  # noqa: F401
 from app.models.schedule import ScheduleItem  # noqa: F401
 from app.models.user import User  # noqa: F401
 
@@ -0,0 +1,60 @@
+"""add_meal_plan_jobs
+
+Postgres-backed queue for asynchronous generate-week requests. A partial
+unique index keeps at most one pending job per (user, week).
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-17 02:00:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, Sequence[str], None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'meal_plan_jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('week_start_date', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_meal_plan_jobs_user_id'), 'meal_plan_jobs', ['user_id'], unique=False
+    )
+    op.create_index(
+        'ix_meal_plan_jobs_status_created_at',
+        'meal_plan_jobs',
+        ['status', 'created_at'],
+        unique=False,
+    )
+    op.create_index(
+        'uq_meal_plan_jobs_pending_user_week',
+        'meal_plan_jobs',
+        ['user_id', 'week_start_date'],
+        unique=True,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_meal_plan_jobs_pending_user_week', table_name='meal_plan_jobs')
+    op.drop_index('ix_meal_plan_jobs_status_created_at', table_name='meal_plan_jobs')
+    op.drop_index(op.f('ix_meal_plan_jobs_user_id'), table_name='meal_plan_jobs')
+    op.drop_table('meal_plan_jobs')
@@ -0,0 +1,41 @@
+"""add_recipe_details
+
+Persistent cache of recipe details fetched on demand from Spoonacular's
+information endpoints for /recipes.
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17 03:00:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, Sequence[str], None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'recipe_details',
+        sa.Column('recipe_id', sa.String(), nullable=False),
+        sa.Column('detail', sa.JSON(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('recipe_id'),
+    )
+    op.create_index(
+        op.f('ix_recipe_details_expires_at'),
+        'recipe_details',
+        ['expires_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_recipe_details_expires_at'), table_name='recipe_details')
+    op.drop_table('recipe_details')
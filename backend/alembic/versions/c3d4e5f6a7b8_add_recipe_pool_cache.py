@@ -0,0 +1,42 @@
+"""add_recipe_pool_cache
+
+Persistent tier of the Spoonacular recipe-pool cache. Rows are keyed by a
+hash of the canonical complexSearch params and expire after a TTL.
+
+Revision ID: c3d4e5f6a7b8
+Revises: b1c2d3e4f5a6
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, Sequence[str], None] = 'b1c2d3e4f5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'recipe_pool_cache',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('results', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index(
+        op.f('ix_recipe_pool_cache_expires_at'),
+        'recipe_pool_cache',
+        ['expires_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_recipe_pool_cache_expires_at'), table_name='recipe_pool_cache')
+    op.drop_table('recipe_pool_cache')
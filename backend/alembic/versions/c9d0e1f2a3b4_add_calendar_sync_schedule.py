@@ -0,0 +1,43 @@
+"""add_calendar_sync_schedule
+
+Columns the background calendar sync scheduler walks: the client's UTC
+offset for syncs run without a request, the consecutive failure count for
+backoff, and when each connection is next due.
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-17 04:00:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, Sequence[str], None] = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'google_calendar_connections',
+        sa.Column(
+            'utc_offset_minutes', sa.Integer(), server_default='0', nullable=False
+        ),
+    )
+    op.add_column(
+        'google_calendar_connections',
+        sa.Column('sync_failures', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'google_calendar_connections',
+        sa.Column('next_sync_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('google_calendar_connections', 'next_sync_at')
+    op.drop_column('google_calendar_connections', 'sync_failures')
+    op.drop_column('google_calendar_connections', 'utc_offset_minutes')
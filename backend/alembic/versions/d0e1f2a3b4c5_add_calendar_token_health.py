@@ -0,0 +1,38 @@
+"""add_calendar_token_health
+
+Record Google token health on the connection (token_valid_at,
+needs_reconnect) so /calendar/google/status is a plain read instead of a
+Clerk round trip.
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17 05:00:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, Sequence[str], None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'google_calendar_connections',
+        sa.Column('token_valid_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        'google_calendar_connections',
+        sa.Column(
+            'needs_reconnect', sa.Boolean(), server_default=sa.false(), nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('google_calendar_connections', 'needs_reconnect')
+    op.drop_column('google_calendar_connections', 'token_valid_at')
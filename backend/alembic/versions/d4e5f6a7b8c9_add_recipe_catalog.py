@@ -0,0 +1,71 @@
+"""add_recipe_catalog
+
+Deduplicated local catalog of Spoonacular recipes (unique on recipe_id)
+with btree indexes on the macro columns and GIN indexes on the tag arrays,
+so recipe pools can be answered locally instead of via complexSearch.
+
+Not backfilled from meals: meals.tags mixes diets, dish types and cuisines
+into one list, which the catalog filters cannot tell apart. The catalog
+fills from live pool fetches instead.
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-17 00:10:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, Sequence[str], None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_MACRO_COLUMNS = ['calories', 'protein', 'carbohydrates', 'fat']
+_TAG_COLUMNS = ['diets', 'dish_types', 'cuisines', 'safe_intolerances']
+
+
+def upgrade() -> None:
+    op.create_table(
+        'recipe_catalog',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('recipe_id', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('image_url', sa.String(), nullable=True),
+        sa.Column('source_url', sa.String(), nullable=True),
+        sa.Column('ready_in_minutes', sa.Integer(), nullable=True),
+        sa.Column('calories', sa.Integer(), nullable=False),
+        sa.Column('protein', sa.Integer(), nullable=False),
+        sa.Column('carbohydrates', sa.Integer(), nullable=False),
+        sa.Column('fat', sa.Integer(), nullable=False),
+        sa.Column('ingredients', sa.JSON(), nullable=False),
+        sa.Column('diets', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('dish_types', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('cuisines', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('safe_intolerances', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('recipe_id'),
+    )
+    for column in _MACRO_COLUMNS:
+        op.create_index(
+            op.f(f'ix_recipe_catalog_{column}'), 'recipe_catalog', [column], unique=False
+        )
+    for column in _TAG_COLUMNS:
+        op.create_index(
+            f'ix_recipe_catalog_{column}',
+            'recipe_catalog',
+            [column],
+            unique=False,
+            postgresql_using='gin',
+        )
+
+
+def downgrade() -> None:
+    for column in _TAG_COLUMNS + _MACRO_COLUMNS:
+        op.drop_index(f'ix_recipe_catalog_{column}', table_name='recipe_catalog')
+    op.drop_table('recipe_catalog')
@@ -0,0 +1,78 @@
+"""dedupe_shared_meals
+
+Spoonacular (non-custom) meals become content-addressed by recipe_id.
+
+One-off compaction: for every recipe_id with several non-custom meal rows,
+keep the newest row, re-point schedules.meal_id and
+schedule_item_alternatives.meal_id at it, drop alternative rows that became
+duplicates, and delete the rest. Then add a partial unique index so plan
+persistence can upsert with INSERT ... ON CONFLICT.
+
+The downgrade only drops the index; merged rows are not split back out.
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-17 00:20:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, Sequence[str], None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_DUPLICATES = """
+    CREATE TEMPORARY TABLE meal_duplicates ON COMMIT DROP AS
+    SELECT id, keeper_id
+    FROM (
+        SELECT id, MAX(id) OVER (PARTITION BY recipe_id) AS keeper_id
+        FROM meals
+        WHERE NOT is_custom AND recipe_id IS NOT NULL
+    ) ranked
+    WHERE id <> keeper_id
+"""
+
+
+def upgrade() -> None:
+    op.execute(_DUPLICATES)
+    op.execute(
+        """
+        UPDATE schedules s
+        SET meal_id = d.keeper_id
+        FROM meal_duplicates d
+        WHERE s.meal_id = d.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE schedule_item_alternatives a
+        SET meal_id = d.keeper_id
+        FROM meal_duplicates d
+        WHERE a.meal_id = d.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM schedule_item_alternatives a
+        USING schedule_item_alternatives b
+        WHERE a.schedule_item_id = b.schedule_item_id
+          AND a.meal_id = b.meal_id
+          AND a.id > b.id
+        """
+    )
+    op.execute("DELETE FROM meals m USING meal_duplicates d WHERE m.id = d.id")
+    op.create_index(
+        'uq_meals_shared_recipe_id',
+        'meals',
+        ['recipe_id'],
+        unique=True,
+        postgresql_where=sa.text('NOT is_custom AND recipe_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_meals_shared_recipe_id', table_name='meals')
@@ -0,0 +1,70 @@
+"""add_schedule_indexes
+
+Index the schedules access paths: (user_id, date) for the week / range
+reads and plan persistence, a partial (user_id, date) index over imported
+Google Calendar blocks for calendar sync, and source_schedule_item_id for
+the leftover lookups in swap / delete.
+
+Built CONCURRENTLY so the table stays writable while they build.
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17 01:00:00.000000
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, Sequence[str], None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_schedules_user_id_date',
+            'schedules',
+            ['user_id', 'date'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_schedules_google_user_id_date',
+            'schedules',
+            ['user_id', 'date'],
+            postgresql_where=sa.text("source_type = 'google_calendar'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f('ix_schedules_source_schedule_item_id'),
+            'schedules',
+            ['source_schedule_item_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_schedules_source_schedule_item_id'),
+            table_name='schedules',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_schedules_google_user_id_date',
+            table_name='schedules',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_schedules_user_id_date',
+            table_name='schedules',
+            postgresql_concurrently=True,
+        )
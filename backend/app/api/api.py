@@ -1,9 +1,11 @@
 from fastapi import APIRouter
 
 from app.api.endpoints import (
+    admin,
     google_calendar,
     meal_plans,
     progress,
+    recipes,
     schedules,
     users,
 )
@@ -12,6 +14,7 @@ api_router = APIRouter()
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(schedules.router, prefix="/schedules", tags=["schedules"])
 api_router.include_router(meal_plans.router, prefix="/meal-plans", tags=["meal-plans"])
+api_router.include_router(recipes.router, prefix="/recipes", tags=["recipes"])
 api_router.include_router(
     progress.router, prefix="/users/me/progress", tags=["progress"]
 )
@@ -20,3 +23,4 @@ api_router.include_router(
     prefix="/calendar/google",
     tags=["calendar"],
 )
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
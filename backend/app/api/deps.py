@@ -1,25 +1,53 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.security import AuthError, get_token_verifier
 from app.db.session import get_db
 from app.models.user import User
+from app.schemas.user import UserRead
 
 bearer = HTTPBearer()
 
+# Flattened profiles keyed by Clerk user id (the token's "sub"). Per process,
+# so another instance may serve a profile up to the TTL old after an update.
+_profile_cache: TTLCache[str, UserRead] = TTLCache(
+    max_entries=settings.USER_PROFILE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.USER_PROFILE_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user_profile(user_id: str) -> None:
+    """Drop the cached profile; call after any write to the user's profile."""
+    _profile_cache.pop(user_id)
+
+
+def _user_id_from_payload(payload: dict) -> str:
+    user_id = payload.get("sub")
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
+        )
+    return user_id
+
+
+def _user_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
 
 async def get_auth_payload(
     token: HTTPAuthorizationCredentials = Depends(bearer),
 ) -> dict:
     try:
-        payload = jwt.decode(
-            token.credentials, key=settings.CLERK_PEM_PUBLIC_KEY, algorithms=["RS256"]
-        )
-    except JWTError as e:
+        payload = await get_token_verifier().verify(token.credentials)
+    except (JWTError, AuthError) as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -34,14 +62,11 @@ async def get_current_user(
     """
     Validates the Bearer token and returns the current user with
     dietary relationships eagerly loaded.
-    Note: Signature verification is currently skipped for prototype speed.
-    In production, use Clerk's JWKS to verify signature.
+
+    Use this only when the endpoint mutates the ORM row; read-only endpoints
+    should depend on get_current_user_profile or get_current_user_id.
     """
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
-        )
+    user_id = _user_id_from_payload(payload)
 
     stmt = (
         select(User)
@@ -57,7 +82,58 @@ async def get_current_user(
     user = result.scalar_one_or_none()
 
     if not user:
+        raise _user_not_found()
+    return user
+
+
+async def get_current_user_profile(
+    db: AsyncSession = Depends(get_db),
+    payload: dict = Depends(get_auth_payload),
+) -> UserRead:
+    """
+    The current user's flattened profile, served from a short-TTL cache.
+
+    A miss loads the user exactly like get_current_user. Unknown users are
+    not cached, so a freshly created account is visible immediately.
+    """
+    user_id = _user_id_from_payload(payload)
+    cached = _profile_cache.get(user_id)
+    if cached is not None:
+        return cached.model_copy(deep=True)
+
+    user = await get_current_user(db=db, payload=payload)
+    profile = UserRead.model_validate(user)
+    _profile_cache.set(user_id, profile.model_copy(deep=True))
+    return profile
+
+
+async def get_current_user_id(
+    db: AsyncSession = Depends(get_db),
+    payload: dict = Depends(get_auth_payload),
+) -> str:
+    """
+    The current user's id, for endpoints that only need ownership checks.
+
+    Answered from the profile cache when possible, otherwise a single
+    primary-key lookup with no relationship loading.
+    """
+    user_id = _user_id_from_payload(payload)
+    if user_id in _profile_cache:
+        return user_id
+
+    result = await db.execute(select(User.id).where(User.id == user_id))
+    if result.scalar_one_or_none() is None:
+        raise _user_not_found()
+    return user_id
+
+
+async def require_admin_api_key(
+    x_admin_api_key: str | None = Header(default=None),
+) -> None:
+    """Guards /admin endpoints; they stay closed while ADMIN_API_KEY is unset."""
+    if not settings.ADMIN_API_KEY or not hmac.compare_digest(
+        (x_admin_api_key or "").encode(), settings.ADMIN_API_KEY.encode()
+    ):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
         )
-    return user
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db, require_admin_api_key
+from app.schemas.meal_plan import BatchWeekPlanRequest, BatchWeekPlanResult
+from app.services.batch_meal_plan import BatchMealPlanService
+
+router = APIRouter(dependencies=[Depends(require_admin_api_key)])
+
+
+@router.post("/meal-plans/generate-week", response_model=BatchWeekPlanResult)
+async def batch_generate_week_plans(
+    request: BatchWeekPlanRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Generate and persist the given week's plan for many users in one job.
+
+    Per-user failures (unknown user, planning or save errors) are reported in
+    the results instead of failing the request. week_start_date must be a
+    Monday.
+    """
+    if request.week_start_date.weekday() != 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="week_start_date must be a Monday",
+        )
+
+    service = BatchMealPlanService()
+    return await service.generate_week(db, request.user_ids, request.week_start_date)
@@ -1,19 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import hashlib
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy import delete as sql_delete
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user_id, get_db
 from app.models.google_calendar import GoogleCalendarConnection
 from app.models.schedule import ScheduleItem
-from app.models.user import User
 from app.schemas.google_calendar import (
     GoogleCalendarDisconnectResult,
     GoogleCalendarStatus,
     GoogleCalendarSyncResult,
 )
-from app.services.clerk_oauth import ClerkOAuthError, ClerkOAuthService
-from app.services.google_calendar import GoogleCalendarService
+from app.services.clerk_oauth import (
+    ClerkOAuthError,
+    ClerkOAuthService,
+    is_token_rejected,
+)
+from app.services.google_calendar import GoogleCalendarService, record_token_check
 
 router = APIRouter()
 
@@ -35,7 +40,7 @@ async def connect_calendar(
             "Pass -new Date().getTimezoneOffset() from the client."
         ),
     ),
-    current_user: User = Depends(get_current_user),
+    current_user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> GoogleCalendarStatus:
     """
@@ -49,7 +54,10 @@ async def connect_calendar(
     clerk_oauth = _get_clerk_oauth_service()
 
     try:
-        access_token = await clerk_oauth.get_google_access_token(current_user.id)
+        # Ask Clerk itself: a successful connect records the token as valid
+        access_token = await clerk_oauth.get_google_access_token(
+            current_user_id, refresh=True
+        )
     except ClerkOAuthError as exc:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -64,6 +72,8 @@ async def connect_calendar(
     try:
         email = await service.get_user_email(access_token)
     except Exception as exc:
+        if is_token_rejected(exc):
+            clerk_oauth.invalidate_google_access_token(current_user_id)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to retrieve Google account email: {exc}",
@@ -71,20 +81,24 @@ async def connect_calendar(
 
     # Upsert the connection record
     stmt = select(GoogleCalendarConnection).where(
-        GoogleCalendarConnection.user_id == current_user.id
+        GoogleCalendarConnection.user_id == current_user_id
     )
     result = await db.execute(stmt)
     connection = result.scalar_one_or_none()
 
     if connection is None:
         connection = GoogleCalendarConnection(
-            user_id=current_user.id,
+            user_id=current_user_id,
             google_account_email=email,
             sync_status="pending",
         )
     else:
         connection.google_account_email = email
         connection.sync_status = "pending"
+        # A reconnect clears any background sync backoff
+        connection.sync_failures = 0
+        connection.next_sync_at = None
+    record_token_check(connection, valid=True)
 
     db.add(connection)
     await db.flush()
@@ -93,60 +107,99 @@ async def connect_calendar(
     try:
         await service.sync_for_user(connection, access_token, db, utc_offset_minutes)
     except Exception as exc:
+        if is_token_rejected(exc):
+            clerk_oauth.invalidate_google_access_token(current_user_id)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Connected to Clerk but initial calendar sync failed: {exc}",
         ) from exc
 
+    return _connection_status(connection)
+
+
+# ── Status ───────────────────────────────────────────────────────────────────
+
+
+def _connection_status(
+    connection: GoogleCalendarConnection | None,
+) -> GoogleCalendarStatus:
+    if connection is None:
+        return GoogleCalendarStatus(connected=False)
     return GoogleCalendarStatus(
-        connected=True,
+        connected=not connection.needs_reconnect,
         email=connection.google_account_email,
         last_synced_at=connection.last_synced_at,
         sync_status=connection.sync_status,
+        needs_reconnect=connection.needs_reconnect,
+        token_valid_at=connection.token_valid_at,
     )
 
 
-# ── Status ───────────────────────────────────────────────────────────────────
+def _status_etag(connection_status: GoogleCalendarStatus) -> str:
+    digest = hashlib.sha256(connection_status.model_dump_json().encode())
+    return f'"{digest.hexdigest()[:32]}"'
 
 
-@router.get("/status", response_model=GoogleCalendarStatus)
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@router.get(
+    "/status",
+    response_model=GoogleCalendarStatus,
+    responses={304: {"description": "Status unchanged since the given ETag"}},
+)
 async def get_status(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    verify: bool = Query(
+        False,
+        description="Ask Clerk for the Google token now instead of serving the "
+        "last recorded check",
+    ),
+    if_none_match: str | None = Header(None),
+    current_user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
-) -> GoogleCalendarStatus:
-    """Return the current Google Calendar connection status for the user."""
-    clerk_oauth = _get_clerk_oauth_service()
+) -> GoogleCalendarStatus | Response:
+    """
+    Return the current Google Calendar connection status for the user.
+
+    A single read of the connection row: token health (needs_reconnect,
+    token_valid_at) is recorded by syncs and the background scheduler, so
+    polling this does not call Clerk. Responses carry an ETag; a matching
+    If-None-Match answers 304. verify=true checks the token with Clerk first
+    and records the result.
+    """
     stmt = select(GoogleCalendarConnection).where(
-        GoogleCalendarConnection.user_id == current_user.id,
+        GoogleCalendarConnection.user_id == current_user_id,
     )
     result = await db.execute(stmt)
     connection = result.scalar_one_or_none()
 
-    if connection is None:
-        return GoogleCalendarStatus(connected=False)
-
-    try:
-        await clerk_oauth.get_google_access_token(current_user.id)
-    except ClerkOAuthError:
-        return GoogleCalendarStatus(
-            connected=False,
-            email=connection.google_account_email,
-            last_synced_at=connection.last_synced_at,
-            sync_status=connection.sync_status,
-            needs_reconnect=True,
-        )
-    except Exception as exc:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Failed to verify Google Calendar connection with Clerk: {exc}",
-        ) from exc
-
-    return GoogleCalendarStatus(
-        connected=True,
-        email=connection.google_account_email,
-        last_synced_at=connection.last_synced_at,
-        sync_status=connection.sync_status,
-    )
+    if connection is not None and verify:
+        clerk_oauth = _get_clerk_oauth_service()
+        try:
+            await clerk_oauth.get_google_access_token(current_user_id, refresh=True)
+        except ClerkOAuthError:
+            record_token_check(connection, valid=False)
+        except Exception as exc:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Failed to verify Google Calendar connection with Clerk: {exc}",
+            ) from exc
+        else:
+            record_token_check(connection, valid=True)
+        await db.commit()
+
+    connection_status = _connection_status(connection)
+    etag = _status_etag(connection_status)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return connection_status
 
 
 # ── Manual Sync ──────────────────────────────────────────────────────────────
@@ -161,12 +214,12 @@ async def sync_calendar(
             "Pass -new Date().getTimezoneOffset() from the client."
         ),
     ),
-    current_user: User = Depends(get_current_user),
+    current_user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> GoogleCalendarSyncResult:
     """Manually trigger a FreeBusy sync for the rolling 8-week window."""
     stmt = select(GoogleCalendarConnection).where(
-        GoogleCalendarConnection.user_id == current_user.id,
+        GoogleCalendarConnection.user_id == current_user_id,
     )
     result = await db.execute(stmt)
     connection = result.scalar_one_or_none()
@@ -179,23 +232,44 @@ async def sync_calendar(
 
     service = _get_service()
     clerk_oauth = _get_clerk_oauth_service()
+    # A cached token proves nothing about the connection's health, so the
+    # token is only recorded as valid when Clerk was asked: for connections
+    # flagged as needing a reconnect. A ClerkOAuthError always comes from
+    # Clerk.
+    verify = connection.needs_reconnect
     try:
-        access_token = await clerk_oauth.get_google_access_token(current_user.id)
-        count, batch_id = await service.sync_for_user(
-            connection, access_token, db, utc_offset_minutes
+        access_token = await clerk_oauth.get_google_access_token(
+            current_user_id, refresh=verify
         )
     except ClerkOAuthError as exc:
+        record_token_check(connection, valid=False)
+        await db.commit()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(exc),
         ) from exc
     except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to retrieve Google token from Clerk: {exc}",
+        ) from exc
+
+    if verify:
+        # Persisted with the sync's commit
+        record_token_check(connection, valid=True)
+    try:
+        sync_result = await service.sync_for_user(
+            connection, access_token, db, utc_offset_minutes
+        )
+    except Exception as exc:
+        if is_token_rejected(exc):
+            clerk_oauth.invalidate_google_access_token(current_user_id)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Sync failed: {exc}",
         ) from exc
 
-    return GoogleCalendarSyncResult(synced_count=count, sync_batch_id=batch_id)
+    return sync_result
 
 
 # ── Disconnect ───────────────────────────────────────────────────────────────
@@ -206,7 +280,7 @@ async def disconnect_calendar(
     remove_busy_blocks: bool = Query(
         True, description="Also delete imported Google busy blocks from the schedule"
     ),
-    current_user: User = Depends(get_current_user),
+    current_user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> GoogleCalendarDisconnectResult:
     """
@@ -217,7 +291,7 @@ async def disconnect_calendar(
     unlinking is handled by Clerk, not by this endpoint.
     """
     stmt = select(GoogleCalendarConnection).where(
-        GoogleCalendarConnection.user_id == current_user.id,
+        GoogleCalendarConnection.user_id == current_user_id,
     )
     result = await db.execute(stmt)
     connection = result.scalar_one_or_none()
@@ -235,7 +309,7 @@ async def disconnect_calendar(
             select(func.count())
             .select_from(ScheduleItem)
             .where(
-                ScheduleItem.user_id == current_user.id,
+                ScheduleItem.user_id == current_user_id,
                 ScheduleItem.source_type == "google_calendar",
             )
         )
@@ -244,7 +318,7 @@ async def disconnect_calendar(
 
         await db.execute(
             sql_delete(ScheduleItem).where(
-                ScheduleItem.user_id == current_user.id,
+                ScheduleItem.user_id == current_user_id,
                 ScheduleItem.source_type == "google_calendar",
             )
         )
@@ -1,16 +1,28 @@
+import asyncio
+import time
 from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import Date, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user_id, get_current_user_profile, get_db
+from app.core.config import settings
 from app.domain.enums import ActivityType
 from app.models.schedule import ScheduleItem
-from app.models.user import User as DBUser
+from app.schemas.meal_plan import MealPlanJobRead
 from app.schemas.schedule import ScheduleItemRead
 from app.schemas.user import UserRead
 from app.services.meal_plan import MealPlanService
+from app.services.meal_plan_jobs import (
+    TERMINAL_STATUSES,
+    enqueue_generate_week,
+    get_job,
+    notify_job_workers,
+)
+
+# Interval between status checks while a GET /jobs/{id}?wait=... long-polls
+JOB_WAIT_POLL_SECONDS = 0.5
 
 router = APIRouter()
 
@@ -20,7 +32,7 @@ async def generate_week_plan(
     week_start_date: date = Query(
         ..., description="Monday of the week to generate (YYYY-MM-DD)"
     ),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: UserRead = Depends(get_current_user_profile),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -36,10 +48,9 @@ async def generate_week_plan(
         )
 
     service = MealPlanService()
-    user_schema = UserRead.model_validate(current_user)
 
     try:
-        items = await service.generate_and_persist(user_schema, week_start_date, db)
+        items = await service.generate_and_persist(current_user, week_start_date, db)
         return items
     except Exception as e:
         raise HTTPException(
@@ -48,9 +59,75 @@ async def generate_week_plan(
         ) from e
 
 
+@router.post(
+    "/jobs",
+    response_model=MealPlanJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def enqueue_week_plan(
+    week_start_date: date = Query(
+        ..., description="Monday of the week to generate (YYYY-MM-DD)"
+    ),
+    current_user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Queue generation of a weekly meal plan and return the job immediately.
+
+    Poll GET /meal-plans/jobs/{job_id} until the status is succeeded or
+    failed. A repeat request for a week that is still pending returns the
+    pending job instead of queueing another one.
+    """
+    if week_start_date.weekday() != 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="week_start_date must be a Monday",
+        )
+
+    job = await enqueue_generate_week(db, current_user_id, week_start_date)
+    notify_job_workers()
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=MealPlanJobRead)
+async def get_week_plan_job(
+    job_id: int,
+    wait: float = Query(
+        0,
+        ge=0,
+        description=(
+            "Seconds to wait for the job to finish before answering "
+            "(long poll; capped server-side)"
+        ),
+    ),
+    current_user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Return a meal plan job's status. With wait > 0 the response is held until
+    the job succeeds or fails, or the wait runs out.
+    """
+    deadline = time.monotonic() + min(wait, settings.MEAL_PLAN_JOB_MAX_WAIT_SECONDS)
+    while True:
+        job = await get_job(db, job_id, current_user_id)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+            )
+        if job.status in TERMINAL_STATUSES or time.monotonic() >= deadline:
+            return job
+        # End the (read-only) transaction so the connection goes back to the
+        # pool while waiting and the next read sees the worker's commit.
+        # Commit rather than rollback: it does not expire loaded objects
+        await db.commit()
+        await asyncio.sleep(
+            min(JOB_WAIT_POLL_SECONDS, max(0.0, deadline - time.monotonic()))
+        )
+
+
 @router.get("/planned-weeks", response_model=list[date])
 async def get_planned_weeks(
-    current_user: DBUser = Depends(get_current_user),
+    current_user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -60,7 +137,7 @@ async def get_planned_weeks(
     stmt = (
         select(week_start)
         .where(
-            ScheduleItem.user_id == current_user.id,
+            ScheduleItem.user_id == current_user_id,
             ScheduleItem.activity_type == ActivityType.MEAL,
         )
         .distinct()
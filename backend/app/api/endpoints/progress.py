@@ -4,7 +4,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
 from app.models.progress import UserArchivedGoal, UserWeightLog
-from app.models.user import User
 from app.schemas.progress import (
     ArchivedGoalCreate,
     ArchivedGoalRead,
@@ -22,13 +21,13 @@ router = APIRouter()
 
 @router.get("/weight-log", response_model=list[WeightLogEntryRead])
 async def get_weight_log(
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ) -> list[UserWeightLog]:
     """Return all weight log entries for the current user, oldest first."""
     result = await db.execute(
         select(UserWeightLog)
-        .where(UserWeightLog.user_id == current_user.id)
+        .where(UserWeightLog.user_id == current_user_id)
         .order_by(UserWeightLog.date)
     )
     return list(result.scalars().all())
@@ -39,13 +38,13 @@ async def get_weight_log(
 )
 async def upsert_weight_entry(
     entry_in: WeightLogEntryCreate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ) -> UserWeightLog:
     """Upsert a weight entry for the given date (one entry per user per date)."""
     result = await db.execute(
         select(UserWeightLog).where(
-            UserWeightLog.user_id == current_user.id,
+            UserWeightLog.user_id == current_user_id,
             UserWeightLog.date == entry_in.date,
         )
     )
@@ -53,7 +52,7 @@ async def upsert_weight_entry(
 
     if entry is None:
         entry = UserWeightLog(
-            user_id=current_user.id,
+            user_id=current_user_id,
             date=entry_in.date,
             weight_kg=entry_in.weight_kg,
             source=entry_in.source,
@@ -71,13 +70,13 @@ async def upsert_weight_entry(
 @router.delete("/weight-log/{entry_date}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_weight_entry(
     entry_date: str,
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ) -> None:
     """Delete the weight log entry for a specific date (YYYY-MM-DD)."""
     await db.execute(
         delete(UserWeightLog).where(
-            UserWeightLog.user_id == current_user.id,
+            UserWeightLog.user_id == current_user_id,
             UserWeightLog.date == entry_date,
         )
     )
@@ -91,13 +90,13 @@ async def delete_weight_entry(
 
 @router.get("/archived-goals", response_model=list[ArchivedGoalRead])
 async def get_archived_goals(
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ) -> list[UserArchivedGoal]:
     """Return all archived goals for the current user, most recent first."""
     result = await db.execute(
         select(UserArchivedGoal)
-        .where(UserArchivedGoal.user_id == current_user.id)
+        .where(UserArchivedGoal.user_id == current_user_id)
         .order_by(UserArchivedGoal.archived_at.desc())
     )
     return list(result.scalars().all())
@@ -108,13 +107,13 @@ async def get_archived_goals(
 )
 async def upsert_archived_goal(
     goal_in: ArchivedGoalCreate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ) -> UserArchivedGoal:
     """Upsert an archived goal summary by its stable id."""
     result = await db.execute(
         select(UserArchivedGoal).where(
-            UserArchivedGoal.user_id == current_user.id,
+            UserArchivedGoal.user_id == current_user_id,
             UserArchivedGoal.id == goal_in.id,
         )
     )
@@ -123,7 +122,7 @@ async def upsert_archived_goal(
     if goal is None:
         goal = UserArchivedGoal(
             id=goal_in.id,
-            user_id=current_user.id,
+            user_id=current_user_id,
             start_date=goal_in.start_date,
             target_date=goal_in.target_date,
             start_weight_kg=goal_in.start_weight_kg,
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_id, get_db
+from app.schemas.recipe import RecipeDetail
+from app.services.recipe_details import get_recipe_detail_service
+from app.services.spoonacular import QuotaExceededError
+
+router = APIRouter(dependencies=[Depends(get_current_user_id)])
+
+# Upper bound for one bulk lookup (a week of primaries and alternatives)
+MAX_BULK_IDS = 200
+
+
+def _unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Recipe details are temporarily unavailable",
+    )
+
+
+@router.get("", response_model=list[RecipeDetail])
+async def get_recipes(
+    ids: str = Query(..., description="Comma-separated Spoonacular recipe ids"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Details for many recipes at once, e.g. to prefetch a visible week.
+
+    Results follow the order of ids; unknown ids are left out.
+    """
+    recipe_ids = [i.strip() for i in ids.split(",") if i.strip()]
+    if not recipe_ids or not all(i.isdigit() for i in recipe_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of recipe ids",
+        )
+    if len(recipe_ids) > MAX_BULK_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_IDS} ids per request",
+        )
+
+    try:
+        return await get_recipe_detail_service().get_many(db, recipe_ids)
+    except QuotaExceededError as e:
+        raise _unavailable() from e
+
+
+@router.get("/{recipe_id}", response_model=RecipeDetail)
+async def get_recipe(recipe_id: int, db: AsyncSession = Depends(get_db)):
+    """Details (ingredients, instructions, summary) of one recipe."""
+    try:
+        detail = await get_recipe_detail_service().get(db, str(recipe_id))
+    except QuotaExceededError as e:
+        raise _unavailable() from e
+    if detail is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Recipe not found"
+        )
+    return detail
@@ -9,7 +9,6 @@ from sqlalchemy.orm import selectinload
 from app.api import deps
 from app.models.meal import Meal, ScheduleItemAlternative
 from app.models.schedule import ScheduleItem
-from app.models.user import User
 from app.schemas.schedule import (
     ScheduleItemCreate,
     ScheduleItemRead,
@@ -32,7 +31,7 @@ def _meal_load() -> list:
 @router.get("/week", response_model=list[ScheduleItemRead])
 async def get_week_schedule(
     week_start_date: str = Query(..., description="Monday of the week (YYYY-MM-DD)"),
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ):
     """
@@ -58,7 +57,7 @@ async def get_week_schedule(
     stmt = (
         select(ScheduleItem)
         .where(
-            ScheduleItem.user_id == current_user.id,
+            ScheduleItem.user_id == current_user_id,
             ScheduleItem.date >= week_start_dt,
             ScheduleItem.date <= week_end_dt,
         )
@@ -72,7 +71,7 @@ async def get_week_schedule(
 @router.post("", response_model=ScheduleItemRead)
 async def create_schedule_item(
     item_in: ScheduleItemCreate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ):
     meal_id = item_in.meal_id
@@ -89,7 +88,7 @@ async def create_schedule_item(
             ingredients=[],
             tags=[],
             is_custom=True,
-            user_id=current_user.id,
+            user_id=current_user_id,
         )
         db.add(meal)
         await db.flush()  # populate meal.id; both INSERTs share one txn until commit
@@ -104,7 +103,7 @@ async def create_schedule_item(
         exercise_calorie_burn=item_in.exercise_calorie_burn,
         exercise_muscle_gain=item_in.exercise_muscle_gain,
         meal_id=meal_id,
-        user_id=current_user.id,
+        user_id=current_user_id,
     )
     db.add(item)
     await db.commit()
@@ -118,13 +117,13 @@ async def create_schedule_item(
 async def get_schedule_items(
     start_date: datetime = Query(...),
     end_date: datetime = Query(...),
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ):
     stmt = (
         select(ScheduleItem)
         .where(
-            ScheduleItem.user_id == current_user.id,
+            ScheduleItem.user_id == current_user_id,
             ScheduleItem.date >= start_date,
             ScheduleItem.date <= end_date,
         )
@@ -139,11 +138,11 @@ async def get_schedule_items(
 async def update_schedule_item(
     item_id: int,
     item_in: ScheduleItemUpdate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ):
     item = await db.get(ScheduleItem, item_id)
-    if not item or item.user_id != current_user.id:
+    if not item or item.user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Schedule item not found"
         )
@@ -163,7 +162,7 @@ async def update_schedule_item(
 async def swap_schedule_item_meal(
     item_id: int,
     body: SwapMealRequest,
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ):
     """Swap the active meal on a slot. meal_id must be in the item's alternatives."""
@@ -171,7 +170,7 @@ async def swap_schedule_item_meal(
     result = await db.execute(stmt)
     item = result.scalar_one_or_none()
 
-    if not item or item.user_id != current_user.id:
+    if not item or item.user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Schedule item not found"
         )
@@ -204,13 +203,13 @@ async def swap_schedule_item_meal(
 @router.delete("/{item_id}", status_code=204)
 async def delete_schedule_item(
     item_id: int,
-    current_user: User = Depends(deps.get_current_user),
+    current_user_id: str = Depends(deps.get_current_user_id),
     db: AsyncSession = Depends(deps.get_db),
 ):
     stmt = select(ScheduleItem).where(ScheduleItem.id == item_id).options(*_meal_load())
     result = await db.execute(stmt)
     item = result.scalar_one_or_none()
-    if not item or item.user_id != current_user.id:
+    if not item or item.user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Schedule item not found"
         )
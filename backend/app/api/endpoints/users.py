@@ -89,7 +89,9 @@ async def create_user(
         status.HTTP_404_NOT_FOUND: {"description": "User not found"},
     },
 )
-async def read_user_me(current_user: User = Depends(deps.get_current_user)):
+async def read_user_me(
+    current_user: UserRead = Depends(deps.get_current_user_profile),
+):
     """
     Get current user profile.
     """
@@ -146,13 +148,16 @@ async def update_user_me(
 
     db.add(current_user)
     await db.commit()
+    deps.invalidate_user_profile(current_user.id)
 
     # Re-fetch with relationships loaded for serialization
     return await _load_user_with_dietary(db, current_user.id)
 
 
 @router.get("/me/targets", response_model=DRIOutput)
-async def read_user_targets(current_user: User = Depends(deps.get_current_user)):
+async def read_user_targets(
+    current_user: UserRead = Depends(deps.get_current_user_profile),
+):
     """
     Get nutrient targets based on user profile.
     """
@@ -0,0 +1,188 @@
+"""Command-line entry points for operational jobs. Run from backend/:
+
+    python -m app.cli generate-week --week-start 2025-06-02 --user-id u1 --user-id u2
+    python -m app.cli generate-week --week-start 2025-06-02 --users-file ids.txt
+    python -m app.cli generate-week --week-start 2025-06-02 --all-users
+    python -m app.cli worker --concurrency 4
+    python -m app.cli calendar-sync --concurrency 8
+    python -m app.cli calendar-sync --once
+
+generate-week prints the job result as JSON and exits non-zero if any user
+failed. worker processes queued generate-week jobs (POST /meal-plans/jobs)
+until interrupted. calendar-sync keeps Google Calendar busy blocks fresh
+until interrupted, or runs a single pass with --once and prints its counts.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.http import close_http_client, init_http_client
+
+# Register every mapped class so relationships resolve outside the API app
+from app.models.dietary import UserAllergy  # noqa: F401
+from app.models.google_calendar import GoogleCalendarConnection  # noqa: F401
+from app.models.meal import Meal  # noqa: F401
+from app.models.progress import UserWeightLog  # noqa: F401
+from app.models.schedule import ScheduleItem  # noqa: F401
+from app.models.user import User
+from app.schemas.meal_plan import BatchWeekPlanResult
+from app.services.batch_meal_plan import BatchMealPlanService
+from app.services.calendar_sync_scheduler import build_scheduler
+from app.services.meal_plan_jobs import MealPlanJobWorker
+
+
+async def generate_week(args: argparse.Namespace) -> BatchWeekPlanResult:
+    # Own engine: the app's engine echoes SQL, which would bury the report
+    engine = create_async_engine(
+        settings.DATABASE_URL, connect_args={"statement_cache_size": 0}
+    )
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    )
+    await init_http_client()
+    try:
+        async with session_factory() as db:
+            user_ids = list(args.user_id or [])
+            if args.users_file:
+                lines = args.users_file.read_text().splitlines()
+                user_ids.extend(line.strip() for line in lines if line.strip())
+            if args.all_users:
+                result = await db.execute(select(User.id).order_by(User.id))
+                user_ids.extend(result.scalars().all())
+
+            service = BatchMealPlanService(concurrency=args.concurrency)
+            return await service.generate_week(db, user_ids, args.week_start)
+    finally:
+        await close_http_client()
+        await engine.dispose()
+
+
+async def run_worker(args: argparse.Namespace) -> None:
+    engine = create_async_engine(
+        settings.DATABASE_URL, connect_args={"statement_cache_size": 0}
+    )
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    )
+    worker = MealPlanJobWorker(
+        session_factory,
+        concurrency=args.concurrency,
+        poll_seconds=settings.MEAL_PLAN_JOB_POLL_SECONDS,
+        lease_seconds=settings.MEAL_PLAN_JOB_LEASE_SECONDS,
+        max_attempts=settings.MEAL_PLAN_JOB_MAX_ATTEMPTS,
+    )
+    await init_http_client()
+    worker.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await worker.stop()
+        await close_http_client()
+        await engine.dispose()
+
+
+async def run_calendar_sync(args: argparse.Namespace) -> dict[str, int] | None:
+    engine = create_async_engine(
+        settings.DATABASE_URL, connect_args={"statement_cache_size": 0}
+    )
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    )
+    scheduler = build_scheduler(session_factory, concurrency=args.concurrency)
+    await init_http_client()
+    try:
+        if args.once:
+            return await scheduler.run_once()
+        scheduler.start()
+        await asyncio.Event().wait()
+        return None
+    finally:
+        await scheduler.stop()
+        await close_http_client()
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    week = commands.add_parser(
+        "generate-week", help="generate and persist a week's plan for many users"
+    )
+    week.add_argument(
+        "--week-start",
+        type=date.fromisoformat,
+        required=True,
+        help="Monday of the week (YYYY-MM-DD)",
+    )
+    week.add_argument("--user-id", action="append", help="repeatable")
+    week.add_argument("--users-file", type=Path, help="one user id per line")
+    week.add_argument("--all-users", action="store_true")
+    week.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help=f"planning workers (default {settings.BATCH_PLAN_CONCURRENCY})",
+    )
+
+    worker = commands.add_parser("worker", help="process queued generate-week jobs")
+    worker.add_argument(
+        "--concurrency",
+        type=int,
+        default=max(1, settings.MEAL_PLAN_JOB_WORKERS),
+        help="jobs processed at once",
+    )
+
+    calendar = commands.add_parser(
+        "calendar-sync", help="sync stale Google Calendar connections"
+    )
+    calendar.add_argument(
+        "--concurrency",
+        type=int,
+        default=max(1, settings.CALENDAR_SYNC_CONCURRENCY),
+        help="syncs in flight at once",
+    )
+    calendar.add_argument(
+        "--once", action="store_true", help="run a single pass and exit"
+    )
+
+    args = parser.parse_args(argv)
+    if not settings.DATABASE_URL:
+        parser.error("DATABASE_URL is not configured")
+    if args.command == "calendar-sync":
+        if not settings.CLERK_SECRET_KEY:
+            parser.error("CLERK_SECRET_KEY is not configured")
+        try:
+            outcomes = asyncio.run(run_calendar_sync(args))
+        except KeyboardInterrupt:
+            return 0
+        if outcomes is not None:
+            print(json.dumps(outcomes))
+        return 0
+    if args.command == "worker":
+        try:
+            asyncio.run(run_worker(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.week_start.weekday() != 0:
+        parser.error("--week-start must be a Monday")
+    if not (args.user_id or args.users_file or args.all_users):
+        parser.error("pass --user-id, --users-file or --all-users")
+
+    result = asyncio.run(generate_week(args))
+    print(result.model_dump_json(indent=2))
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,11 +15,117 @@ class Settings(BaseSettings):
     CLERK_PUBLISHABLE_KEY: str = ""
     CLERK_SECRET_KEY: str = ""
     CLERK_WEBHOOK_SECRET: str = ""
+    # Static fallback used only when no JWKS URL is configured or derivable
     CLERK_PEM_PUBLIC_KEY: str = ""
+    # Defaults to https://<frontend api>/.well-known/jwks.json, decoded from
+    # CLERK_PUBLISHABLE_KEY (see app/core/security.py)
+    CLERK_JWKS_URL: str = ""
+    CLERK_JWKS_REFRESH_SECONDS: float = 3600.0
+    # Unknown "kid" triggers a refetch (key rotation) at most this often
+    CLERK_JWKS_MIN_REFRESH_INTERVAL_SECONDS: float = 30.0
+
+    # Verified session-token cache; entries never outlive the token's exp
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_TOKEN_CACHE_MAX_TTL_SECONDS: float = 300.0
+
+    # Google OAuth tokens fetched from Clerk (see app/services/clerk_oauth.py);
+    # an entry is dropped this long before the token's expires_at
+    CLERK_OAUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    CLERK_OAUTH_TOKEN_CACHE_MAX_TTL_SECONDS: float = 1800.0
+    CLERK_OAUTH_TOKEN_EXPIRY_MARGIN_SECONDS: float = 60.0
 
     # External APIs
     OPENAI_API_KEY: str = ""
     SPOONACULAR_API_KEY: str = ""
+    # complexSearch enrichment: "lean" (what the planner reads) or "full"
+    SPOONACULAR_SEARCH_PROFILE: Literal["lean", "full"] = "lean"
+
+    # Spoonacular request pacing and retries (see app/services/spoonacular.py)
+    SPOONACULAR_REQUESTS_PER_SECOND: float = 5.0
+    SPOONACULAR_BURST: int = 5
+    SPOONACULAR_MAX_RETRIES: int = 3
+    SPOONACULAR_BACKOFF_BASE_SECONDS: float = 0.5
+    SPOONACULAR_BACKOFF_MAX_SECONDS: float = 8.0
+    # Stop calling Spoonacular once this many quota points or fewer are left
+    # for the day; planning falls back to cached and catalog recipes
+    SPOONACULAR_QUOTA_RESERVE_POINTS: float = 0.0
+
+    # Shared outbound HTTP pool (see app/core/http.py)
+    HTTP_POOL_MAX_CONNECTIONS: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 15.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_POOL_TIMEOUT_SECONDS: float = 5.0
+    # Requires the optional 'h2' package; falls back to HTTP/1.1 without it
+    HTTP_HTTP2: bool = True
+
+    # Spoonacular recipe-pool cache (see app/services/recipe_cache.py)
+    RECIPE_POOL_CACHE_ENABLED: bool = True
+    RECIPE_POOL_CACHE_MAX_ENTRIES: int = 1024
+    RECIPE_POOL_CACHE_TTL_SECONDS: int = 6 * 3600
+    RECIPE_POOL_CACHE_CALORIE_BAND: int = 50
+    RECIPE_POOL_CACHE_PERSISTENT: bool = False
+    RECIPE_POOL_CACHE_PERSISTENT_TTL_SECONDS: int = 24 * 3600
+
+    # Recipe details served by /recipes (see app/services/recipe_details.py)
+    RECIPE_DETAIL_CACHE_MAX_ENTRIES: int = 2048
+    RECIPE_DETAIL_CACHE_TTL_SECONDS: int = 6 * 3600
+    RECIPE_DETAIL_STORE_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # Local recipe catalog (see app/services/recipe_catalog.py)
+    RECIPE_CATALOG_ENABLED: bool = False
+    RECIPE_CATALOG_LOCAL_FIRST: bool = False
+
+    # Authenticated user profile cache (see app/api/deps.py); 0 disables it
+    USER_PROFILE_CACHE_TTL_SECONDS: float = 30.0
+    USER_PROFILE_CACHE_MAX_ENTRIES: int = 4096
+
+    # Admin endpoints (/admin/...) require this in the X-Admin-API-Key header;
+    # they are disabled while it is empty
+    ADMIN_API_KEY: str = ""
+
+    # Batch weekly plan generation (see app/services/batch_meal_plan.py)
+    BATCH_PLAN_CONCURRENCY: int = 8
+    BATCH_PLAN_PERSIST_CHUNK_SIZE: int = 50
+    # Users whose slot calorie targets fall in the same band share recipe pools
+    BATCH_PLAN_CALORIE_BAND: int = 100
+
+    # How plans pick recipes from the pools: "greedy" takes them in pool
+    # order, "scored" takes the best macro fit for each slot (see
+    # app/services/macro_scoring.py), "solver" fits a week's primaries to the
+    # slot targets with CP-SAT (see app/services/meal_assignment.py) and
+    # falls back to "scored" when no solution is found within the time limit.
+    # Swap alternatives are ranked by fit in both non-greedy modes.
+    MEAL_PLAN_ASSIGNMENT_MODE: Literal["greedy", "scored", "solver"] = "greedy"
+    MEAL_PLAN_SOLVER_TIME_LIMIT_MS: float = 50.0
+
+    # Asynchronous generate-week jobs (see app/services/meal_plan_jobs.py).
+    # Workers per API process; 0 leaves the queue to `python -m app.cli worker`
+    MEAL_PLAN_JOB_WORKERS: int = 2
+    MEAL_PLAN_JOB_POLL_SECONDS: float = 2.0
+    # A running job is handed to another worker once its lease expires; the
+    # worker renews it every third of this while the job runs
+    MEAL_PLAN_JOB_LEASE_SECONDS: float = 300.0
+    MEAL_PLAN_JOB_MAX_ATTEMPTS: int = 3
+    # Upper bound for GET /meal-plans/jobs/{id}?wait=...
+    MEAL_PLAN_JOB_MAX_WAIT_SECONDS: float = 30.0
+
+    # Background Google Calendar sync (see app/services/calendar_sync_scheduler.py).
+    # Concurrent syncs per API process; 0 leaves it to `python -m app.cli
+    # calendar-sync`. Needs CLERK_SECRET_KEY for the users' Google tokens.
+    CALENDAR_SYNC_CONCURRENCY: int = 4
+    # How often the scheduler looks for due connections, and how many it
+    # picks up per pass
+    CALENDAR_SYNC_POLL_SECONDS: float = 60.0
+    CALENDAR_SYNC_BATCH_SIZE: int = 50
+    # A connection is resynced once its last sync is this old
+    CALENDAR_SYNC_STALE_AFTER_SECONDS: float = 30 * 60
+    # Random delay before each sync, and random extra on each next_sync_at
+    CALENDAR_SYNC_JITTER_SECONDS: float = 5.0
+    # Failed syncs retry after base * 2^(failures - 1), capped at max
+    CALENDAR_SYNC_BACKOFF_BASE_SECONDS: float = 5 * 60
+    CALENDAR_SYNC_BACKOFF_MAX_SECONDS: float = 6 * 3600
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
@@ -0,0 +1,107 @@
+"""Process-wide pooled HTTP transport for outbound API calls.
+
+A single httpx.AsyncClient is opened in the FastAPI lifespan and shared by
+every service that talks to an external API (Spoonacular, Google, Clerk), so
+TCP/TLS connections are kept alive and reused across requests instead of being
+set up and torn down on every call.
+
+Code running outside the lifespan (tests, one-off scripts) still works: it
+gets a short-lived client, which is counted as a pool miss.
+"""
+
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HTTPPoolStats:
+    # Requests served by the shared, lifespan-managed client
+    hits: int = 0
+    # Requests that had to open a throwaway client (no shared pool available)
+    misses: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+pool_stats = HTTPPoolStats()
+
+_client: httpx.AsyncClient | None = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def build_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.HTTP_TIMEOUT_SECONDS,
+        connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        pool=settings.HTTP_POOL_TIMEOUT_SECONDS,
+    )
+
+
+async def init_http_client() -> httpx.AsyncClient:
+    """Open the shared client. Called once from the app lifespan."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        return _client
+
+    http2 = settings.HTTP_HTTP2
+    if http2 and not _http2_available():
+        logger.info("HTTP_HTTP2 is enabled but 'h2' is not installed; using 1.1")
+        http2 = False
+
+    _client = httpx.AsyncClient(
+        limits=build_limits(),
+        timeout=build_timeout(),
+        http2=http2,
+    )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and release its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def http_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield the shared pooled client, or a temporary one if the pool is not open.
+
+    Usage:
+        async with http_client() as client:
+            response = await client.get(url)
+    """
+    if _client is not None and not _client.is_closed:
+        pool_stats.hits += 1
+        yield _client
+        return
+
+    pool_stats.misses += 1
+    async with httpx.AsyncClient(timeout=build_timeout()) as client:
+        yield client
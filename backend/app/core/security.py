@@ -0,0 +1,219 @@
+"""Verification of Clerk session tokens (RS256 JWTs).
+
+Signing keys come from Clerk's JWKS endpoint and are cached in memory,
+refreshed periodically, and refetched when a token names an unknown "kid"
+(key rotation). Verified payloads are cached under the token's sha256 so a
+client reusing the same token skips signature verification until the token
+expires.
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from jose import jwk, jwt
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http import http_client
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ["RS256"]
+
+
+class AuthError(Exception):
+    """A token could not be verified for reasons other than its own content."""
+
+
+def clerk_jwks_url() -> str:
+    """
+    CLERK_JWKS_URL, or the JWKS URL of the Clerk frontend API encoded in
+    CLERK_PUBLISHABLE_KEY (pk_<env>_<base64 "host$">). Empty if neither.
+    """
+    if settings.CLERK_JWKS_URL:
+        return settings.CLERK_JWKS_URL
+
+    parts = settings.CLERK_PUBLISHABLE_KEY.split("_", 2)
+    if len(parts) != 3 or parts[0] != "pk":
+        return ""
+    encoded = parts[2]
+    try:
+        host = base64.b64decode(encoded + "=" * (-len(encoded) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        return ""
+    host = host.rstrip("$")
+    return f"https://{host}/.well-known/jwks.json" if host else ""
+
+
+class JWKSKeyStore:
+    """In-memory cache of a JWKS endpoint's RSA signing keys, keyed by kid."""
+
+    def __init__(
+        self,
+        url: str,
+        refresh_seconds: float = 3600.0,
+        min_refresh_interval_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self.min_refresh_interval_seconds = min_refresh_interval_seconds
+        self._clock = clock
+        self._keys: dict[str, Key] = {}
+        self._fetched_at: float | None = None
+        self._lock = asyncio.Lock()
+        self.fetches = 0
+
+    async def _fetch_jwks(self) -> dict[str, Any]:
+        async with http_client() as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+            return response.json()
+
+    async def refresh(self) -> None:
+        """
+        Refetch the key set. Concurrent callers share one fetch, and a failed
+        fetch keeps the previous keys (if any) so a JWKS outage does not lock
+        every user out.
+        """
+        fetched_at = self._fetched_at
+        async with self._lock:
+            if self._fetched_at != fetched_at:
+                return  # another coroutine refreshed while we waited
+            self.fetches += 1
+            try:
+                jwks = await self._fetch_jwks()
+            except Exception as e:
+                self._fetched_at = self._clock()
+                if not self._keys:
+                    raise AuthError("Could not fetch signing keys") from e
+                logger.warning("JWKS refresh failed; keeping cached keys: %s", e)
+                return
+
+            keys: dict[str, Key] = {}
+            for entry in jwks.get("keys", []):
+                kid = entry.get("kid")
+                if (
+                    not kid
+                    or entry.get("kty") != "RSA"
+                    or entry.get("use", "sig") != "sig"
+                ):
+                    continue
+                try:
+                    keys[kid] = jwk.construct(entry, algorithm=ALGORITHMS[0])
+                except Exception:
+                    logger.warning("Skipping unusable JWKS key %s", kid)
+            self._keys = keys
+            self._fetched_at = self._clock()
+
+    async def get_key(self, kid: str | None) -> Key:
+        now = self._clock()
+        if self._fetched_at is None or now - self._fetched_at >= self.refresh_seconds:
+            await self.refresh()
+        elif (
+            kid not in self._keys
+            and now - self._fetched_at >= self.min_refresh_interval_seconds
+        ):
+            await self.refresh()  # the key set may have rotated
+
+        key = self._keys.get(kid) if kid else None
+        if key is None:
+            raise AuthError(f"Unknown signing key: {kid}")
+        return key
+
+
+class TokenVerifier:
+    """
+    Verifies RS256 tokens against a JWKS key store, or a static PEM key when
+    no store is configured, and caches the verified payloads.
+    """
+
+    def __init__(
+        self,
+        key_store: JWKSKeyStore | None = None,
+        pem_public_key: str = "",
+        cache_max_entries: int = 10000,
+        cache_max_ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.key_store = key_store
+        self._pem_key: Key | None = None
+        if pem_public_key:
+            try:
+                self._pem_key = jwk.construct(pem_public_key, ALGORITHMS[0])
+            except JWKError:
+                logger.error("CLERK_PEM_PUBLIC_KEY is not a valid RSA public key")
+        self.cache_max_ttl_seconds = cache_max_ttl_seconds
+        self._clock = clock
+        # Keyed by token hash, so raw bearer tokens are never held in memory
+        self.cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            max_entries=cache_max_entries,
+            ttl_seconds=cache_max_ttl_seconds,
+            clock=clock,
+        )
+
+    async def _key_for(self, token: str) -> Key:
+        if self.key_store is not None:
+            kid = jwt.get_unverified_header(token).get("kid")
+            try:
+                return await self.key_store.get_key(kid)
+            except AuthError:
+                if self._pem_key is None:
+                    raise
+        if self._pem_key is None:
+            raise AuthError("No token signing key configured")
+        return self._pem_key
+
+    async def verify(self, token: str) -> dict[str, Any]:
+        """
+        Return the token's claims. Raises jose.JWTError for invalid or expired
+        tokens and AuthError when no signing key is available.
+        """
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        cached = self.cache.get(digest)
+        if cached is not None:
+            return dict(cached)
+
+        payload = jwt.decode(token, await self._key_for(token), algorithms=ALGORITHMS)
+
+        # Tokens without exp are verified every time: we can't tell how long
+        # they stay valid.
+        exp = payload.get("exp")
+        if isinstance(exp, int | float):
+            ttl = min(self.cache_max_ttl_seconds, exp - self._clock())
+            self.cache.set(digest, dict(payload), ttl_seconds=ttl)
+        return payload
+
+
+_default_verifier: TokenVerifier | None = None
+
+
+def get_token_verifier() -> TokenVerifier:
+    """Process-wide verifier built from settings."""
+    global _default_verifier
+    if _default_verifier is None:
+        url = clerk_jwks_url()
+        key_store = None
+        if url:
+            key_store = JWKSKeyStore(
+                url,
+                refresh_seconds=settings.CLERK_JWKS_REFRESH_SECONDS,
+                min_refresh_interval_seconds=(
+                    settings.CLERK_JWKS_MIN_REFRESH_INTERVAL_SECONDS
+                ),
+            )
+        _default_verifier = TokenVerifier(
+            key_store=key_store,
+            pem_public_key=settings.CLERK_PEM_PUBLIC_KEY,
+            cache_max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+            cache_max_ttl_seconds=settings.AUTH_TOKEN_CACHE_MAX_TTL_SECONDS,
+        )
+    return _default_verifier
@@ -0,0 +1,67 @@
+"""Coalescing of concurrent identical async calls ("single flight").
+
+While a call for a key is in flight, further calls for the same key wait on
+it and receive its result (or exception) instead of starting their own. Once
+it completes the key is forgotten, so this never serves stale data; pair it
+with a cache for that.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class SingleFlightStats:
+    # Calls made through do()
+    calls: int = 0
+    # Calls that actually ran the function
+    executions: int = 0
+    # Calls that joined an execution already in flight
+    coalesced: int = 0
+    # Executions that raised
+    failures: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Per-key coalescing of concurrent async calls.
+
+    Intended for use from a single asyncio event loop. The shared execution
+    is shielded: a cancelled caller stops waiting, but the call keeps running
+    for the others.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[K, asyncio.Future[V]] = {}
+        self.stats = SingleFlightStats()
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        """Return fn()'s result, sharing one execution among concurrent callers."""
+        self.stats.calls += 1
+        future = self._in_flight.get(key)
+        if future is None:
+            self.stats.executions += 1
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _finish(self, key: K, future: asyncio.Future[V]) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        # Marks the exception retrieved even if every caller was cancelled
+        if future.cancelled() or future.exception() is not None:
+            self.stats.failures += 1
@@ -114,3 +114,10 @@ class MealType(StrEnum):
     FINGERFOOD = "fingerfood"
     SNACK = "snack"
     DRINK = "drink"
+
+
+class JobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
@@ -5,15 +5,29 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.api import api_router
 from app.core.config import settings
+from app.core.http import close_http_client, init_http_client, pool_stats
+from app.services.calendar_sync_scheduler import (
+    start_calendar_sync,
+    stop_calendar_sync,
+)
+from app.services.clerk_oauth import google_token_cache, google_token_flight
+from app.services.meal_plan_jobs import start_job_workers, stop_job_workers
+from app.services.spoonacular import get_spoonacular_limiter, search_flight
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Connect to DB (TODO)
     print("Starting up Sophros Backend...")
+    await init_http_client()
+    start_job_workers()
+    start_calendar_sync()
     yield
     # Shutdown: Disconnect DB (TODO)
     print("Shutting down...")
+    await stop_calendar_sync()
+    await stop_job_workers()
+    await close_http_client()
 
 
 app = FastAPI(
@@ -37,7 +51,17 @@ app.add_middleware(
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok", "project": settings.PROJECT_NAME}
+    return {
+        "status": "ok",
+        "project": settings.PROJECT_NAME,
+        "http_pool": pool_stats.as_dict(),
+        "spoonacular_search": search_flight.stats.as_dict(),
+        "spoonacular_quota": get_spoonacular_limiter().stats.as_dict(),
+        "clerk_oauth_tokens": {
+            **google_token_cache.stats.as_dict(),
+            "lookups": google_token_flight.stats.as_dict(),
+        },
+    }
 
 
 @app.get("/")
@@ -1,6 +1,14 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+    false,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base_class import Base
@@ -23,6 +31,28 @@ class GoogleCalendarConnection(Base):
     )
     # "pending" | "synced" | "failed"
     sync_status: Mapped[str] = mapped_column(String, nullable=False, default="pending")
+    # Offset the user's client last synced with; background syncs reuse it
+    utc_offset_minutes: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+    # Token health: when Clerk last provided a Google token for the user, and
+    # whether it last refused to (recorded by syncs and /status?verify=true)
+    token_valid_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    needs_reconnect: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )
+
+    # Background sync bookkeeping (app/services/calendar_sync_scheduler.py):
+    # consecutive failed attempts, and when the connection is next due
+    sync_failures: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    next_sync_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     user: Mapped["User"] = relationship("User")  # type: ignore[name-defined] # noqa: F821
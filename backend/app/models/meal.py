@@ -1,11 +1,23 @@
-from sqlalchemy import JSON, Boolean, ForeignKey, Integer, String
+from sqlalchemy import JSON, Boolean, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base_class import Base
 
+# Non-custom (Spoonacular) meals are shared across plans: one row per recipe_id.
+# Also used as the ON CONFLICT target predicate when upserting them.
+SHARED_MEAL_PREDICATE = text("NOT is_custom AND recipe_id IS NOT NULL")
+
 
 class Meal(Base):
     __tablename__ = "meals"
+    __table_args__ = (
+        Index(
+            "uq_meals_shared_recipe_id",
+            "recipe_id",
+            unique=True,
+            postgresql_where=SHARED_MEAL_PREDICATE,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, index=True, autoincrement=True
@@ -0,0 +1,48 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class MealPlanJob(Base):
+    """A queued generate-week request (see app/services/meal_plan_jobs.py)."""
+
+    __tablename__ = "meal_plan_jobs"
+    __table_args__ = (
+        # At most one pending job per user and week; repeat requests join it
+        Index(
+            "uq_meal_plan_jobs_pending_user_week",
+            "user_id",
+            "week_start_date",
+            unique=True,
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # Workers claim the oldest claimable job
+        Index("ix_meal_plan_jobs_status_created_at", "status", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    week_start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    # "pending" | "running" | "succeeded" | "failed" (see JobStatus)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # A running job whose lease has expired (worker died) is claimable again
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
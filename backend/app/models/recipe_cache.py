@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class RecipePoolCacheEntry(Base):
+    """Persistent tier of the Spoonacular complexSearch result cache."""
+
+    __tablename__ = "recipe_pool_cache"
+
+    # sha256 of the canonical complexSearch params
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    params: Mapped[dict] = mapped_column(JSON, nullable=False)
+    results: Mapped[list] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
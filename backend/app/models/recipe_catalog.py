@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class CatalogRecipe(Base):
+    """
+    Deduplicated local copy of Spoonacular recipes, one row per recipe_id.
+
+    Tag arrays are lower-cased. diets / dish_types also include the
+    complexSearch filters a recipe was returned for, and safe_intolerances
+    lists the intolerances Spoonacular has already excluded it against, so
+    local queries never relax a filter the live search applied.
+    """
+
+    __tablename__ = "recipe_catalog"
+    __table_args__ = (
+        Index("ix_recipe_catalog_diets", "diets", postgresql_using="gin"),
+        Index("ix_recipe_catalog_dish_types", "dish_types", postgresql_using="gin"),
+        Index("ix_recipe_catalog_cuisines", "cuisines", postgresql_using="gin"),
+        Index(
+            "ix_recipe_catalog_safe_intolerances",
+            "safe_intolerances",
+            postgresql_using="gin",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    recipe_id: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    image_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    source_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    ready_in_minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    calories: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    protein: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    carbohydrates: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    fat: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+
+    ingredients: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    diets: Mapped[list[str]] = mapped_column(
+        ARRAY(String), nullable=False, default=list
+    )
+    dish_types: Mapped[list[str]] = mapped_column(
+        ARRAY(String), nullable=False, default=list
+    )
+    cuisines: Mapped[list[str]] = mapped_column(
+        ARRAY(String), nullable=False, default=list
+    )
+    safe_intolerances: Mapped[list[str]] = mapped_column(
+        ARRAY(String), nullable=False, default=list
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
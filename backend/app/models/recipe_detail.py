@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class RecipeDetailEntry(Base):
+    """Persistent cache of recipe details served by /recipes (RecipeDetail)."""
+
+    __tablename__ = "recipe_details"
+
+    recipe_id: Mapped[str] = mapped_column(String, primary_key=True)
+    detail: Mapped[dict] = mapped_column(JSON, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
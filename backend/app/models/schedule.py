@@ -1,4 +1,13 @@
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -8,6 +17,17 @@ from app.domain.enums import ActivityType, ExerciseCategory
 
 class ScheduleItem(Base):
     __tablename__ = "schedules"
+    __table_args__ = (
+        # Every hot read filters one user's items over a date range
+        Index("ix_schedules_user_id_date", "user_id", "date"),
+        # Calendar sync diffs only the imported busy blocks
+        Index(
+            "ix_schedules_google_user_id_date",
+            "user_id",
+            "date",
+            postgresql_where=text("source_type = 'google_calendar'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, index=True, autoincrement=True
@@ -36,7 +56,10 @@ class ScheduleItem(Base):
     )
     # Self-referential FK: set when this slot is a leftover from another slot
     source_schedule_item_id: Mapped[int | None] = mapped_column(
-        Integer, ForeignKey("schedules.id", ondelete="SET NULL"), nullable=True
+        Integer,
+        ForeignKey("schedules.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
     )
 
     # Source metadata — identifies where this row came from
@@ -9,11 +9,18 @@ class GoogleCalendarStatus(BaseModel):
     last_synced_at: datetime | None = None
     sync_status: str | None = None
     needs_reconnect: bool = False
+    # Last time Clerk provided a Google token for the connection
+    token_valid_at: datetime | None = None
 
 
 class GoogleCalendarSyncResult(BaseModel):
+    # Busy blocks in the sync window after the sync
     synced_count: int
     sync_batch_id: str
+    # What the sync changed; unchanged blocks are not rewritten
+    added: int = 0
+    removed: int = 0
+    unchanged: int = 0
 
 
 class GoogleCalendarDisconnectResult(BaseModel):
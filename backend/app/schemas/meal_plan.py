@@ -1,8 +1,9 @@
+from datetime import date, datetime
 from datetime import time as timeofday
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-from app.domain.enums import Day, MealSlot
+from app.domain.enums import Day, JobStatus, MealSlot
 from app.schemas.recipe import Recipe
 from app.services.exercise_service import ExerciseRecommendation
 
@@ -47,3 +48,37 @@ class DailyMealPlan(BaseModel):
 class WeeklyMealPlan(BaseModel):
     daily_plans: list[DailyMealPlan]
     total_weekly_calories: int
+
+
+class BatchWeekPlanRequest(BaseModel):
+    user_ids: list[str] = Field(min_length=1)
+    week_start_date: date
+
+
+class BatchUserResult(BaseModel):
+    user_id: str
+    success: bool
+    scheduled_meals: int = 0
+    scheduled_workouts: int = 0
+    error: str | None = None
+
+
+class BatchWeekPlanResult(BaseModel):
+    week_start_date: date
+    succeeded: int
+    failed: int
+    # Distinct recipe-pool fetches; users with equivalent pool requests share one
+    recipe_pool_fetches: int
+    results: list[BatchUserResult]
+
+
+class MealPlanJobRead(BaseModel):
+    id: int
+    week_start_date: date
+    status: JobStatus
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -23,3 +23,20 @@ class Recipe(BaseModel):
     preparation_time_minutes: int | None = None
     source_url: str | None = None
     image_url: str | None = None
+
+
+class RecipeDetail(BaseModel):
+    """Full details of a Spoonacular recipe, fetched when a user opens it."""
+
+    id: str
+    title: str
+    summary: str | None = None
+    image_url: str | None = None
+    source_url: str | None = None
+    ready_in_minutes: int | None = None
+    servings: int | None = None
+    ingredients: list[str] = Field(default_factory=list)
+    instructions: list[str] = Field(default_factory=list)
+    diets: list[str] = Field(default_factory=list)
+    dish_types: list[str] = Field(default_factory=list)
+    cuisines: list[str] = Field(default_factory=list)
@@ -0,0 +1,205 @@
+"""Weekly plan generation for many users in one job.
+
+Used by the admin endpoint and the CLI (python -m app.cli generate-week) for
+the weekly regeneration wave. Compared with calling generate-week per user:
+
+- users and their Google Calendar blocks are loaded in two queries,
+- users with the same dietary constraints and calorie band share recipe
+  pools, so each pool query is issued once per group (SharedRecipePools),
+- planning runs on a bounded number of concurrent workers, and
+- plans are written in chunks with write_weekly_plans.
+
+One user's failure never fails the job; it is reported in that user's result.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.models.schedule import ScheduleItem as ScheduleItemORM
+from app.models.user import User as UserORM
+from app.schemas.meal_plan import BatchUserResult, BatchWeekPlanResult
+from app.schemas.user import UserRead
+from app.services.meal_plan import MealPlanService
+from app.services.plan_persistence import (
+    WeeklyPlanWrite,
+    week_bounds,
+    write_weekly_plans,
+)
+from app.services.recipe_cache import SharedRecipePools
+from app.services.spoonacular import SpoonacularClient
+
+logger = logging.getLogger(__name__)
+
+
+def _plan_counts(plan: WeeklyPlanWrite) -> tuple[int, int]:
+    meals = sum(len(day.slots) for day in plan.daily_plans)
+    workouts = sum(1 for day in plan.daily_plans if day.exercise)
+    return meals, workouts
+
+
+class BatchMealPlanService:
+    def __init__(
+        self,
+        spoonacular_client: SpoonacularClient | None = None,
+        concurrency: int | None = None,
+        persist_chunk_size: int | None = None,
+        calorie_band: int | None = None,
+    ):
+        self.spoonacular_client = spoonacular_client
+        self.concurrency = max(1, concurrency or settings.BATCH_PLAN_CONCURRENCY)
+        self.persist_chunk_size = max(
+            1, persist_chunk_size or settings.BATCH_PLAN_PERSIST_CHUNK_SIZE
+        )
+        self.calorie_band = (
+            settings.BATCH_PLAN_CALORIE_BAND if calorie_band is None else calorie_band
+        )
+
+    @staticmethod
+    async def _load_users(db: AsyncSession, user_ids: list[str]) -> list[UserRead]:
+        result = await db.execute(
+            select(UserORM)
+            .where(UserORM.id.in_(user_ids))
+            .options(
+                selectinload(UserORM.user_allergies),
+                selectinload(UserORM.user_include_cuisines),
+                selectinload(UserORM.user_exclude_cuisines),
+                selectinload(UserORM.user_busy_times),
+            )
+        )
+        return [UserRead.model_validate(user) for user in result.scalars().all()]
+
+    @staticmethod
+    async def _load_calendar_blocks(
+        db: AsyncSession, user_ids: list[str], week_start_date: date
+    ) -> dict[str, list[ScheduleItemORM]]:
+        week_start_dt, week_end_dt = week_bounds(week_start_date)
+        result = await db.execute(
+            select(ScheduleItemORM).where(
+                ScheduleItemORM.user_id.in_(user_ids),
+                ScheduleItemORM.source_type == "google_calendar",
+                ScheduleItemORM.date >= week_start_dt,
+                ScheduleItemORM.date <= week_end_dt,
+            )
+        )
+        blocks: dict[str, list[ScheduleItemORM]] = defaultdict(list)
+        for block in result.scalars().all():
+            blocks[block.user_id].append(block)
+        return blocks
+
+    async def _persist(
+        self,
+        db: AsyncSession,
+        plans: list[WeeklyPlanWrite],
+        results: dict[str, BatchUserResult],
+    ) -> None:
+        """
+        Write plans chunk by chunk. A failing chunk is rolled back and retried
+        one plan at a time, so only the offending users are reported failed.
+        """
+
+        def succeeded(plan: WeeklyPlanWrite) -> None:
+            meals, workouts = _plan_counts(plan)
+            results[plan.user_id] = BatchUserResult(
+                user_id=plan.user_id,
+                success=True,
+                scheduled_meals=meals,
+                scheduled_workouts=workouts,
+            )
+
+        for start in range(0, len(plans), self.persist_chunk_size):
+            chunk = plans[start : start + self.persist_chunk_size]
+            try:
+                await write_weekly_plans(db, chunk)
+                await db.commit()
+            except Exception:
+                logger.exception("Batch plan chunk write failed; retrying per user")
+                await db.rollback()
+            else:
+                for plan in chunk:
+                    succeeded(plan)
+                continue
+
+            for plan in chunk:
+                try:
+                    await write_weekly_plans(db, [plan])
+                    await db.commit()
+                except Exception as e:
+                    await db.rollback()
+                    results[plan.user_id] = BatchUserResult(
+                        user_id=plan.user_id,
+                        success=False,
+                        error=f"Failed to save meal plan: {e}",
+                    )
+                else:
+                    succeeded(plan)
+
+    async def generate_week(
+        self,
+        db: AsyncSession,
+        user_ids: list[str],
+        week_start_date: date,
+    ) -> BatchWeekPlanResult:
+        """
+        Generate and persist the week starting week_start_date for each user.
+
+        Results follow the order of user_ids (duplicates are planned once).
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        pools = SharedRecipePools(calorie_band=self.calorie_band)
+        planner = MealPlanService(
+            spoonacular_client=self.spoonacular_client, shared_pools=pools
+        )
+
+        users = await self._load_users(db, user_ids)
+        blocks = await self._load_calendar_blocks(
+            db, [u.id for u in users], week_start_date
+        )
+
+        results: dict[str, BatchUserResult] = {
+            user_id: BatchUserResult(
+                user_id=user_id, success=False, error="User not found"
+            )
+            for user_id in user_ids
+        }
+
+        # Members of a dietary group are planned back to back, so concurrent
+        # workers wait on the group's pool fetch instead of repeating it
+        users.sort(
+            key=lambda u: planner._build_dietary_constraints(u).model_dump_json()
+        )
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def plan_user(user: UserRead) -> WeeklyPlanWrite | None:
+            async with semaphore:
+                try:
+                    planning_user = planner._planning_user(user, blocks[user.id])
+                    weekly_plan = await planner.generate_weekly_plan(planning_user)
+                except Exception as e:
+                    logger.exception("Batch plan generation failed for %s", user.id)
+                    results[user.id] = BatchUserResult(
+                        user_id=user.id,
+                        success=False,
+                        error=f"Failed to generate meal plan: {e}",
+                    )
+                    return None
+            return WeeklyPlanWrite(user.id, week_start_date, weekly_plan.daily_plans)
+
+        planned = await asyncio.gather(*(plan_user(u) for u in users))
+        await self._persist(db, [p for p in planned if p is not None], results)
+
+        ordered = [results[user_id] for user_id in user_ids]
+        succeeded = sum(1 for r in ordered if r.success)
+        return BatchWeekPlanResult(
+            week_start_date=week_start_date,
+            succeeded=succeeded,
+            failed=len(ordered) - succeeded,
+            recipe_pool_fetches=pools.fetches,
+            results=ordered,
+        )
@@ -0,0 +1,288 @@
+"""Background Google Calendar sync.
+
+Busy blocks used to refresh only when a client called /calendar/google/sync
+or /connect. CalendarSyncScheduler keeps them fresh instead: every poll it
+walks the connections that are due, most overdue first, and runs
+GoogleCalendarService.sync_for_user for each with at most `concurrency`
+syncs in flight. It runs inside the API process (CALENDAR_SYNC_CONCURRENCY)
+or standalone with `python -m app.cli calendar-sync`.
+
+- A connection is due once its next_sync_at has passed, or right away when
+  it has none (new connections, reconnects).
+- Every successful sync, here or through the API, moves next_sync_at out
+  by stale_after_seconds; a failed background sync by an exponential
+  per-user backoff. The scheduler adds random jitter to both, as to the
+  start of each sync, so connections do not come due in lockstep.
+- Each sync holds a Postgres advisory lock on its connection, so scheduler
+  instances in any number of processes never sync the same user at once.
+- Each sync also verifies the connection: whether Clerk still provides a
+  Google token is recorded in token_valid_at / needs_reconnect, which
+  /calendar/google/status serves without calling Clerk.
+"""
+
+import asyncio
+import logging
+import random
+from collections import Counter
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import get_session_factory
+from app.models.google_calendar import GoogleCalendarConnection
+from app.services.clerk_oauth import (
+    ClerkOAuthError,
+    ClerkOAuthService,
+    is_token_rejected,
+)
+from app.services.google_calendar import GoogleCalendarService, record_token_check
+
+logger = logging.getLogger(__name__)
+
+# First key of the two-key advisory locks taken per connection id ("gcal")
+ADVISORY_LOCK_NAMESPACE = 0x6763616C
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _due(now: datetime) -> Any:
+    return or_(
+        GoogleCalendarConnection.next_sync_at.is_(None),
+        GoogleCalendarConnection.next_sync_at <= now,
+    )
+
+
+async def due_connection_ids(db: AsyncSession, now: datetime, limit: int) -> list[int]:
+    """Up to limit connections due at now, most overdue first."""
+    result = await db.execute(
+        select(GoogleCalendarConnection.id)
+        .where(_due(now))
+        .order_by(
+            GoogleCalendarConnection.next_sync_at.asc().nulls_first(),
+            GoogleCalendarConnection.id,
+        )
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+def retry_delay_seconds(failures: int, base: float, maximum: float) -> float:
+    """Backoff after the given number of consecutive failures."""
+    return min(maximum, base * 2 ** min(max(failures - 1, 0), 32))
+
+
+class CalendarSyncScheduler:
+    """
+    A loop that syncs the due connections every poll_seconds, at most
+    concurrency at a time. run_once() runs a single pass.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int = 4,
+        poll_seconds: float = 60.0,
+        batch_size: int = 50,
+        stale_after_seconds: float = 30 * 60,
+        jitter_seconds: float = 5.0,
+        backoff_base_seconds: float = 5 * 60,
+        backoff_max_seconds: float = 6 * 3600,
+        service_factory: Callable[[], GoogleCalendarService] = GoogleCalendarService,
+        clerk_factory: Callable[[], ClerkOAuthService] = ClerkOAuthService,
+    ):
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency)
+        self.poll_seconds = poll_seconds
+        self.batch_size = max(1, batch_size)
+        self.stale_after_seconds = stale_after_seconds
+        self.jitter_seconds = jitter_seconds
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.service_factory = service_factory
+        self.clerk_factory = clerk_factory
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._task: asyncio.Task | None = None
+
+    def _jitter(self) -> float:
+        return random.uniform(0, self.jitter_seconds) if self.jitter_seconds else 0.0
+
+    async def run_once(self) -> dict[str, int]:
+        """Sync every connection due now; how many were synced/failed/skipped."""
+        async with self.session_factory() as db:
+            connection_ids = await due_connection_ids(db, _now(), self.batch_size)
+        outcomes = await asyncio.gather(
+            *(self._sync_later(connection_id) for connection_id in connection_ids)
+        )
+        return dict(Counter(outcomes))
+
+    async def _sync_later(self, connection_id: int) -> str:
+        await asyncio.sleep(self._jitter())
+        async with self._semaphore:
+            return await self.sync_connection(connection_id)
+
+    async def sync_connection(self, connection_id: int) -> str:
+        """
+        Sync one connection under its advisory lock and schedule the next
+        attempt. "skipped" when another instance holds the lock or the
+        connection is no longer due.
+        """
+        # A session-level lock on the one connection the sync runs on: it
+        # outlives the sync's commits and needs no second pooled connection
+        engine = self.session_factory.kw["bind"]
+        async with engine.connect() as conn:
+            locked = await conn.scalar(
+                select(
+                    func.pg_try_advisory_lock(ADVISORY_LOCK_NAMESPACE, connection_id)
+                )
+            )
+            await conn.commit()
+            if not locked:
+                return "skipped"
+            try:
+                async with self.session_factory(bind=conn) as db:
+                    return await self._sync_locked(db, connection_id)
+            finally:
+                try:
+                    await conn.execute(
+                        select(
+                            func.pg_advisory_unlock(
+                                ADVISORY_LOCK_NAMESPACE, connection_id
+                            )
+                        )
+                    )
+                    await conn.commit()
+                except BaseException:
+                    # Never return a connection still holding the lock to
+                    # the pool
+                    await conn.invalidate()
+                    raise
+
+    async def _sync_locked(self, db: AsyncSession, connection_id: int) -> str:
+        # Re-check under the lock; another instance may have synced it after
+        # the due list was read
+        result = await db.execute(
+            select(GoogleCalendarConnection).where(
+                GoogleCalendarConnection.id == connection_id, _due(_now())
+            )
+        )
+        connection = result.scalar_one_or_none()
+        if connection is None:
+            return "skipped"
+
+        clerk_oauth = self.clerk_factory()
+        user_id = connection.user_id
+        # Whether Clerk provided a usable token; None when we can't tell
+        token_valid: bool | None = None
+        try:
+            # Bypass the token cache: this fetch is the connection's
+            # recorded health check
+            access_token = await clerk_oauth.get_google_access_token(
+                user_id, refresh=True
+            )
+            token_valid = True
+            record_token_check(connection, valid=True)
+            await self.service_factory().sync_for_user(
+                connection, access_token, db, connection.utc_offset_minutes
+            )
+        except Exception as exc:
+            logger.warning(
+                "Calendar sync failed for connection %s: %s", connection_id, exc
+            )
+            if isinstance(exc, ClerkOAuthError):
+                token_valid = False
+            elif is_token_rejected(exc):
+                token_valid = None
+                clerk_oauth.invalidate_google_access_token(user_id)
+            await db.rollback()
+            failed = await db.get(
+                GoogleCalendarConnection, connection_id, populate_existing=True
+            )
+            if failed is None:
+                return "failed"
+            if token_valid is not None:
+                record_token_check(failed, valid=token_valid)
+            failed.sync_status = "failed"
+            failed.sync_failures += 1
+            delay = retry_delay_seconds(
+                failed.sync_failures,
+                self.backoff_base_seconds,
+                self.backoff_max_seconds,
+            )
+            failed.next_sync_at = _now() + timedelta(seconds=delay + self._jitter())
+            await db.commit()
+            return "failed"
+
+        connection.sync_failures = 0
+        connection.next_sync_at = _now() + timedelta(
+            seconds=self.stale_after_seconds + self._jitter()
+        )
+        await db.commit()
+        return "synced"
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                outcomes = await self.run_once()
+                if outcomes:
+                    logger.info("Calendar sync pass: %s", outcomes)
+            except Exception:
+                logger.exception("Calendar sync scheduler error")
+            await asyncio.sleep(self.poll_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Cancel the loop; interrupted syncs release their locks and retry."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+_scheduler: CalendarSyncScheduler | None = None
+
+
+def build_scheduler(
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+    concurrency: int | None = None,
+) -> CalendarSyncScheduler:
+    return CalendarSyncScheduler(
+        session_factory or get_session_factory(),
+        concurrency=(
+            settings.CALENDAR_SYNC_CONCURRENCY if concurrency is None else concurrency
+        ),
+        poll_seconds=settings.CALENDAR_SYNC_POLL_SECONDS,
+        batch_size=settings.CALENDAR_SYNC_BATCH_SIZE,
+        stale_after_seconds=settings.CALENDAR_SYNC_STALE_AFTER_SECONDS,
+        jitter_seconds=settings.CALENDAR_SYNC_JITTER_SECONDS,
+        backoff_base_seconds=settings.CALENDAR_SYNC_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds=settings.CALENDAR_SYNC_BACKOFF_MAX_SECONDS,
+    )
+
+
+def start_calendar_sync() -> None:
+    """Start the in-process scheduler (app lifespan), if configured."""
+    global _scheduler
+    if (
+        _scheduler is None
+        and settings.CALENDAR_SYNC_CONCURRENCY > 0
+        and settings.DATABASE_URL
+        and settings.CLERK_SECRET_KEY
+    ):
+        _scheduler = build_scheduler()
+        _scheduler.start()
+
+
+async def stop_calendar_sync() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
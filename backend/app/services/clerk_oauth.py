@@ -1,22 +1,83 @@
+"""Google OAuth access tokens held by Clerk.
+
+Tokens are cached per user until shortly before they expire, so polling
+/calendar/google/status or syncing does not call Clerk every time.
+Concurrent misses for one user share a single Clerk request. A user's
+entry is dropped when Clerk refuses the lookup or Google rejects the
+token (invalidate_google_access_token).
+"""
+
 import logging
+import time
+from collections.abc import Callable
 
 import httpx
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.http import http_client
+from app.core.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Process-wide: the service itself is built per request
+google_token_cache: TTLCache[str, str] = TTLCache(
+    max_entries=settings.CLERK_OAUTH_TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CLERK_OAUTH_TOKEN_CACHE_MAX_TTL_SECONDS,
+)
+google_token_flight: SingleFlight[str, str] = SingleFlight()
+
 
 class ClerkOAuthError(Exception):
     """Raised when Clerk cannot provide a provider OAuth token."""
 
 
+def is_token_rejected(exc: BaseException) -> bool:
+    """True when a provider API call failed because it refused the token."""
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in {
+        401,
+        403,
+    }
+
+
+def _expires_at_seconds(value: object) -> float | None:
+    if not isinstance(value, int | float) or isinstance(value, bool):
+        return None
+    # Clerk timestamps are Unix seconds; accept milliseconds as well
+    return value / 1000 if value > 1e11 else float(value)
+
+
 class ClerkOAuthService:
     CLERK_API_BASE_URL = "https://api.clerk.com/v1"
     GOOGLE_PROVIDER = "google"
 
-    async def get_google_access_token(self, user_id: str) -> str:
-        """Retrieve a Google OAuth token stored by Clerk for the given user."""
+    def __init__(
+        self,
+        cache: TTLCache[str, str] | None = None,
+        flight: SingleFlight[str, str] | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.cache = google_token_cache if cache is None else cache
+        self.flight = google_token_flight if flight is None else flight
+        self._clock = clock
+
+    async def get_google_access_token(self, user_id: str, refresh: bool = False) -> str:
+        """
+        Retrieve a Google OAuth token stored by Clerk for the given user.
+        refresh=True skips the cache and asks Clerk.
+        """
+        cached = None if refresh else self.cache.get(user_id)
+        if cached is not None:
+            return cached
+        return await self.flight.do(
+            user_id, lambda: self._fetch_google_access_token(user_id)
+        )
+
+    def invalidate_google_access_token(self, user_id: str) -> None:
+        """Forget the user's cached token, e.g. after Google rejected it."""
+        self.cache.pop(user_id)
+
+    async def _fetch_google_access_token(self, user_id: str) -> str:
         if not settings.CLERK_SECRET_KEY:
             raise ClerkOAuthError("CLERK_SECRET_KEY is not configured.")
 
@@ -24,23 +85,36 @@ class ClerkOAuthService:
             f"{self.CLERK_API_BASE_URL}/users/{user_id}"
             f"/oauth_access_tokens/{self.GOOGLE_PROVIDER}"
         )
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             response = await client.get(
                 url,
                 headers={"Authorization": f"Bearer {settings.CLERK_SECRET_KEY}"},
             )
 
-        print(
-            f"[clerk_oauth] status={response.status_code} body={response.text[:500]}",
-            flush=True,
+        # Never log the body of a successful response: it holds the token
+        logger.debug(
+            "Clerk OAuth token lookup for %s: HTTP %s", user_id, response.status_code
         )
 
         if response.status_code in {401, 403, 404}:
+            self.invalidate_google_access_token(user_id)
+            logger.info(
+                "Clerk has no Google token for %s (HTTP %s)",
+                user_id,
+                response.status_code,
+            )
             raise ClerkOAuthError(
                 "Google account is not connected in Clerk"
                 f" (HTTP {response.status_code})."
             )
 
+        if response.is_error:
+            logger.warning(
+                "Clerk OAuth token lookup for %s failed: HTTP %s %s",
+                user_id,
+                response.status_code,
+                response.text[:200],
+            )
         response.raise_for_status()
         payload = response.json()
         # Clerk returns a bare JSON array for this endpoint
@@ -50,4 +124,16 @@ class ClerkOAuthService:
                 "Google OAuth token was not returned by Clerk (token array is empty)."
             )
 
-        return tokens[0]["token"]
+        token = tokens[0]["token"]
+        # Tokens without an expiry are fetched every time: we can't tell how
+        # long they stay valid
+        expires_at = _expires_at_seconds(tokens[0].get("expires_at"))
+        if expires_at is not None:
+            ttl = min(
+                self.cache.ttl_seconds,
+                expires_at
+                - self._clock()
+                - settings.CLERK_OAUTH_TOKEN_EXPIRY_MARGIN_SECONDS,
+            )
+            self.cache.set(user_id, token, ttl_seconds=ttl)
+        return token
@@ -0,0 +1,96 @@
+"""Free-time lookup over a day's busy blocks.
+
+Times are minutes since midnight. Busy blocks are merged once into sorted,
+non-overlapping free gaps, so "earliest start of a free window of N minutes
+inside [start, end)" is a bisect plus a precomputed jump to the next gap that
+is long enough, instead of a scan over every busy block per candidate minute.
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterable
+
+DAY_MINUTES = 24 * 60
+
+
+class FreeIntervalIndex:
+    """Free gaps of one day, built from its (possibly overlapping) busy blocks."""
+
+    __slots__ = ("busy", "_gap_starts", "_gap_ends", "_next_fit")
+
+    def __init__(self, busy: Iterable[tuple[int, int]] = ()):
+        merged: list[tuple[int, int]] = []
+        for start, end in sorted(b for b in busy if b[0] < b[1]):
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        self.busy = merged
+
+        gap_starts: list[int] = []
+        gap_ends: list[int] = []
+        cursor = 0
+        for start, end in merged:
+            if start > cursor:
+                gap_starts.append(cursor)
+                gap_ends.append(start)
+            cursor = max(cursor, end)
+        if cursor < DAY_MINUTES:
+            gap_starts.append(cursor)
+            gap_ends.append(DAY_MINUTES)
+        self._gap_starts = gap_starts
+        self._gap_ends = gap_ends
+        # duration -> for each gap i, the first gap j >= i at least that long
+        self._next_fit: dict[int, list[int]] = {}
+
+    def _next_fitting_gap(self, i: int, duration: int) -> int | None:
+        table = self._next_fit.get(duration)
+        if table is None:
+            n = len(self._gap_starts)
+            table = [n] * (n + 1)
+            for k in range(n - 1, -1, -1):
+                fits = self._gap_ends[k] - self._gap_starts[k] >= duration
+                table[k] = k if fits else table[k + 1]
+            self._next_fit[duration] = table
+        j = table[min(i, len(table) - 1)]
+        return j if j < len(self._gap_starts) else None
+
+    def _first_free(self, start: int, end: int, duration: int) -> int | None:
+        i = bisect_right(self._gap_ends, start)  # first gap ending after start
+        if i == len(self._gap_starts):
+            return None
+        candidate = max(start, self._gap_starts[i])
+        if candidate + duration > self._gap_ends[i]:
+            j = self._next_fitting_gap(i + 1, duration)
+            if j is None:
+                return None
+            candidate = self._gap_starts[j]
+        return candidate if candidate + duration <= end else None
+
+    def first_fit(
+        self,
+        start: int,
+        end: int,
+        duration: int,
+        extra_busy: Iterable[tuple[int, int]] = (),
+    ) -> int | None:
+        """
+        Earliest t >= start such that [t, t + duration) overlaps no busy block
+        and t + duration <= end, or None.
+
+        extra_busy blocks (e.g. buffers around already placed meals) are
+        honoured without rebuilding the index; there should only be a few.
+        """
+        extra = list(extra_busy)
+        candidate = self._first_free(start, end, duration)
+        while candidate is not None:
+            slot_end = candidate + duration
+            blocking = [
+                b_end
+                for b_start, b_end in extra
+                if candidate < b_end and slot_end > b_start
+            ]
+            if not blocking:
+                return candidate
+            candidate = self._first_free(max(blocking), end, duration)
+        return None
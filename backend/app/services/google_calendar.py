@@ -7,16 +7,33 @@ Clerk; callers pass in a fresh access token retrieved from Clerk.
 
 import uuid
 from datetime import UTC, datetime, timedelta
+from typing import cast
 
-import httpx
+from sqlalchemy import Select, select
 from sqlalchemy import delete as sql_delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.http import http_client
 from app.domain.enums import ActivityType
 from app.models.google_calendar import GoogleCalendarConnection
 from app.models.schedule import ScheduleItem
+from app.schemas.google_calendar import GoogleCalendarSyncResult
 
 SYNC_WEEKS = 8
+# schedules columns written for each imported busy block (_busy_block_record)
+BUSY_BLOCK_COLUMNS = (
+    "user_id",
+    "source_calendar_id",
+    "date",
+    "duration_minutes",
+    "activity_type",
+    "source_type",
+    "prep_time_minutes",
+    "is_completed",
+    "exercise_calorie_burn",
+    "exercise_muscle_gain",
+)
 
 
 class GoogleCalendarService:
@@ -26,7 +43,7 @@ class GoogleCalendarService:
 
     async def get_user_email(self, access_token: str) -> str:
         """Fetch the Google account email for the given access token."""
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.get(
                 self.GOOGLE_USERINFO_URL,
                 headers={"Authorization": f"Bearer {access_token}"},
@@ -54,7 +71,7 @@ class GoogleCalendarService:
             "timeMax": time_max.strftime("%Y-%m-%dT%H:%M:%SZ"),
             "items": [{"id": cal_id} for cal_id in calendar_ids],
         }
-        async with httpx.AsyncClient() as client:
+        async with http_client() as client:
             resp = await client.post(
                 self.GOOGLE_FREEBUSY_URL,
                 json=body,
@@ -82,18 +99,22 @@ class GoogleCalendarService:
         access_token: str,
         db: AsyncSession,
         utc_offset_minutes: int = 0,
-    ) -> tuple[int, str]:
+    ) -> GoogleCalendarSyncResult:
         """
         Sync the rolling 8-week FreeBusy window for the given connection.
 
-        - Deletes existing google_calendar rows in the window.
-        - Inserts new busy-block ScheduleItem rows stored as local wall-clock times.
-        - Updates connection.last_synced_at / sync_status.
+        - Diffs the window's busy blocks against the stored google_calendar
+          rows by fingerprint (calendar, start, end): inserts new blocks,
+          deletes vanished ones and leaves the rest untouched.
+        - Busy blocks are stored as local wall-clock times.
+        - Updates connection.last_synced_at / sync_status, schedules the
+          next background sync (next_sync_at) and stores utc_offset_minutes
+          for background syncs. When no block changed,
+          that one-row update is the only write.
 
         utc_offset_minutes: the user's UTC offset in minutes, e.g. -240 for EDT.
         Pass -new Date().getTimezoneOffset() from the frontend.
 
-        Returns (synced_count, batch_id).
         On Google API error, marks sync_status='failed' and re-raises.
         """
         now = datetime.now(UTC)
@@ -123,51 +144,147 @@ class GoogleCalendarService:
             await db.commit()
             raise
 
-        # Replace Google busy rows in the sync window atomically.
-        # Compare against local-time bounds since we now store local times.
-        await db.execute(
-            sql_delete(ScheduleItem).where(
-                ScheduleItem.user_id == connection.user_id,
-                ScheduleItem.source_type == "google_calendar",
-                ScheduleItem.date >= time_min_local,
-                ScheduleItem.date < time_max_local,
-            )
-        )
-
-        count = 0
+        # Busy blocks Google reports now, keyed by fingerprint. FreeBusy merges
+        # overlapping intervals, so a fingerprint normally occurs once.
+        wanted: dict[str, tuple] = {}
         for cal_id, busy_list in freebusy.items():
             for busy in busy_list:
                 start_dt = _parse_google_dt(busy["start"], utc_offset_minutes)
                 end_dt = _parse_google_dt(busy["end"], utc_offset_minutes)
                 duration = max(1, int((end_dt - start_dt).total_seconds() / 60))
-
-                db.add(
-                    ScheduleItem(
-                        user_id=connection.user_id,
-                        date=start_dt,
-                        activity_type=ActivityType.OTHER,
-                        duration_minutes=duration,
-                        prep_time_minutes=0,
-                        is_completed=False,
-                        meal_id=None,
-                        source_schedule_item_id=None,
-                        source_type="google_calendar",
-                        source_calendar_id=cal_id,
-                    )
+                fingerprint = busy_block_fingerprint(cal_id, start_dt, duration)
+                wanted.setdefault(
+                    fingerprint,
+                    _busy_block_record(connection.user_id, cal_id, start_dt, duration),
                 )
-                count += 1
+
+        # Stored rows in the window (local-time bounds, as stored). A row whose
+        # fingerprint is not wanted, or repeats one already kept, is removed.
+        stored = await db.execute(
+            stored_busy_blocks(connection.user_id, time_min_local, time_max_local)
+        )
+        kept: set[str] = set()
+        removed_ids: list[int] = []
+        for row_id, row_cal_id, row_date, row_duration in stored.all():
+            # ScheduleItem.date is mapped as DateTime; rows carry datetimes
+            fingerprint = busy_block_fingerprint(
+                row_cal_id, cast(datetime, row_date), row_duration
+            )
+            if fingerprint in wanted and fingerprint not in kept:
+                kept.add(fingerprint)
+            else:
+                removed_ids.append(row_id)
+        added = [record for fp, record in wanted.items() if fp not in kept]
+
+        result = GoogleCalendarSyncResult(
+            synced_count=len(wanted),
+            sync_batch_id=batch_id,
+            added=len(added),
+            removed=len(removed_ids),
+            unchanged=len(kept),
+        )
+        if removed_ids:
+            await db.execute(
+                sql_delete(ScheduleItem).where(ScheduleItem.id.in_(removed_ids))
+            )
+        await _insert_busy_blocks(db, added)
 
         connection.last_synced_at = now
         connection.sync_status = "synced"
+        # Due for a background sync once it goes stale; clears any backoff
+        connection.sync_failures = 0
+        connection.next_sync_at = now + timedelta(
+            seconds=settings.CALENDAR_SYNC_STALE_AFTER_SECONDS
+        )
+        connection.utc_offset_minutes = utc_offset_minutes
         db.add(connection)
 
         await db.commit()
-        return count, batch_id
+        return result
 
 
 # ── Helpers ─────────────────────────────────────────────────────────────────
 
 
+def stored_busy_blocks(user_id: str, start: datetime, end: datetime) -> Select:
+    """
+    The imported busy blocks in [start, end), as (id, calendar, date,
+    duration) rows. Served by ix_schedules_google_user_id_date.
+    """
+    return select(
+        ScheduleItem.id,
+        ScheduleItem.source_calendar_id,
+        ScheduleItem.date,
+        ScheduleItem.duration_minutes,
+    ).where(
+        ScheduleItem.user_id == user_id,
+        ScheduleItem.source_type == "google_calendar",
+        ScheduleItem.date >= start,
+        ScheduleItem.date < end,
+    )
+
+
+def record_token_check(connection: GoogleCalendarConnection, valid: bool) -> None:
+    """
+    Record whether Clerk could provide the connection's Google token. Without
+    a token the connection cannot sync, so it is marked failed as well.
+    """
+    if valid:
+        connection.token_valid_at = datetime.now(UTC)
+        connection.needs_reconnect = False
+    else:
+        connection.needs_reconnect = True
+        connection.sync_status = "failed"
+
+
+async def _insert_busy_blocks(db: AsyncSession, records: list[tuple]) -> None:
+    """
+    COPY busy block records (BUSY_BLOCK_COLUMNS order) into schedules.
+
+    Runs on the session's own connection, so the rows commit or roll back
+    with the rest of the sync.
+    """
+    if not records:
+        return
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    # The asyncpg connection underneath SQLAlchemy's adapter
+    assert raw.driver_connection is not None
+    await raw.driver_connection.copy_records_to_table(
+        ScheduleItem.__tablename__, records=records, columns=BUSY_BLOCK_COLUMNS
+    )
+
+
+def _busy_block_record(
+    user_id: str, calendar_id: str, start: datetime, duration_minutes: int
+) -> tuple:
+    # COPY skips SQLAlchemy's type processing and Python-side column defaults:
+    # the enum goes in by name and every defaulted column is spelled out
+    return (
+        user_id,
+        calendar_id,
+        start,
+        duration_minutes,
+        ActivityType.OTHER.name,
+        "google_calendar",
+        0,
+        False,
+        0,
+        0.0,
+    )
+
+
+def busy_block_fingerprint(
+    calendar_id: str | None, start: datetime, duration_minutes: int
+) -> str:
+    """
+    Stable identity of a busy block: its calendar, start and end, in the
+    stored form (local wall-clock start, end rounded to whole minutes).
+    """
+    end = start + timedelta(minutes=duration_minutes)
+    return f"{calendar_id}|{start.isoformat()}|{end.isoformat()}"
+
+
 def _parse_google_dt(value: str, utc_offset_minutes: int = 0) -> datetime:
     """
     Parse an RFC 3339 datetime string from Google and convert it to the user's
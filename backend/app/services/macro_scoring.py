@@ -0,0 +1,123 @@
+"""Vectorized macro scoring of recipe pools against slot targets.
+
+Pools and slot targets become float matrices with one column per macro
+(calories, protein, carbohydrates, fat). deviation_matrix scores every
+recipe against every slot in one NumPy operation with the weighted relative
+deviation used throughout planning:
+
+    sum over macros of weight * |recipe - target| / max(target, 1)
+
+RankedPool uses it to hand out the best-fitting unused recipes of a pool
+for a slot (primary and swap alternatives).
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from app.schemas.meal_plan import MealSlotTarget
+from app.services.recipe_pool import PoolRecipe
+
+MACROS = ("calories", "protein", "carbohydrates", "fat")
+# Relative deviation weight per macro (MACROS order); calories matter most
+MACRO_WEIGHTS = np.array([2.0, 1.0, 1.0, 1.0])
+
+
+def macro_matrix(items: Sequence[PoolRecipe | MealSlotTarget]) -> np.ndarray:
+    """len(items) x 4 matrix of the items' macros."""
+    return np.array(
+        [[getattr(item, macro) for macro in MACROS] for item in items],
+        dtype=np.float64,
+    ).reshape(len(items), len(MACROS))
+
+
+def deviation_matrix(recipes: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """targets x recipes matrix of weighted relative macro deviations."""
+    scale = MACRO_WEIGHTS / np.maximum(targets, 1.0)
+    return np.einsum(
+        "trm,tm->tr",
+        np.abs(recipes[np.newaxis, :, :] - targets[:, np.newaxis, :]),
+        scale,
+    )
+
+
+def slot_deviation(recipe: PoolRecipe, slot: MealSlotTarget) -> float:
+    """deviation_matrix for a single recipe and slot."""
+    return sum(
+        float(weight)
+        * abs(getattr(recipe, macro) - getattr(slot, macro))
+        / max(getattr(slot, macro), 1)
+        for macro, weight in zip(MACROS, MACRO_WEIGHTS, strict=True)
+    )
+
+
+class RankedPool:
+    """
+    Hands out pool recipes best fit first, each at most once.
+
+    Like PoolCursor, recipes whose id is in used_ids are skipped and every
+    recipe taken is added to it (used_ids may be shared with other pools).
+    The macro matrix is built once; ranking a slot is one vectorized pass.
+    """
+
+    __slots__ = ("pool", "used_ids", "macros", "_ids", "_blocked", "_used_count")
+
+    def __init__(self, pool: list[PoolRecipe], used_ids: set[int] | None = None):
+        self.pool = pool
+        self.used_ids = used_ids if used_ids is not None else set()
+        self.macros = macro_matrix(pool)
+        # -1 for recipes without an id; those are only blocked once taken
+        self._ids = np.array(
+            [item.id if item.id is not None else -1 for item in pool], dtype=np.int64
+        )
+        self._blocked = np.zeros(len(pool), dtype=bool)
+        # used_ids only grows, so the blocked mask is stale iff its size changed
+        self._used_count = -1
+
+    def __len__(self) -> int:
+        return len(self.pool)
+
+    def _sync(self) -> np.ndarray:
+        if len(self.used_ids) != self._used_count:
+            used = np.fromiter(self.used_ids, dtype=np.int64, count=len(self.used_ids))
+            self._blocked |= np.isin(self._ids, used)
+            self._used_count = len(self.used_ids)
+        return self._blocked
+
+    def _order(self, target: MealSlotTarget) -> np.ndarray:
+        blocked = self._sync()
+        scores = deviation_matrix(self.macros, macro_matrix([target]))[0]
+        scores[blocked] = np.inf
+        order = np.argsort(scores, kind="stable")
+        return order[: len(order) - int(blocked.sum())]
+
+    def _ranked(self, target: MealSlotTarget, n: int) -> list[int]:
+        indexes: list[int] = []
+        seen: set[int] = set()
+        for index in self._order(target):
+            recipe_id = self.pool[index].id
+            if recipe_id is not None:
+                if recipe_id in seen:
+                    continue
+                seen.add(recipe_id)
+            indexes.append(int(index))
+            if len(indexes) == n:
+                break
+        return indexes
+
+    def rank(self, target: MealSlotTarget, n: int) -> list[PoolRecipe]:
+        """The n best-fitting unused recipes for target, without taking them."""
+        return [self.pool[index] for index in self._ranked(target, n)]
+
+    def take(self, target: MealSlotTarget, n: int) -> list[PoolRecipe]:
+        """rank(target, n), marked as used."""
+        taken = []
+        for index in self._ranked(target, n):
+            item = self.pool[index]
+            self._blocked[index] = True
+            if item.id is not None:
+                self._blocked |= self._ids == item.id
+                self.used_ids.add(item.id)
+            taken.append(item)
+        self._used_count = len(self.used_ids)
+        return taken
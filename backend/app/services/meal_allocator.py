@@ -9,6 +9,7 @@ from app.schemas.meal_plan import (
 )
 from app.schemas.nutrient import DRIOutput
 from app.schemas.user import UserSchedule
+from app.services.free_intervals import FreeIntervalIndex
 
 
 def _time_to_mins(t: time) -> int:
@@ -34,6 +35,19 @@ class MealAllocator:
         MealSlot.DINNER: time(19, 0),
     }
 
+    @staticmethod
+    def free_interval_index(schedule: UserSchedule, day: Day) -> FreeIntervalIndex:
+        """
+        Index of the free time in the schedule's busy blocks for day. Build it
+        once per schedule and day and pass it to the allocation methods.
+        """
+        day_name = day.lower()
+        return FreeIntervalIndex(
+            (_time_to_mins(busy.start), _time_to_mins(busy.end))
+            for busy in schedule.busy_times
+            if busy.day.lower() in (day_name, "everyday")
+        )
+
     @classmethod
     def allocate_targets(
         cls,
@@ -41,13 +55,19 @@ class MealAllocator:
         config: MealDistributionConfig | None = None,
         user_schedule: UserSchedule | None = None,
         day: Day = Day.MONDAY,
+        free_intervals: FreeIntervalIndex | None = None,
     ) -> DailyMealPlan:
         """
         Distributes the daily nutritional targets into meal slots based on the
         provided configuration and user schedule.
+
+        free_intervals, if given, must be the index of user_schedule for day
+        (see free_interval_index); otherwise it is built here.
         """
         if config is None:
             config = MealDistributionConfig()
+        if user_schedule and free_intervals is None:
+            free_intervals = cls.free_interval_index(user_schedule, day)
 
         slots_output = []
 
@@ -64,7 +84,9 @@ class MealAllocator:
             # Determine Time — use schedule if available, otherwise defaults
             meal_time = None
             if user_schedule:
-                meal_time = cls._find_time_for_slot(slot_enum, user_schedule, day)
+                meal_time = cls._find_time_for_slot(
+                    slot_enum, user_schedule, day, free_intervals
+                )
 
             # If still no time, or scheduler failed, use fixed default
             # but only if the default falls inside the user's wake/sleep window
@@ -102,7 +124,11 @@ class MealAllocator:
 
     @classmethod
     def _find_time_for_slot(
-        cls, slot: MealSlot, schedule: UserSchedule, day: Day
+        cls,
+        slot: MealSlot,
+        schedule: UserSchedule,
+        day: Day,
+        free_intervals: FreeIntervalIndex | None = None,
     ) -> time | None:
         """
         Finds the first available 30-min window within the standard range for the slot.
@@ -134,43 +160,10 @@ class MealAllocator:
         if slot == MealSlot.BREAKFAST:
             actual_start = max(actual_start, wake_mins + 30)
 
-        # Parse busy times for the day
-        busy_intervals = []
-        for busy in schedule.busy_times:
-            if busy.day.lower() == day.lower() or busy.day.lower() == "everyday":
-                busy_intervals.append(
-                    (_time_to_mins(busy.start), _time_to_mins(busy.end))
-                )
-
-        # Sort busy intervals by start time for the jumping logic to work correctly
-        busy_intervals.sort(key=lambda x: x[0])
-
-        current_time = actual_start
-        duration = 30
-
-        while current_time + duration <= actual_end:
-            prev_time = current_time
-            # check conflict
-            conflict = False
-            slot_end = current_time + duration
-
-            for b_start, b_end in busy_intervals:
-                # If overlap: (StartA <= EndB) and (EndA >= StartB)
-                if current_time < b_end and slot_end > b_start:
-                    conflict = True
-                    current_time = max(current_time, b_end)
-                    break
-
-            if not conflict:
-                return _mins_to_time(current_time)
-
-            # Move forward - either to end of conflict or by 15 min fallback
-            # Absolute safety check: if we didn't move forward through jump,
-            # we use a manual increment
-            if current_time <= prev_time:
-                current_time += 15
-
-        return None  # No slot found
+        if free_intervals is None:
+            free_intervals = cls.free_interval_index(schedule, day)
+        found = free_intervals.first_fit(actual_start, actual_end, duration=30)
+        return _mins_to_time(found) if found is not None else None
 
     @classmethod
     def allocate_exercise_time(
@@ -179,6 +172,7 @@ class MealAllocator:
         user_schedule: UserSchedule,
         day: Day,
         meal_times: list[time],
+        free_intervals: FreeIntervalIndex | None = None,
     ) -> time | None:
         """
         Finds an available window for exercise, avoiding proximity to meals.
@@ -187,48 +181,29 @@ class MealAllocator:
         start_bound = _time_to_mins(user_schedule.wake_up_time)
         end_bound = _time_to_mins(user_schedule.sleep_time)
 
-        busy_intervals = []
-        for busy in user_schedule.busy_times:
-            if busy.day.lower() == day.lower() or busy.day.lower() == "everyday":
-                busy_intervals.append(
-                    (_time_to_mins(busy.start), _time_to_mins(busy.end))
-                )
-
-        # Add meal times as busy (plus 1 hour buffer for digestion/rest)
-        for m_time in meal_times:
-            if m_time:
-                m_mins = _time_to_mins(m_time)
-                busy_intervals.append((m_mins - 60, m_mins + 60))
-
-        # Re-sort to include meals
-        busy_intervals.sort(key=lambda x: x[0])
-
-        current_time = start_bound
-        duration = recommendation.duration_minutes
-
-        while current_time + duration <= end_bound:
-            prev_time = current_time
-            conflict = False
-            slot_end = current_time + duration
-            for b_start, b_end in busy_intervals:
-                if current_time < b_end and slot_end > b_start:
-                    conflict = True
-                    current_time = max(current_time, b_end)
-                    break
-
-            if not conflict:
-                return _mins_to_time(current_time)
-
-            if current_time <= prev_time:
-                current_time += 15  # Check every 15 mins
-
-        return None
+        # Meal times are busy too (plus 1 hour buffer for digestion/rest)
+        meal_buffers = [
+            (_time_to_mins(m_time) - 60, _time_to_mins(m_time) + 60)
+            for m_time in meal_times
+            if m_time
+        ]
+
+        if free_intervals is None:
+            free_intervals = cls.free_interval_index(user_schedule, day)
+        found = free_intervals.first_fit(
+            start_bound,
+            end_bound,
+            duration=recommendation.duration_minutes,
+            extra_busy=meal_buffers,
+        )
+        return _mins_to_time(found) if found is not None else None
 
     @classmethod
     def check_meal_window_availability(
         cls,
         user_schedule: UserSchedule,
         days: list[Day] | None = None,
+        free_intervals: dict[Day, FreeIntervalIndex] | None = None,
     ) -> dict[tuple[MealSlot, Day], bool]:
         """
         Checks whether each meal slot has a schedulable 30-min window for each
@@ -237,13 +212,18 @@ class MealAllocator:
         Returns {(MealSlot, Day): bool} where True means at least one window is
         available within the standard search range for that slot/day combination.
         Used to surface warnings when Google Calendar busy blocks prevent a meal
-        from being scheduled.
+        from being scheduled. Pass free_intervals (per day) to reuse indexes the
+        caller already built for the same schedule.
         """
         if days is None:
             days = list(Day)
+        free_intervals = free_intervals or {}
         availability: dict[tuple[MealSlot, Day], bool] = {}
         for day in days:
+            index = free_intervals.get(day) or cls.free_interval_index(
+                user_schedule, day
+            )
             for slot in cls.SEARCH_WINDOWS:
-                found = cls._find_time_for_slot(slot, user_schedule, day)
+                found = cls._find_time_for_slot(slot, user_schedule, day, index)
                 availability[(slot, day)] = found is not None
         return availability
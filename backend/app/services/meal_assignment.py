@@ -0,0 +1,215 @@
+"""Macro-fit assignment of a week's primary recipes with CP-SAT.
+
+The greedy path hands out pool recipes in order, so a slot gets whatever
+comes next regardless of its targets. solve_weekly_primaries instead picks
+the primary for every cooked slot of the week at once, minimizing the
+weighted relative macro deviation (see macro_scoring) of each slot from its
+MealSlotTarget plus each day's calorie deviation from the day's target,
+subject to:
+
+- every lunch/dinner recipe is a primary at most once a week,
+- a leftover slot eats what its cook slot was assigned (its deviation is
+  charged to that choice),
+- breakfasts come from the rotating primaries, each used at most
+  ceil(days / primaries) times.
+
+The search is capped by a wall-clock budget that includes building the
+model. When no solution is found in time the caller assigns from the pool
+slot by slot instead.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from app.domain.enums import Day, MealSlot
+from app.schemas.meal_plan import DailyMealPlan, MealSlotTarget
+from app.services.macro_scoring import deviation_matrix, macro_matrix
+from app.services.recipe_pool import PoolRecipe
+
+logger = logging.getLogger(__name__)
+
+AssignmentMode = Literal["greedy", "scored", "solver"]
+
+SlotKey = tuple[Day, MealSlot]
+
+# Weight of a day's relative calorie deviation from the sum of its targets
+DAY_CALORIE_WEIGHT = 2.0
+# CP-SAT works on integers; relative deviations are scaled by this
+SCALE = 10_000
+
+
+@dataclass(slots=True)
+class WeeklyAssignment:
+    # Primary recipe per cooked slot (breakfasts included, leftovers not)
+    primaries: dict[SlotKey, PoolRecipe]
+    status: str
+    # Scaled objective value (lower is better)
+    objective: float
+    seconds: float
+
+
+def _unique(pool: list[PoolRecipe]) -> list[PoolRecipe]:
+    seen: set[int] = set()
+    unique = []
+    for item in pool:
+        if item.id is None or item.id in seen:
+            continue
+        seen.add(item.id)
+        unique.append(item)
+    return unique
+
+
+def solve_weekly_primaries(
+    daily_plans: list[DailyMealPlan],
+    breakfast_primaries: list[PoolRecipe],
+    main_pool: list[PoolRecipe],
+    time_limit_seconds: float,
+) -> WeeklyAssignment | None:
+    """
+    Pick the primaries of a week's slots; None if no solution was found
+    within time_limit_seconds (or none exists, e.g. the main pool is smaller
+    than the number of cooked lunch/dinner slots).
+    """
+    started = time.perf_counter()
+    main_pool = _unique(main_pool)
+    breakfast_primaries = _unique(breakfast_primaries)
+
+    # Cooked lunch/dinner slots and the leftover slots that eat them
+    cooked: dict[SlotKey, list[MealSlotTarget]] = {}
+    breakfasts: dict[SlotKey, MealSlotTarget] = {}
+    leftovers: list[tuple[SlotKey, SlotKey, MealSlotTarget]] = []
+    for plan in daily_plans:
+        for slot in plan.slots:
+            key = (plan.day, slot.slot_name)
+            if slot.slot_name == MealSlot.BREAKFAST:
+                if breakfast_primaries:
+                    breakfasts[key] = slot
+            elif (
+                slot.is_leftover and slot.leftover_from_day and slot.leftover_from_slot
+            ):
+                source = (slot.leftover_from_day, slot.leftover_from_slot)
+                leftovers.append((key, source, slot))
+            else:
+                cooked[key] = [slot]
+    for key, source, slot in leftovers:
+        if source in cooked:
+            cooked[source].append(slot)
+        else:
+            # Same as greedy: a leftover without a cooked source is cooked
+            cooked[key] = [slot]
+    if len(main_pool) < len(cooked):
+        return None
+
+    model = cp_model.CpModel()
+    objective: list[cp_model.LinearExprT] = []
+    day_calories: dict[Day, list[cp_model.LinearExprT]] = {
+        plan.day: [] for plan in daily_plans
+    }
+
+    main_macros = macro_matrix(main_pool)
+    breakfast_macros = macro_matrix(breakfast_primaries)
+
+    def choose(
+        key: SlotKey,
+        slots: list[MealSlotTarget],
+        pool: list[PoolRecipe],
+        macros: np.ndarray,
+    ) -> list[cp_model.IntVar]:
+        choice = [
+            model.new_bool_var(f"{key[0]}_{key[1]}_{i}") for i in range(len(pool))
+        ]
+        model.add_exactly_one(choice)
+        # Cost of each recipe for the slot and the leftover slots that eat it
+        costs = deviation_matrix(macros, macro_matrix(slots)).sum(axis=0)
+        for var, cost in zip(choice, np.rint(costs * SCALE).astype(int), strict=True):
+            objective.append(int(cost) * var)
+        calories = cp_model.LinearExpr.weighted_sum(
+            choice, [recipe.calories for recipe in pool]
+        )
+        day_calories[key[0]].append(calories)
+        return choice
+
+    main_vars = {
+        key: choose(key, slots, main_pool, main_macros) for key, slots in cooked.items()
+    }
+    for i in range(len(main_pool)):
+        model.add_at_most_one(choice[i] for choice in main_vars.values())
+    # Leftovers eat on their own day what was cooked for the source slot
+    for key, source, _ in leftovers:
+        if source in main_vars and key not in main_vars:
+            day_calories[key[0]].append(
+                cp_model.LinearExpr.weighted_sum(
+                    main_vars[source], [recipe.calories for recipe in main_pool]
+                )
+            )
+
+    breakfast_vars = {
+        key: choose(key, [slot], breakfast_primaries, breakfast_macros)
+        for key, slot in breakfasts.items()
+    }
+    if breakfast_vars:
+        max_repeats = math.ceil(len(breakfast_vars) / len(breakfast_primaries))
+        for i in range(len(breakfast_primaries)):
+            model.add(
+                sum(choice[i] for choice in breakfast_vars.values()) <= max_repeats
+            )
+
+    for plan in daily_plans:
+        target = sum(slot.calories for slot in plan.slots)
+        if not target or not day_calories[plan.day]:
+            continue
+        deviation = model.new_int_var(0, 10 * target, f"{plan.day}_deviation")
+        total = sum(day_calories[plan.day])
+        model.add(deviation >= total - target)
+        model.add(deviation >= target - total)
+        objective.append(round(DAY_CALORIE_WEIGHT * SCALE / target) * deviation)
+
+    model.minimize(sum(objective))
+
+    # Start from what greedy would pick (pool order, breakfasts rotating), so
+    # the search has a solution from the first moment
+    for k, choice in enumerate(main_vars.values()):
+        for i, var in enumerate(choice):
+            model.add_hint(var, i == k)
+    for d, choice in enumerate(breakfast_vars.values()):
+        for i, var in enumerate(choice):
+            model.add_hint(var, i == d % len(breakfast_primaries))
+
+    remaining = time_limit_seconds - (time.perf_counter() - started)
+    if remaining <= 0:
+        return None
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = remaining
+    # One worker: a predictable slice of an API process, not all of its cores.
+    # The model is small; presolve costs more of the budget than it saves.
+    solver.parameters.num_workers = 1
+    solver.parameters.cp_model_presolve = False
+    status = solver.solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+
+    primaries: dict[SlotKey, PoolRecipe] = {}
+    for key, choice in main_vars.items():
+        primaries[key] = next(
+            recipe
+            for var, recipe in zip(choice, main_pool, strict=True)
+            if solver.boolean_value(var)
+        )
+    for key, choice in breakfast_vars.items():
+        primaries[key] = next(
+            recipe
+            for var, recipe in zip(choice, breakfast_primaries, strict=True)
+            if solver.boolean_value(var)
+        )
+    return WeeklyAssignment(
+        primaries=primaries,
+        status=solver.status_name(status),
+        objective=solver.objective_value,
+        seconds=time.perf_counter() - started,
+    )
@@ -5,13 +5,14 @@ from datetime import date, datetime, time, timedelta
 from datetime import time as time_type
 from typing import Any
 
-from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
-from app.domain.enums import ActivityType, Day, MealSlot
-from app.models.meal import Meal, ScheduleItemAlternative
+from app.core.config import settings
+from app.db.session import get_session_factory
+from app.domain.enums import Day, MealSlot
+from app.models.meal import ScheduleItemAlternative
 from app.models.schedule import ScheduleItem as ScheduleItemORM
 from app.schemas.dietary import DietaryConstraints
 from app.schemas.meal_plan import (
@@ -20,25 +21,30 @@ from app.schemas.meal_plan import (
     MealSlotTarget,
     WeeklyMealPlan,
 )
-from app.schemas.recipe import Recipe, RecipeNutrients
+from app.schemas.recipe import Recipe
 from app.schemas.user import BusyTime, User, UserSchedule
 from app.services.exercise_service import ExercisePlanService
+from app.services.macro_scoring import RankedPool
 from app.services.meal_allocator import MealAllocator
+from app.services.meal_assignment import AssignmentMode, solve_weekly_primaries
 from app.services.nutrient_calculator import NutrientCalculator
-from app.services.spoonacular import MealType, SpoonacularClient
+from app.services.plan_persistence import (
+    PLAN_ACTIVITY_TYPES,
+    WeeklyPlanWrite,
+    week_bounds,
+    write_weekly_plans,
+)
+from app.services.recipe_cache import SharedRecipePools, get_recipe_pool_cache
+from app.services.recipe_catalog import RecipeCatalog
+from app.services.recipe_pool import PoolCursor, PoolRecipe, parse_pool
+from app.services.spoonacular import (
+    MealType,
+    QuotaExceededError,
+    SpoonacularClient,
+)
 
 logger = logging.getLogger(__name__)
 
-_DAY_OFFSETS: dict[Day, int] = {
-    Day.MONDAY: 0,
-    Day.TUESDAY: 1,
-    Day.WEDNESDAY: 2,
-    Day.THURSDAY: 3,
-    Day.FRIDAY: 4,
-    Day.SATURDAY: 5,
-    Day.SUNDAY: 6,
-}
-
 
 class MealPlanService:
     """
@@ -56,8 +62,36 @@ class MealPlanService:
         MealSlot.DINNER: MealType.MAIN_COURSE,
     }
 
-    def __init__(self, spoonacular_client: SpoonacularClient | None = None):
-        self.spoonacular_client = spoonacular_client or SpoonacularClient()
+    def __init__(
+        self,
+        spoonacular_client: SpoonacularClient | None = None,
+        catalog: RecipeCatalog | None = None,
+        local_first: bool | None = None,
+        shared_pools: SharedRecipePools | None = None,
+        assignment_mode: AssignmentMode | None = None,
+    ):
+        """
+        catalog: local recipe catalog; every pool fetched live from
+            Spoonacular is ingested into it. Defaults to the DB-backed
+            catalog when RECIPE_CATALOG_ENABLED.
+        local_first: answer pool queries from the catalog and only call
+            Spoonacular when it has too few candidates.
+        shared_pools: pools shared with other plans of the same batch job;
+            equivalent pool requests are fetched once (see batch_meal_plan).
+        assignment_mode: how recipes are picked from the pools (see
+            MEAL_PLAN_ASSIGNMENT_MODE); defaults to the setting.
+        """
+        self.spoonacular_client = spoonacular_client or SpoonacularClient(
+            cache=get_recipe_pool_cache()
+        )
+        if catalog is None and settings.RECIPE_CATALOG_ENABLED:
+            catalog = RecipeCatalog(get_session_factory())
+        self.catalog = catalog
+        if local_first is None:
+            local_first = settings.RECIPE_CATALOG_LOCAL_FIRST
+        self.local_first = local_first and catalog is not None
+        self.shared_pools = shared_pools
+        self.assignment_mode = assignment_mode or settings.MEAL_PLAN_ASSIGNMENT_MODE
 
     @staticmethod
     def _build_dietary_constraints(user: User) -> DietaryConstraints:
@@ -87,11 +121,72 @@ class MealPlanService:
         Uses ±30% calorie tolerance. A random page offset is applied so that
         identical profiles don't always receive the same recipes week-over-week.
         Results are also shuffled locally for additional variety.
+
+        In local-first mode the recipe catalog is tried first; Spoonacular is
+        only called when the catalog has fewer than count matches. With
+        shared_pools, equivalent requests from one batch job share one pool.
+        """
+        if self.shared_pools is not None:
+            key = self.shared_pools.key_for(
+                meal_type, slot_calories, constraints, count, max_ready_time
+            )
+            return await self.shared_pools.get(
+                key,
+                lambda: self._query_recipe_pool(
+                    meal_type, slot_calories, constraints, count, max_ready_time
+                ),
+            )
+        return await self._query_recipe_pool(
+            meal_type, slot_calories, constraints, count, max_ready_time
+        )
+
+    async def _query_recipe_pool(
+        self,
+        meal_type: MealType,
+        slot_calories: int,
+        constraints: DietaryConstraints,
+        count: int,
+        max_ready_time: int | None = None,
+    ) -> list[dict]:
+        """
+        Query the catalog and/or Spoonacular for one pool.
+
+        When Spoonacular is out of quota (or still throttling after retries),
+        whatever the catalog has for the query is used instead, even if it is
+        fewer than count recipes.
         """
         tolerance = 0.30
         min_cals = int(slot_calories * (1 - tolerance))
         max_cals = int(slot_calories * (1 + tolerance))
 
+        async def search_catalog() -> list[dict]:
+            assert self.catalog is not None
+            try:
+                return await self.catalog.search(
+                    meal_type,
+                    min_cals,
+                    max_cals,
+                    constraints,
+                    count,
+                    max_ready_time=max_ready_time,
+                )
+            except Exception:
+                logger.exception("Recipe catalog search failed")
+                return []
+
+        local: list[dict] | None = None
+        if self.local_first and self.catalog is not None:
+            local = await search_catalog()
+            if len(local) >= count:
+                logger.info(
+                    "Recipe pool served from catalog: type=%s, %d-%d cal, count=%d",
+                    meal_type,
+                    min_cals,
+                    max_cals,
+                    count,
+                )
+                return local
+
         # Random offset so repeated calls with the same profile vary.
         # Capped at count//2 so small pools (e.g. breakfast count=5) don't
         # page past all available results.
@@ -106,15 +201,41 @@ class MealPlanService:
             offset,
         )
 
-        results = await self.spoonacular_client.search_recipes(
-            type=meal_type,
-            min_calories=min_cals,
-            max_calories=max_cals,
-            constraints=constraints,
-            number=count,
-            offset=offset,
-            max_ready_time=max_ready_time,
-        )
+        async def ingest(fetched: list[dict]) -> None:
+            assert self.catalog is not None
+            try:
+                await self.catalog.ingest(fetched, meal_type, constraints)
+            except Exception:
+                logger.exception("Recipe catalog ingest failed")
+
+        try:
+            results = await self.spoonacular_client.search_recipes(
+                type=meal_type,
+                min_calories=min_cals,
+                max_calories=max_cals,
+                constraints=constraints,
+                number=count,
+                offset=offset,
+                max_ready_time=max_ready_time,
+                # Cached pools are already in the catalog
+                on_fetch=ingest if self.catalog is not None else None,
+            )
+        except QuotaExceededError:
+            if self.catalog is None:
+                raise
+            if local is None:
+                local = await search_catalog()
+            if not local:
+                raise
+            logger.warning(
+                "Spoonacular unavailable (quota); using %d catalog recipes "
+                "for type=%s, %d-%d cal",
+                len(local),
+                meal_type,
+                min_cals,
+                max_cals,
+            )
+            return local
 
         random.shuffle(results)
         return results
@@ -122,30 +243,31 @@ class MealPlanService:
     @staticmethod
     def _assign_slot_recipes(
         slot: MealSlotTarget,
-        pool: list[dict],
-        used_ids: set[int],
+        pool: PoolCursor | RankedPool,
+        primary: PoolRecipe | None = None,
     ) -> MealSlotTarget:
         """
         Assign a primary recipe and up to 2 alternatives from the pool.
 
-        - Primary: first unused recipe (added to used_ids globally)
-        - Alternatives: next unused recipes (also added to used_ids globally so
-          they can never appear as a primary recommendation on another day)
+        - Primary: the given one (already picked, e.g. by the solver), else
+          the next unused recipe (added to pool.used_ids globally): in pool
+          order from a PoolCursor, best macro fit from a RankedPool
+        - Alternatives: the following unused recipes (also marked used globally
+          so they can never appear as a primary recommendation on another day)
         - Raises ValueError if no unused primary is available
         - Sets slot.plan as MealOption and slot.prep_time_minutes
         """
-        candidates: list[dict] = []
-        for item in pool:
-            rid = item.get("id")
-            if rid not in used_ids and rid not in [c.get("id") for c in candidates]:
-                candidates.append(item)
-                if len(candidates) >= 3:
-                    break
+        wanted = 3 if primary is None else 2
+        if isinstance(pool, RankedPool):
+            taken = pool.take(slot, wanted)
+        else:
+            taken = pool.take(wanted)
+        candidates = taken if primary is None else [primary, *taken]
 
         if not candidates:
             raise ValueError(
                 f"No unused recipes available for {slot.slot_name}. "
-                f"Pool exhausted ({len(pool)} recipes, {len(used_ids)} used)."
+                f"Pool exhausted ({len(pool)} recipes, {len(pool.used_ids)} used)."
             )
 
         if len(candidates) < 3:
@@ -155,13 +277,8 @@ class MealPlanService:
                 slot.slot_name,
             )
 
-        # Track all candidates (primary + alternatives) globally so no recipe
-        # appears as both an alternative for one slot and a primary on another day.
-        for candidate in candidates:
-            used_ids.add(candidate["id"])
-
-        main_recipe = MealPlanService._convert_to_recipe(candidates[0])
-        alternatives = [MealPlanService._convert_to_recipe(c) for c in candidates[1:]]
+        main_recipe = candidates[0].to_recipe()
+        alternatives = [c.to_recipe() for c in candidates[1:]]
 
         slot.plan = MealOption(main_recipe=main_recipe, alternatives=alternatives)
         slot.prep_time_minutes = main_recipe.preparation_time_minutes or 30
@@ -221,11 +338,17 @@ class MealPlanService:
             ),
         )
 
-        # Distribute recipes across slots
+        # Distribute recipes across slots; pools are parsed once up front
+        # Both cursors share one used set, so no recipe repeats within the day
         used_ids: set[int] = set()
+        breakfast_recipes = self._recipe_pool(parse_pool(breakfast_pool), used_ids)
+        main_recipes = self._recipe_pool(parse_pool(main_pool), used_ids)
         for slot in meal_plan.slots:
-            pool = breakfast_pool if slot.slot_name == MealSlot.BREAKFAST else main_pool
-            self._assign_slot_recipes(slot, pool, used_ids)
+            if slot.slot_name == MealSlot.BREAKFAST:
+                pool = breakfast_recipes
+            else:
+                pool = main_recipes
+            self._assign_slot_recipes(slot, pool)
 
         return meal_plan
 
@@ -241,6 +364,11 @@ class MealPlanService:
         """
         # Pre-calculate schedules for the whole week
         weekly_schedules = {day: self._get_user_schedule(user, day) for day in Day}
+        # Free-time indexes, shared by meal and exercise placement below
+        weekly_free_intervals = {
+            day: MealAllocator.free_interval_index(schedule, day)
+            for day, schedule in weekly_schedules.items()
+        }
 
         # Step 1: Generate Weekly Exercise Plan (One-time call)
         exercise_plan = ExercisePlanService.generate_weekly_plan(user, weekly_schedules)
@@ -268,6 +396,7 @@ class MealPlanService:
                 daily_targets=daily_targets,
                 user_schedule=user_schedule,
                 day=day,
+                free_intervals=weekly_free_intervals[day],
             )
 
             # Schedule the exercise time if it exists
@@ -278,6 +407,7 @@ class MealPlanService:
                     user_schedule=user_schedule,
                     day=day,
                     meal_times=meal_times,
+                    free_intervals=weekly_free_intervals[day],
                 )
                 if exercise_rec.time:
                     plan.exercise = exercise_rec
@@ -321,14 +451,27 @@ class MealPlanService:
             ),
         )
 
+        # Parse each pool once; Recipe models are only built for recipes that
+        # are placed in a slot, and reused when one is placed again.
+        breakfast_recipes = parse_pool(breakfast_pool)
+        # Main recipes are handed out each at most once a week
+        main_recipes = self._recipe_pool(parse_pool(main_pool))
+
         # Split breakfast pool: primaries (rotate across the week) vs alternatives
         # (never used as a primary, so they never appear as weekly recommendations).
-        n_primaries = min(3, len(breakfast_pool))
-        breakfast_primaries = breakfast_pool[:n_primaries]
-        breakfast_alts = breakfast_pool[n_primaries:]  # dedicated swap options
+        n_primaries = min(3, len(breakfast_recipes))
+        breakfast_primaries = breakfast_recipes[:n_primaries]
+        breakfast_alts = breakfast_recipes[n_primaries:]  # dedicated swap options
+        ranked_breakfast_alts = (
+            None if self.assignment_mode == "greedy" else RankedPool(breakfast_alts)
+        )
 
-        # Step 5: Assign recipes from pools, respecting leftovers
-        used_ids: set[int] = set()
+        # Step 5: Assign recipes from pools, respecting leftovers. The solver
+        # picks every primary up front; otherwise slots take them from the
+        # pool (in pool order for greedy, best fit first for scored).
+        primaries = await self._solve_weekly_primaries(
+            daily_plans, breakfast_primaries, main_recipes
+        )
         recipe_manifest: dict[tuple[Day, MealSlot], Recipe] = {}
 
         breakfast_idx = 0
@@ -349,13 +492,19 @@ class MealPlanService:
                 if slot.slot_name == MealSlot.BREAKFAST:
                     if breakfast_primaries:
                         n_prim = len(breakfast_primaries)
-                        primary_data = breakfast_primaries[breakfast_idx % n_prim]
+                        primary_data = primaries.get(
+                            (plan.day, slot.slot_name),
+                            breakfast_primaries[breakfast_idx % n_prim],
+                        )
                         # Alternatives come exclusively from the dedicated alts pool
                         # so they never coincide with any weekly primary breakfast.
-                        alts_data = breakfast_alts[:2]
+                        if ranked_breakfast_alts is None:
+                            alts_data = breakfast_alts[:2]
+                        else:
+                            alts_data = ranked_breakfast_alts.rank(slot, 2)
                         breakfast_idx += 1
-                        main_recipe = self._convert_to_recipe(primary_data)
-                        alternatives = [self._convert_to_recipe(a) for a in alts_data]
+                        main_recipe = primary_data.to_recipe()
+                        alternatives = [a.to_recipe() for a in alts_data]
                         slot.plan = MealOption(
                             main_recipe=main_recipe, alternatives=alternatives
                         )
@@ -363,7 +512,9 @@ class MealPlanService:
                             main_recipe.preparation_time_minutes or 30, 30
                         )
                 else:
-                    self._assign_slot_recipes(slot, main_pool, used_ids)
+                    self._assign_slot_recipes(
+                        slot, main_recipes, primaries.get((plan.day, slot.slot_name))
+                    )
 
                     # Store in manifest for potential leftover lookups
                     if slot.plan and slot.plan.main_recipe:
@@ -376,6 +527,52 @@ class MealPlanService:
             daily_plans=daily_plans, total_weekly_calories=total_weekly_cals
         )
 
+    def _recipe_pool(
+        self, recipes: list[PoolRecipe], used_ids: set[int] | None = None
+    ) -> PoolCursor | RankedPool:
+        """Pool order for "greedy"; best macro fit per slot otherwise."""
+        if self.assignment_mode == "greedy":
+            return PoolCursor(recipes, used_ids)
+        return RankedPool(recipes, used_ids)
+
+    async def _solve_weekly_primaries(
+        self,
+        daily_plans: list[DailyMealPlan],
+        breakfast_primaries: list[PoolRecipe],
+        main_recipes: PoolCursor | RankedPool,
+    ) -> dict[tuple[Day, MealSlot], PoolRecipe]:
+        """
+        Primaries picked by the solver in "solver" mode, reserved in
+        main_recipes so they are not handed out as alternatives. Empty (slots
+        take primaries from the pool) in other modes or when the solver finds
+        nothing in time. The solve runs in a worker thread so it does not
+        block the event loop.
+        """
+        if self.assignment_mode != "solver":
+            return {}
+        result = await asyncio.to_thread(
+            solve_weekly_primaries,
+            daily_plans,
+            breakfast_primaries,
+            main_recipes.pool,
+            settings.MEAL_PLAN_SOLVER_TIME_LIMIT_MS / 1000,
+        )
+        if result is None:
+            logger.warning("No solver assignment in time; assigning from the pool")
+            return {}
+        logger.info(
+            "Solver assignment: status=%s, objective=%.0f, %.1f ms",
+            result.status,
+            result.objective,
+            result.seconds * 1000,
+        )
+        main_recipes.used_ids.update(
+            recipe.id
+            for key, recipe in result.primaries.items()
+            if key[1] != MealSlot.BREAKFAST and recipe.id is not None
+        )
+        return result.primaries
+
     async def generate_and_persist(
         self,
         user: User,
@@ -395,10 +592,7 @@ class MealPlanService:
 
         Returns the persisted ScheduleItems with meal + alternatives eager-loaded.
         """
-        week_start_dt = datetime.combine(week_start_date, time_type(0, 0, 0))
-        week_end_dt = datetime.combine(
-            week_start_date + timedelta(days=6), time_type(23, 59, 59)
-        )
+        week_start_dt, week_end_dt = week_bounds(week_start_date)
 
         google_result = await db.execute(
             select(ScheduleItemORM).where(
@@ -410,12 +604,7 @@ class MealPlanService:
         )
         google_blocks = google_result.scalars().all()
 
-        # Meal/exercise scheduling uses Google Calendar busy times exclusively.
-        # Manual busy_times stored on the user profile are intentionally ignored
-        # so that only calendar-synced events influence slot placement.
-        extra_busy = self._google_blocks_to_busy_times(list(google_blocks))
-        planning_user = user.model_copy(update={"busy_times": extra_busy})
-
+        planning_user = self._planning_user(user, list(google_blocks))
         weekly_plan = await self.generate_weekly_plan(planning_user)
         return await self._persist_weekly_plan(
             daily_plans=weekly_plan.daily_plans,
@@ -424,6 +613,18 @@ class MealPlanService:
             db=db,
         )
 
+    @classmethod
+    def _planning_user(cls, user: User, google_blocks: list) -> User:
+        """
+        The user as the planner sees them for one week.
+
+        Meal/exercise scheduling uses Google Calendar busy times exclusively.
+        Manual busy_times stored on the user profile are intentionally ignored
+        so that only calendar-synced events influence slot placement.
+        """
+        extra_busy = cls._google_blocks_to_busy_times(google_blocks)
+        return user.model_copy(update={"busy_times": extra_busy})
+
     @staticmethod
     def _google_blocks_to_busy_times(blocks: list) -> list[BusyTime]:
         """
@@ -480,163 +681,18 @@ class MealPlanService:
         week_start_date: date,
         db: AsyncSession,
     ) -> list[ScheduleItemORM]:
-        # Step 1: Delete existing meal items for this week
-        week_start_dt = datetime.combine(week_start_date, time_type(0, 0, 0))
-        week_end_dt = datetime.combine(
-            week_start_date + timedelta(days=6), time_type(23, 59, 59)
-        )
-        await db.execute(
-            delete(ScheduleItemORM).where(
-                ScheduleItemORM.user_id == user_id,
-                ScheduleItemORM.activity_type.in_(
-                    [ActivityType.MEAL, ActivityType.EXERCISE]
-                ),
-                ScheduleItemORM.date >= week_start_dt,
-                ScheduleItemORM.date <= week_end_dt,
-            )
+        await write_weekly_plans(
+            db, [WeeklyPlanWrite(user_id, week_start_date, daily_plans)]
         )
-
-        # Step 2: Create Meal rows for every unique recipe (primary + alternatives)
-        recipe_id_to_meal: dict[str, Meal] = {}
-
-        for plan in daily_plans:
-            for slot in plan.slots:
-                if slot.is_leftover or not slot.plan:
-                    continue
-                # Primary recipe
-                if slot.plan.main_recipe:
-                    r = slot.plan.main_recipe
-                    if r.id not in recipe_id_to_meal:
-                        meal_row = Meal(
-                            recipe_id=r.id,
-                            title=r.title,
-                            image_url=r.image_url,
-                            source_url=r.source_url,
-                            calories=r.nutrients.calories,
-                            protein=r.nutrients.protein,
-                            carbohydrates=r.nutrients.carbohydrates,
-                            fat=r.nutrients.fat,
-                            prep_time_minutes=r.preparation_time_minutes,
-                            ingredients=r.ingredients,
-                            tags=r.tags,
-                        )
-                        db.add(meal_row)
-                        recipe_id_to_meal[r.id] = meal_row
-                # Alternative recipes
-                for alt in slot.plan.alternatives:
-                    if alt.id not in recipe_id_to_meal:
-                        alt_row = Meal(
-                            recipe_id=alt.id,
-                            title=alt.title,
-                            image_url=alt.image_url,
-                            source_url=alt.source_url,
-                            calories=alt.nutrients.calories,
-                            protein=alt.nutrients.protein,
-                            carbohydrates=alt.nutrients.carbohydrates,
-                            fat=alt.nutrients.fat,
-                            prep_time_minutes=alt.preparation_time_minutes,
-                            ingredients=alt.ingredients,
-                            tags=alt.tags,
-                        )
-                        db.add(alt_row)
-                        recipe_id_to_meal[alt.id] = alt_row
-
-        await db.flush()  # Assign Meal.id values
-
-        # Step 3: Create ScheduleItem rows (one per slot)
-        plan_slot_to_item: dict[tuple, ScheduleItemORM] = {}
-
-        for plan in daily_plans:
-            offset = _DAY_OFFSETS[plan.day]
-            slot_date = week_start_date + timedelta(days=offset)
-
-            for slot in plan.slots:
-                meal_time = slot.time or time_type(12, 0)
-                item_dt = datetime.combine(slot_date, meal_time)
-                prep = 5 if slot.is_leftover else (slot.prep_time_minutes or 30)
-
-                # Meal link: leftovers get their meal_id set in step 4
-                meal_obj = None
-                if not slot.is_leftover and slot.plan and slot.plan.main_recipe:
-                    meal_obj = recipe_id_to_meal.get(slot.plan.main_recipe.id)
-
-                schedule_item = ScheduleItemORM(
-                    user_id=user_id,
-                    date=item_dt,
-                    activity_type=ActivityType.MEAL,
-                    meal_type=slot.slot_name.value,
-                    duration_minutes=max(30, prep),
-                    prep_time_minutes=prep,
-                    is_completed=False,
-                    meal_id=meal_obj.id if meal_obj else None,
-                )
-                db.add(schedule_item)
-                plan_slot_to_item[(plan.day, slot.slot_name)] = schedule_item
-
-        await db.flush()  # Assign ScheduleItem.id values
-
-        # Step 3b: Create exercise ScheduleItem rows
-        for plan in daily_plans:
-            if not plan.exercise:
-                continue
-            offset = _DAY_OFFSETS[plan.day]
-            slot_date = week_start_date + timedelta(days=offset)
-            exercise_time = plan.exercise.time or time_type(7, 0)
-            db.add(
-                ScheduleItemORM(
-                    user_id=user_id,
-                    date=datetime.combine(slot_date, exercise_time),
-                    activity_type=ActivityType.EXERCISE,
-                    duration_minutes=plan.exercise.duration_minutes,
-                    prep_time_minutes=0,
-                    is_completed=False,
-                    exercise_category=plan.exercise.category,
-                    exercise_calorie_burn=plan.exercise.calories_burned,
-                    exercise_muscle_gain=plan.exercise.muscle_gain_estimate_kg,
-                )
-            )
-
-        # Step 4: Resolve leftover links (source_schedule_item_id + meal_id)
-        for plan in daily_plans:
-            for slot in plan.slots:
-                if not slot.is_leftover:
-                    continue
-                leftover_item = plan_slot_to_item.get((plan.day, slot.slot_name))
-                source_item = plan_slot_to_item.get(
-                    (slot.leftover_from_day, slot.leftover_from_slot)
-                )
-                if leftover_item and source_item:
-                    leftover_item.source_schedule_item_id = source_item.id
-                    leftover_item.meal_id = source_item.meal_id
-
-        # Step 5: Create ScheduleItemAlternative rows
-        for plan in daily_plans:
-            for slot in plan.slots:
-                if slot.is_leftover or not slot.plan or not slot.plan.alternatives:
-                    continue
-                alt_schedule_item = plan_slot_to_item.get((plan.day, slot.slot_name))
-                if not alt_schedule_item:
-                    continue
-                for alt_recipe in slot.plan.alternatives:
-                    alt_meal = recipe_id_to_meal.get(alt_recipe.id)
-                    if alt_meal:
-                        db.add(
-                            ScheduleItemAlternative(
-                                schedule_item_id=alt_schedule_item.id,
-                                meal_id=alt_meal.id,
-                            )
-                        )
-
         await db.commit()
 
-        # Step 6: Re-fetch all created items with relationships
+        # Re-fetch all created items with relationships
+        week_start_dt, week_end_dt = week_bounds(week_start_date)
         stmt = (
             select(ScheduleItemORM)
             .where(
                 ScheduleItemORM.user_id == user_id,
-                ScheduleItemORM.activity_type.in_(
-                    [ActivityType.MEAL, ActivityType.EXERCISE]
-                ),
+                ScheduleItemORM.activity_type.in_(PLAN_ACTIVITY_TYPES),
                 ScheduleItemORM.date >= week_start_dt,
                 ScheduleItemORM.date <= week_end_dt,
             )
@@ -759,50 +815,4 @@ class MealPlanService:
         """
         Converts Spoonacular API response to Recipe Pydantic model.
         """
-        nutrition = spoon_data.get("nutrition", {})
-        nutrients_list = nutrition.get("nutrients", [])
-
-        calories = 0
-        protein = 0
-        carbs = 0
-        fat = 0
-
-        for nutrient in nutrients_list:
-            name = nutrient.get("name", "").lower()
-            amount = int(nutrient.get("amount", 0))
-
-            if "calorie" in name:
-                calories = amount
-            elif "protein" in name:
-                protein = amount
-            elif "carbohydrate" in name:
-                carbs = amount
-            elif "fat" in name:
-                fat = amount
-
-        ingredients = []
-        extended_ingredients = spoon_data.get("extendedIngredients", [])
-        for ing in extended_ingredients:
-            ingredients.append(ing.get("original", ""))
-
-        tags = []
-        tags.extend(spoon_data.get("diets", []))
-        tags.extend(spoon_data.get("dishTypes", []))
-        tags.extend(spoon_data.get("cuisines", []))
-
-        return Recipe(
-            id=str(spoon_data.get("id", "")),
-            title=spoon_data.get("title", "Unknown Recipe"),
-            description=spoon_data.get("summary", ""),
-            nutrients=RecipeNutrients(
-                calories=calories,
-                protein=protein,
-                carbohydrates=carbs,
-                fat=fat,
-            ),
-            tags=tags,
-            ingredients=ingredients,
-            preparation_time_minutes=spoon_data.get("readyInMinutes"),
-            source_url=spoon_data.get("sourceUrl"),
-            image_url=spoon_data.get("image"),
-        )
+        return PoolRecipe.from_spoonacular(spoon_data).to_recipe()
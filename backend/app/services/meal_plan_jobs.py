@@ -0,0 +1,344 @@
+"""Postgres-backed queue for asynchronous generate-week requests.
+
+POST /meal-plans/jobs enqueues a MealPlanJob and returns at once. Worker
+loops claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so workers in any
+number of processes share the table without running a job twice. Workers
+run inside the API process (MEAL_PLAN_JOB_WORKERS) or standalone with
+`python -m app.cli worker`.
+
+- A user has at most one pending job per week. Repeat requests return the
+  pending job (partial unique index on meal_plan_jobs).
+- A job is never claimed while another job for the same user and week is
+  running, so two plans for one week are never written concurrently.
+- A claimed job holds a lease, which its worker renews every third of the
+  lease while the job runs. If the worker dies, the job becomes claimable
+  again once the lease expires, up to MEAL_PLAN_JOB_MAX_ATTEMPTS. A worker
+  that fails to renew because the job was re-claimed abandons its attempt.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import and_, exists, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased, selectinload
+
+from app.core.config import settings
+from app.db.session import get_session_factory
+from app.domain.enums import JobStatus
+from app.models.meal_plan_job import MealPlanJob
+from app.models.user import User as UserORM
+from app.schemas.user import UserRead
+from app.services.meal_plan import MealPlanService
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+async def enqueue_generate_week(
+    db: AsyncSession, user_id: str, week_start_date: date
+) -> MealPlanJob:
+    """Queue a generate-week job, or return the identical one already pending."""
+    for _ in range(3):
+        stmt = (
+            pg_insert(MealPlanJob)
+            .values(
+                user_id=user_id,
+                week_start_date=week_start_date,
+                status=JobStatus.PENDING,
+                attempts=0,
+                created_at=_now(),
+            )
+            .on_conflict_do_nothing(
+                index_elements=["user_id", "week_start_date"],
+                index_where=text("status = 'pending'"),
+            )
+            .returning(MealPlanJob.id)
+        )
+        job_id = (await db.execute(stmt)).scalar_one_or_none()
+        if job_id is None:
+            result = await db.execute(
+                select(MealPlanJob.id).where(
+                    MealPlanJob.user_id == user_id,
+                    MealPlanJob.week_start_date == week_start_date,
+                    MealPlanJob.status == JobStatus.PENDING,
+                )
+            )
+            # None: the pending job was claimed in between; insert again
+            job_id = result.scalar_one_or_none()
+        if job_id is not None:
+            await db.commit()
+            job = await db.get(MealPlanJob, job_id, populate_existing=True)
+            assert job is not None
+            return job
+    raise RuntimeError("Could not enqueue meal plan job")
+
+
+async def get_job(db: AsyncSession, job_id: int, user_id: str) -> MealPlanJob | None:
+    """The user's job with the latest committed state, or None."""
+    result = await db.execute(
+        select(MealPlanJob)
+        .where(MealPlanJob.id == job_id, MealPlanJob.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def claim_next_job(
+    db: AsyncSession,
+    lease_seconds: float,
+    max_attempts: int,
+) -> MealPlanJob | None:
+    """
+    Lock the oldest claimable job, mark it running under a fresh lease and
+    commit. Jobs whose lease expired too many times are failed instead.
+    """
+    running = aliased(MealPlanJob)
+    while True:
+        now = _now()
+        week_busy = exists().where(
+            running.user_id == MealPlanJob.user_id,
+            running.week_start_date == MealPlanJob.week_start_date,
+            running.status == JobStatus.RUNNING,
+            running.lease_expires_at > now,
+        )
+        result = await db.execute(
+            select(MealPlanJob)
+            .where(
+                or_(
+                    MealPlanJob.status == JobStatus.PENDING,
+                    and_(
+                        MealPlanJob.status == JobStatus.RUNNING,
+                        MealPlanJob.lease_expires_at <= now,
+                    ),
+                ),
+                ~week_busy,
+            )
+            .order_by(MealPlanJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True, of=MealPlanJob)
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            await db.rollback()
+            return None
+
+        if job.attempts >= max_attempts:
+            job.status = JobStatus.FAILED
+            job.error = "Meal plan job was abandoned by its worker too many times"
+            job.finished_at = now
+            job.lease_expires_at = None
+            await db.commit()
+            continue
+
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.started_at = now
+        job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+        await db.commit()
+        return job
+
+
+async def renew_lease(
+    db: AsyncSession, job_id: int, attempt: int, lease_seconds: float
+) -> bool:
+    """Extend a running attempt's lease; False once another attempt owns it."""
+    result = await db.execute(
+        update(MealPlanJob)
+        .where(
+            MealPlanJob.id == job_id,
+            MealPlanJob.attempts == attempt,
+            MealPlanJob.status == JobStatus.RUNNING,
+        )
+        .values(lease_expires_at=_now() + timedelta(seconds=lease_seconds))
+        .returning(MealPlanJob.id)
+    )
+    renewed = result.scalar_one_or_none() is not None
+    await db.commit()
+    return renewed
+
+
+async def _load_user(db: AsyncSession, user_id: str) -> UserRead | None:
+    result = await db.execute(
+        select(UserORM)
+        .where(UserORM.id == user_id)
+        .options(
+            selectinload(UserORM.user_allergies),
+            selectinload(UserORM.user_include_cuisines),
+            selectinload(UserORM.user_exclude_cuisines),
+            selectinload(UserORM.user_busy_times),
+        )
+    )
+    user = result.scalar_one_or_none()
+    return UserRead.model_validate(user) if user is not None else None
+
+
+async def run_job(db: AsyncSession, job: MealPlanJob, service: MealPlanService) -> None:
+    """Generate and persist the job's week, then record the outcome."""
+    job_id, attempt = job.id, job.attempts
+    error = None
+    try:
+        user = await _load_user(db, job.user_id)
+        if user is None:
+            error = "User not found"
+        else:
+            await service.generate_and_persist(user, job.week_start_date, db)
+    except Exception as e:
+        logger.exception("Meal plan job %s failed", job_id)
+        await db.rollback()
+        error = f"Failed to generate meal plan: {e}"
+
+    # Only the holder of this attempt may finish the job; after a lost lease
+    # another worker owns it
+    await db.execute(
+        update(MealPlanJob)
+        .where(MealPlanJob.id == job_id, MealPlanJob.attempts == attempt)
+        .values(
+            status=JobStatus.FAILED if error else JobStatus.SUCCEEDED,
+            error=error,
+            finished_at=_now(),
+            lease_expires_at=None,
+        )
+    )
+    await db.commit()
+
+
+class MealPlanJobWorker:
+    """
+    concurrency loops that each claim and run one job at a time. Idle loops
+    poll every poll_seconds, or sooner when notify() is called after an
+    enqueue in the same process.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int = 2,
+        poll_seconds: float = 2.0,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        service_factory: Callable[[], MealPlanService] = MealPlanService,
+    ):
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency)
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.service_factory = service_factory
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def run_once(self) -> bool:
+        """Claim and run one job; False when there was nothing to claim."""
+        async with self.session_factory() as db:
+            job = await claim_next_job(db, self.lease_seconds, self.max_attempts)
+            if job is None:
+                return False
+            run = asyncio.create_task(run_job(db, job, self.service_factory()))
+            heartbeat = asyncio.create_task(self._keep_lease(job.id, job.attempts, run))
+            try:
+                await asyncio.wait({run})
+            finally:
+                heartbeat.cancel()
+                run.cancel()
+                await asyncio.gather(heartbeat, run, return_exceptions=True)
+            if not run.cancelled():
+                run.result()
+            return True
+
+    async def _keep_lease(
+        self, job_id: int, attempt: int, run: asyncio.Task[None]
+    ) -> None:
+        """Renew the lease while run works; cancel run if the lease is lost."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                # The job's own session is busy in its transaction
+                async with self.session_factory() as db:
+                    renewed = await renew_lease(db, job_id, attempt, self.lease_seconds)
+            except Exception:
+                logger.exception(
+                    "Could not renew the lease of meal plan job %s", job_id
+                )
+                continue
+            if not renewed:
+                logger.warning(
+                    "Meal plan job %s was re-claimed; abandoning attempt %s",
+                    job_id,
+                    attempt,
+                )
+                run.cancel()
+                return
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                if await self.run_once():
+                    continue
+            except Exception:
+                logger.exception("Meal plan job worker error")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._loop()) for _ in range(self.concurrency)
+            ]
+
+    async def stop(self) -> None:
+        """Cancel the loops; an interrupted job is retried after its lease."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+_worker: MealPlanJobWorker | None = None
+
+
+def build_worker(concurrency: int | None = None) -> MealPlanJobWorker:
+    return MealPlanJobWorker(
+        get_session_factory(),
+        concurrency=(
+            settings.MEAL_PLAN_JOB_WORKERS if concurrency is None else concurrency
+        ),
+        poll_seconds=settings.MEAL_PLAN_JOB_POLL_SECONDS,
+        lease_seconds=settings.MEAL_PLAN_JOB_LEASE_SECONDS,
+        max_attempts=settings.MEAL_PLAN_JOB_MAX_ATTEMPTS,
+    )
+
+
+def start_job_workers() -> None:
+    """Start the in-process workers (app lifespan), if configured."""
+    global _worker
+    if _worker is None and settings.MEAL_PLAN_JOB_WORKERS > 0 and settings.DATABASE_URL:
+        _worker = build_worker()
+        _worker.start()
+
+
+async def stop_job_workers() -> None:
+    global _worker
+    if _worker is not None:
+        await _worker.stop()
+        _worker = None
+
+
+def notify_job_workers() -> None:
+    """Wake this process's idle workers, if any, after an enqueue."""
+    if _worker is not None:
+        _worker.notify()
@@ -0,0 +1,316 @@
+"""Bulk persistence of generated weekly plans.
+
+A generated week is written in a fixed number of statements, however many
+slots, leftovers and alternatives it has:
+
+1. DELETE the week's existing meal / exercise items
+2. upsert the shared Meal rows (INSERT ... ON CONFLICT ... RETURNING), then
+   SELECT the ids of the rows it left unchanged
+3. multi-row INSERT ... RETURNING for cooked meal and exercise items
+4. multi-row INSERT for leftover items, linked to the ids returned by (3)
+5. multi-row INSERT for schedule_item_alternatives
+
+Several users' weeks can be passed at once and still share those statements.
+Nothing here commits; the caller owns the transaction.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from datetime import time as time_type
+from typing import Any
+
+from sqlalchemy import JSON, and_, cast, delete, insert, or_, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.enums import ActivityType, Day, MealSlot
+from app.models.meal import SHARED_MEAL_PREDICATE, Meal, ScheduleItemAlternative
+from app.models.schedule import ScheduleItem as ScheduleItemORM
+from app.schemas.meal_plan import DailyMealPlan
+from app.schemas.recipe import Recipe
+
+_DAY_OFFSETS: dict[Day, int] = {
+    Day.MONDAY: 0,
+    Day.TUESDAY: 1,
+    Day.WEDNESDAY: 2,
+    Day.THURSDAY: 3,
+    Day.FRIDAY: 4,
+    Day.SATURDAY: 5,
+    Day.SUNDAY: 6,
+}
+
+PLAN_ACTIVITY_TYPES = [ActivityType.MEAL, ActivityType.EXERCISE]
+
+# (plan index, day, slot) — identifies a meal slot across a batch of weeks
+_SlotKey = tuple[int, Day | None, MealSlot | None]
+
+# Shared Meal columns refreshed from the recipe on every upsert
+_SHARED_MEAL_UPDATE_COLUMNS = (
+    "title",
+    "image_url",
+    "source_url",
+    "calories",
+    "protein",
+    "carbohydrates",
+    "fat",
+    "prep_time_minutes",
+    "ingredients",
+    "tags",
+)
+
+
+@dataclass
+class WeeklyPlanWrite:
+    user_id: str
+    week_start_date: date
+    daily_plans: list[DailyMealPlan]
+
+
+def _comparable(column: Any) -> Any:
+    # json has no equality operator; compare JSON columns as jsonb
+    return cast(column, JSONB) if isinstance(column.type, JSON) else column
+
+
+def week_bounds(week_start_date: date) -> tuple[datetime, datetime]:
+    """First and last instants of the Monday-start week, as stored in schedules."""
+    return (
+        datetime.combine(week_start_date, time_type(0, 0, 0)),
+        datetime.combine(week_start_date + timedelta(days=6), time_type(23, 59, 59)),
+    )
+
+
+def _schedule_row(
+    user_id: str,
+    item_dt: datetime,
+    activity_type: ActivityType,
+    duration_minutes: int,
+    prep_time_minutes: int = 0,
+    meal_type: str | None = None,
+    meal_id: int | None = None,
+    source_schedule_item_id: int | None = None,
+    exercise_category: Any = None,
+    exercise_calorie_burn: int = 0,
+    exercise_muscle_gain: float = 0.0,
+) -> dict[str, Any]:
+    # Every row carries the same keys so each batch renders as one statement
+    return {
+        "user_id": user_id,
+        "date": item_dt,
+        "activity_type": activity_type,
+        "meal_type": meal_type,
+        "duration_minutes": duration_minutes,
+        "prep_time_minutes": prep_time_minutes,
+        "is_completed": False,
+        "meal_id": meal_id,
+        "source_schedule_item_id": source_schedule_item_id,
+        "exercise_category": exercise_category,
+        "exercise_calorie_burn": exercise_calorie_burn,
+        "exercise_muscle_gain": exercise_muscle_gain,
+        "source_type": "sophros",
+    }
+
+
+async def upsert_shared_meals(
+    db: AsyncSession, recipes: list[Recipe]
+) -> dict[str, int]:
+    """
+    Insert-or-update the shared (non-custom) Meal row for each recipe.
+
+    Spoonacular meals are content-addressed by recipe_id: regenerating a
+    plan reuses the existing row instead of inserting a duplicate. One
+    multi-row INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement
+    covers every recipe. Returns {recipe_id: meal.id}.
+
+    These rows are shared by every user's plan and stay locked until the
+    caller commits, so concurrent writers must lock them in the same order:
+    rows are sorted by recipe_id. Rows whose content is unchanged are not
+    rewritten; RETURNING skips them, so their ids are read back afterwards.
+    """
+    if not recipes:
+        return {}
+
+    rows = [
+        {
+            "recipe_id": r.id,
+            "title": r.title,
+            "image_url": r.image_url,
+            "source_url": r.source_url,
+            "calories": r.nutrients.calories,
+            "protein": r.nutrients.protein,
+            "carbohydrates": r.nutrients.carbohydrates,
+            "fat": r.nutrients.fat,
+            "prep_time_minutes": r.preparation_time_minutes,
+            "ingredients": r.ingredients,
+            "tags": r.tags,
+            "is_custom": False,
+        }
+        for r in sorted(recipes, key=lambda r: r.id)
+    ]
+    insert_stmt = pg_insert(Meal).values(rows)
+    excluded = insert_stmt.excluded
+    upsert = insert_stmt.on_conflict_do_update(
+        index_elements=[Meal.recipe_id],
+        index_where=SHARED_MEAL_PREDICATE,
+        set_={column: excluded[column] for column in _SHARED_MEAL_UPDATE_COLUMNS},
+        where=or_(
+            *(
+                _comparable(Meal.__table__.c[column]).is_distinct_from(
+                    _comparable(excluded[column])
+                )
+                for column in _SHARED_MEAL_UPDATE_COLUMNS
+            )
+        ),
+    )
+    result = await db.execute(upsert.returning(Meal.id, Meal.recipe_id))
+    meal_ids = {str(recipe_id): meal_id for meal_id, recipe_id in result.all()}
+
+    unchanged = [row["recipe_id"] for row in rows if row["recipe_id"] not in meal_ids]
+    if unchanged:
+        result = await db.execute(
+            select(Meal.id, Meal.recipe_id).where(
+                SHARED_MEAL_PREDICATE, Meal.recipe_id.in_(unchanged)
+            )
+        )
+        meal_ids.update(
+            (str(recipe_id), meal_id) for meal_id, recipe_id in result.all()
+        )
+    return meal_ids
+
+
+async def write_weekly_plans(db: AsyncSession, plans: list[WeeklyPlanWrite]) -> None:
+    """
+    Replace the meal and exercise items of each (user, week) in plans.
+
+    Leftover slots point at their source slot's schedule item and share its
+    meal. A leftover whose source slot is missing is still written, unlinked.
+    """
+    if not plans:
+        return
+
+    # Step 1: Delete existing meal / exercise items for every week
+    week_filters = []
+    for p in plans:
+        week_start_dt, week_end_dt = week_bounds(p.week_start_date)
+        week_filters.append(
+            and_(
+                ScheduleItemORM.user_id == p.user_id,
+                ScheduleItemORM.date >= week_start_dt,
+                ScheduleItemORM.date <= week_end_dt,
+            )
+        )
+    await db.execute(
+        delete(ScheduleItemORM).where(
+            ScheduleItemORM.activity_type.in_(PLAN_ACTIVITY_TYPES),
+            or_(*week_filters),
+        )
+    )
+
+    # Step 2: Upsert one shared Meal row per recipe (primary + alternatives)
+    recipes: dict[str, Recipe] = {}
+    for p in plans:
+        for plan in p.daily_plans:
+            for slot in plan.slots:
+                if slot.is_leftover or not slot.plan:
+                    continue
+                if slot.plan.main_recipe:
+                    recipes.setdefault(slot.plan.main_recipe.id, slot.plan.main_recipe)
+                for alt in slot.plan.alternatives:
+                    recipes.setdefault(alt.id, alt)
+    recipe_id_to_meal_id = await upsert_shared_meals(db, list(recipes.values()))
+
+    # Step 3: Build rows. Cooked meals and exercise are inserted first so the
+    # leftovers can reference the returned ids.
+    primary_rows: list[dict[str, Any]] = []
+    primary_keys: list[_SlotKey] = []
+    leftover_rows: list[dict[str, Any]] = []
+    leftover_sources: list[_SlotKey] = []
+
+    for index, p in enumerate(plans):
+        for plan in p.daily_plans:
+            slot_date = p.week_start_date + timedelta(days=_DAY_OFFSETS[plan.day])
+
+            for slot in plan.slots:
+                item_dt = datetime.combine(slot_date, slot.time or time_type(12, 0))
+                prep = 5 if slot.is_leftover else (slot.prep_time_minutes or 30)
+                row = _schedule_row(
+                    p.user_id,
+                    item_dt,
+                    ActivityType.MEAL,
+                    duration_minutes=max(30, prep),
+                    prep_time_minutes=prep,
+                    meal_type=slot.slot_name.value,
+                )
+                if slot.is_leftover:
+                    leftover_rows.append(row)
+                    leftover_sources.append(
+                        (index, slot.leftover_from_day, slot.leftover_from_slot)
+                    )
+                    continue
+                if slot.plan and slot.plan.main_recipe:
+                    row["meal_id"] = recipe_id_to_meal_id.get(slot.plan.main_recipe.id)
+                primary_rows.append(row)
+                primary_keys.append((index, plan.day, slot.slot_name))
+
+            if plan.exercise:
+                exercise_time = plan.exercise.time or time_type(7, 0)
+                primary_rows.append(
+                    _schedule_row(
+                        p.user_id,
+                        datetime.combine(slot_date, exercise_time),
+                        ActivityType.EXERCISE,
+                        duration_minutes=plan.exercise.duration_minutes,
+                        exercise_category=plan.exercise.category,
+                        exercise_calorie_burn=plan.exercise.calories_burned,
+                        exercise_muscle_gain=plan.exercise.muscle_gain_estimate_kg,
+                    )
+                )
+                primary_keys.append((index, plan.day, None))
+
+    if not primary_rows and not leftover_rows:
+        return
+
+    # Step 4: Cooked meal + exercise items. sort_by_parameter_order guarantees
+    # RETURNING rows line up with primary_rows.
+    slot_to_item: dict[_SlotKey, tuple[int, int | None]] = {}
+    if primary_rows:
+        result = await db.execute(
+            insert(ScheduleItemORM).returning(
+                ScheduleItemORM.id,
+                ScheduleItemORM.meal_id,
+                sort_by_parameter_order=True,
+            ),
+            primary_rows,
+            # Keep NULL columns in every row so the batch is not split up
+            execution_options={"render_nulls": True},
+        )
+        for key, (item_id, meal_id) in zip(primary_keys, result.all(), strict=True):
+            if key[2] is not None:
+                slot_to_item[key] = (item_id, meal_id)
+
+    # Step 5: Leftover items, linked to their source slot
+    if leftover_rows:
+        for row, source_key in zip(leftover_rows, leftover_sources, strict=True):
+            source = slot_to_item.get(source_key)
+            if source is not None:
+                row["source_schedule_item_id"], row["meal_id"] = source
+        await db.execute(insert(ScheduleItemORM).values(leftover_rows))
+
+    # Step 6: Alternatives for every cooked slot
+    alternative_rows: list[dict[str, int]] = []
+    for index, p in enumerate(plans):
+        for plan in p.daily_plans:
+            for slot in plan.slots:
+                if slot.is_leftover or not slot.plan or not slot.plan.alternatives:
+                    continue
+                item = slot_to_item.get((index, plan.day, slot.slot_name))
+                if item is None:
+                    continue
+                for alt_recipe in slot.plan.alternatives:
+                    alt_meal_id = recipe_id_to_meal_id.get(alt_recipe.id)
+                    if alt_meal_id:
+                        alternative_rows.append(
+                            {"schedule_item_id": item[0], "meal_id": alt_meal_id}
+                        )
+    if alternative_rows:
+        await db.execute(insert(ScheduleItemAlternative).values(alternative_rows))
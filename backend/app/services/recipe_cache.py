@@ -0,0 +1,251 @@
+"""Cache for Spoonacular complexSearch recipe pools.
+
+Many users share the same diet / intolerance / cuisine combination and land on
+nearly the same calorie targets, so their recipe-pool queries are effectively
+identical. Queries are reduced to a canonical form (sorted, lower-cased list
+params; calories rounded to a band) and the results cached under a hash of it.
+
+Two tiers:
+- an in-process TTL + LRU cache (always on), and
+- an optional Postgres table (recipe_pool_cache) shared across instances and
+  restarts.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.session import get_session_factory
+from app.models.recipe_cache import RecipePoolCacheEntry
+from app.schemas.dietary import DietaryConstraints
+
+logger = logging.getLogger(__name__)
+
+# complexSearch params holding comma-separated, order-insensitive lists
+_LIST_PARAMS = {"diet", "intolerances", "cuisine", "excludeCuisine"}
+# Params snapped to the calorie band so near-identical targets share entries
+_CALORIE_PARAMS = {"minCalories", "maxCalories"}
+
+
+def canonical_search_params(
+    params: dict[str, Any], calorie_band: int
+) -> dict[str, Any]:
+    """
+    Reduce complexSearch params to a canonical, order-independent form.
+
+    Calorie bounds are rounded to the nearest multiple of calorie_band, so a
+    cached pool may be up to half a band away from the exact requested
+    bounds. Pools are already fetched with a ±30% tolerance, so this is well
+    within what the planner accepts.
+    """
+    canonical: dict[str, Any] = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        if name in _LIST_PARAMS:
+            items = {v.strip().lower() for v in str(value).split(",") if v.strip()}
+            canonical[name] = ",".join(sorted(items))
+        elif name in _CALORIE_PARAMS and calorie_band > 0:
+            canonical[name] = int(round(value / calorie_band)) * calorie_band
+        elif isinstance(value, str):
+            canonical[name] = value.strip().lower()
+        else:
+            canonical[name] = value
+    return dict(sorted(canonical.items()))
+
+
+def search_cache_key(params: dict[str, Any], calorie_band: int) -> str:
+    canonical = canonical_search_params(params, calorie_band)
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class PostgresRecipePoolStore:
+    """Persistent cache tier backed by the recipe_pool_cache table."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def get(self, key: str) -> list[dict[str, Any]] | None:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(RecipePoolCacheEntry.results).where(
+                    RecipePoolCacheEntry.key == key,
+                    RecipePoolCacheEntry.expires_at > datetime.now(UTC),
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def set(
+        self,
+        key: str,
+        params: dict[str, Any],
+        results: list[dict[str, Any]],
+        ttl_seconds: float,
+    ) -> None:
+        now = datetime.now(UTC)
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        stmt = pg_insert(RecipePoolCacheEntry).values(
+            key=key,
+            params=params,
+            results=results,
+            created_at=now,
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RecipePoolCacheEntry.key],
+            set_={
+                "results": stmt.excluded.results,
+                "created_at": stmt.excluded.created_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+        async with self.session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+
+class RecipePoolCache:
+    """
+    Two-tier cache of complexSearch results keyed by canonical params.
+
+    Store failures are logged and treated as misses so the cache can never
+    break plan generation. Empty result lists are not cached: they usually
+    mean the query was too strict or the API misbehaved.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 6 * 3600,
+        calorie_band: int = 50,
+        store: PostgresRecipePoolStore | None = None,
+        store_ttl_seconds: float | None = None,
+    ):
+        self.calorie_band = calorie_band
+        self.memory: TTLCache[str, list[dict[str, Any]]] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds
+        )
+        self.store = store
+        self.store_ttl_seconds = store_ttl_seconds or ttl_seconds
+        self.store_hits = 0
+
+    def key_for(self, params: dict[str, Any]) -> str:
+        return search_cache_key(params, self.calorie_band)
+
+    async def get(self, params: dict[str, Any]) -> list[dict[str, Any]] | None:
+        """Return a copy of the cached pool for params, or None on a miss."""
+        key = self.key_for(params)
+        results = self.memory.get(key)
+        if results is None and self.store is not None:
+            try:
+                results = await self.store.get(key)
+            except Exception:
+                logger.exception("Recipe pool cache store read failed")
+                results = None
+            if results is not None:
+                self.store_hits += 1
+                self.memory.set(key, results)
+
+        # Callers shuffle pools in place; never hand out the cached list itself
+        return list(results) if results is not None else None
+
+    async def set(self, params: dict[str, Any], results: list[dict[str, Any]]) -> None:
+        if not results:
+            return
+        key = self.key_for(params)
+        self.memory.set(key, list(results))
+        if self.store is not None:
+            try:
+                await self.store.set(
+                    key,
+                    canonical_search_params(params, self.calorie_band),
+                    results,
+                    self.store_ttl_seconds,
+                )
+            except Exception:
+                logger.exception("Recipe pool cache store write failed")
+
+
+class SharedRecipePools:
+    """
+    Recipe pools shared by every plan generated in one batch job.
+
+    Plans whose pool requests agree on meal type, dietary constraints, pool
+    size and calorie band (slot calories rounded to calorie_band) share one
+    pool, fetched once even when requested concurrently. Each caller gets its
+    own shuffled copy. A failed fetch is not kept, so the next caller retries.
+    """
+
+    def __init__(self, calorie_band: int = 100):
+        self.calorie_band = calorie_band
+        self._pools: dict[str, asyncio.Future[list[dict[str, Any]]]] = {}
+        self.fetches = 0
+
+    def key_for(
+        self,
+        meal_type: str,
+        slot_calories: int,
+        constraints: DietaryConstraints,
+        count: int,
+        max_ready_time: int | None = None,
+    ) -> str:
+        band = slot_calories
+        if self.calorie_band > 0:
+            band = int(round(slot_calories / self.calorie_band))
+        diet = constraints.model_dump(mode="json")
+        for name, value in diet.items():
+            if isinstance(value, list):
+                diet[name] = sorted(value)
+        return json.dumps(
+            [str(meal_type), band, diet, count, max_ready_time], sort_keys=True
+        )
+
+    async def get(
+        self, key: str, fetch: Callable[[], Awaitable[list[dict[str, Any]]]]
+    ) -> list[dict[str, Any]]:
+        pool = self._pools.get(key)
+        if pool is None:
+            self.fetches += 1
+            pool = asyncio.ensure_future(fetch())
+            self._pools[key] = pool
+        try:
+            results = await asyncio.shield(pool)
+        except Exception:
+            if self._pools.get(key) is pool:
+                del self._pools[key]
+            raise
+        return random.sample(results, len(results))
+
+
+_default_cache: RecipePoolCache | None = None
+
+
+def get_recipe_pool_cache() -> RecipePoolCache | None:
+    """Process-wide recipe pool cache built from settings (None if disabled)."""
+    global _default_cache
+    if not settings.RECIPE_POOL_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        store = None
+        if settings.RECIPE_POOL_CACHE_PERSISTENT:
+            store = PostgresRecipePoolStore(get_session_factory())
+        _default_cache = RecipePoolCache(
+            max_entries=settings.RECIPE_POOL_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.RECIPE_POOL_CACHE_TTL_SECONDS,
+            calorie_band=settings.RECIPE_POOL_CACHE_CALORIE_BAND,
+            store=store,
+            store_ttl_seconds=settings.RECIPE_POOL_CACHE_PERSISTENT_TTL_SECONDS,
+        )
+    return _default_cache
@@ -0,0 +1,219 @@
+"""Local, indexed catalog of Spoonacular recipes.
+
+Every recipe pool fetched from Spoonacular is upserted into recipe_catalog
+(unique on recipe_id). In local-first mode MealPlanService answers pool
+queries from this table and only calls Spoonacular when the catalog cannot
+supply enough candidates.
+"""
+
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import func, literal_column, not_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.enums import MealType
+from app.models.recipe_catalog import CatalogRecipe
+from app.schemas.dietary import DietaryConstraints
+from app.services.spoonacular import constraint_diets, recipe_ingredient_lines
+
+logger = logging.getLogger(__name__)
+
+# Spoonacular nutrient name (lower-cased) -> macro field
+MACRO_NUTRIENTS = {
+    "calories": "calories",
+    "protein": "protein",
+    "carbohydrates": "carbohydrates",
+    "fat": "fat",
+}
+
+# Recipe-level diet labels that satisfy a complexSearch diet filter
+_DIET_ALIASES = {
+    "lacto ovo vegetarian": ["vegetarian"],
+    "pescatarian": ["pescetarian"],
+    "vegan": ["vegetarian"],
+}
+
+_NUTRIENT_OUTPUT = [
+    ("Calories", "calories", "kcal"),
+    ("Protein", "protein", "g"),
+    ("Carbohydrates", "carbohydrates", "g"),
+    ("Fat", "fat", "g"),
+]
+
+
+def _lower_all(values: list[str] | None) -> list[str]:
+    return sorted({v.strip().lower() for v in (values or []) if v and v.strip()})
+
+
+def _normalize_diets(diets: list[str] | None) -> list[str]:
+    normalized = set(_lower_all(diets))
+    for diet in list(normalized):
+        normalized.update(_DIET_ALIASES.get(diet, []))
+    return sorted(normalized)
+
+
+def _array_union(column: str) -> Any:
+    """SQL for merging an existing tag array with the incoming (excluded) one."""
+    return literal_column(
+        f"ARRAY(SELECT DISTINCT unnest(recipe_catalog.{column} || excluded.{column}))"
+    )
+
+
+def catalog_row_from_spoonacular(
+    spoon_data: dict[str, Any],
+    meal_type: MealType | None = None,
+    constraints: DietaryConstraints | None = None,
+) -> dict[str, Any] | None:
+    """
+    Build a recipe_catalog row from a complexSearch result.
+
+    The query's meal type, diets and intolerances are folded into the tag
+    arrays because Spoonacular has already verified the recipe against them.
+    Returns None for results without an id.
+    """
+    if spoon_data.get("id") is None:
+        return None
+
+    macros = dict.fromkeys(MACRO_NUTRIENTS.values(), 0)
+    for nutrient in spoon_data.get("nutrition", {}).get("nutrients", []):
+        field = MACRO_NUTRIENTS.get(nutrient.get("name", "").lower())
+        if field is not None:
+            macros[field] = int(nutrient.get("amount", 0))
+
+    diets = list(spoon_data.get("diets", []))
+    dish_types = list(spoon_data.get("dishTypes", []))
+    intolerances: list[str] = []
+    if meal_type is not None:
+        dish_types.append(meal_type.value)
+    if constraints is not None:
+        diets.extend(constraint_diets(constraints))
+        intolerances = [a.value for a in constraints.allergies]
+
+    return {
+        "recipe_id": str(spoon_data["id"]),
+        "title": spoon_data.get("title", "Unknown Recipe"),
+        "summary": spoon_data.get("summary"),
+        "image_url": spoon_data.get("image"),
+        "source_url": spoon_data.get("sourceUrl"),
+        "ready_in_minutes": spoon_data.get("readyInMinutes"),
+        **macros,
+        "ingredients": recipe_ingredient_lines(spoon_data),
+        "diets": _normalize_diets(diets),
+        "dish_types": _lower_all(dish_types),
+        "cuisines": _lower_all(spoon_data.get("cuisines", [])),
+        "safe_intolerances": _lower_all(intolerances),
+        "updated_at": datetime.now(UTC),
+    }
+
+
+def catalog_recipe_to_spoonacular(recipe: CatalogRecipe) -> dict[str, Any]:
+    """Render a catalog row in the complexSearch result shape."""
+    recipe_id: int | str = (
+        int(recipe.recipe_id) if recipe.recipe_id.isdigit() else recipe.recipe_id
+    )
+    return {
+        "id": recipe_id,
+        "title": recipe.title,
+        "summary": recipe.summary,
+        "readyInMinutes": recipe.ready_in_minutes,
+        "sourceUrl": recipe.source_url,
+        "image": recipe.image_url,
+        "nutrition": {
+            "nutrients": [
+                {"name": name, "amount": getattr(recipe, field), "unit": unit}
+                for name, field, unit in _NUTRIENT_OUTPUT
+            ]
+        },
+        "extendedIngredients": [{"original": i} for i in recipe.ingredients],
+        "diets": list(recipe.diets),
+        "dishTypes": list(recipe.dish_types),
+        "cuisines": list(recipe.cuisines),
+    }
+
+
+class RecipeCatalog:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def ingest(
+        self,
+        results: list[dict[str, Any]],
+        meal_type: MealType | None = None,
+        constraints: DietaryConstraints | None = None,
+    ) -> int:
+        """Upsert complexSearch results into the catalog in one statement."""
+        rows_by_id: dict[str, dict[str, Any]] = {}
+        for item in results:
+            row = catalog_row_from_spoonacular(item, meal_type, constraints)
+            if row is not None:
+                rows_by_id[row["recipe_id"]] = row
+        if not rows_by_id:
+            return 0
+
+        stmt = pg_insert(CatalogRecipe).values(list(rows_by_id.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CatalogRecipe.recipe_id],
+            set_={
+                "title": stmt.excluded.title,
+                "summary": stmt.excluded.summary,
+                "image_url": stmt.excluded.image_url,
+                "source_url": stmt.excluded.source_url,
+                "ready_in_minutes": stmt.excluded.ready_in_minutes,
+                "calories": stmt.excluded.calories,
+                "protein": stmt.excluded.protein,
+                "carbohydrates": stmt.excluded.carbohydrates,
+                "fat": stmt.excluded.fat,
+                "ingredients": stmt.excluded.ingredients,
+                "diets": _array_union("diets"),
+                "dish_types": _array_union("dish_types"),
+                "cuisines": _array_union("cuisines"),
+                "safe_intolerances": _array_union("safe_intolerances"),
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        async with self.session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+        return len(rows_by_id)
+
+    async def search(
+        self,
+        meal_type: MealType,
+        min_calories: int,
+        max_calories: int,
+        constraints: DietaryConstraints,
+        count: int,
+        max_ready_time: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return up to count random catalog recipes matching the same filters
+        _fetch_recipe_pool sends to complexSearch, in complexSearch shape.
+        """
+        stmt = select(CatalogRecipe).where(
+            CatalogRecipe.calories >= min_calories,
+            CatalogRecipe.calories <= max_calories,
+            CatalogRecipe.dish_types.contains([meal_type.value]),
+        )
+
+        diets = _lower_all(constraint_diets(constraints))
+        if diets:
+            stmt = stmt.where(CatalogRecipe.diets.contains(diets))
+        intolerances = _lower_all([a.value for a in constraints.allergies])
+        if intolerances:
+            stmt = stmt.where(CatalogRecipe.safe_intolerances.contains(intolerances))
+        include = _lower_all([c.value for c in constraints.include_cuisine])
+        if include:
+            stmt = stmt.where(CatalogRecipe.cuisines.overlap(include))
+        exclude = _lower_all([c.value for c in constraints.exclude_cuisine])
+        if exclude:
+            stmt = stmt.where(not_(CatalogRecipe.cuisines.overlap(exclude)))
+        if max_ready_time is not None:
+            stmt = stmt.where(CatalogRecipe.ready_in_minutes <= max_ready_time)
+
+        stmt = stmt.order_by(func.random()).limit(count)
+        async with self.session_factory() as session:
+            result = await session.execute(stmt)
+            return [catalog_recipe_to_spoonacular(r) for r in result.scalars().all()]
@@ -0,0 +1,203 @@
+"""On-demand recipe details for /recipes.
+
+Plans keep only what the planner needs (title, macros, ingredient lines).
+Full details are fetched from Spoonacular's information endpoints the first
+time someone opens a recipe and cached in two tiers:
+
+- an in-process TTL + LRU cache, and
+- the recipe_details table, shared across instances and restarts.
+
+get_many serves a whole visible week with one informationBulk request for
+whatever neither tier has.
+"""
+
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.recipe_detail import RecipeDetailEntry
+from app.schemas.recipe import RecipeDetail
+from app.services.spoonacular import SpoonacularClient, recipe_ingredient_lines
+
+logger = logging.getLogger(__name__)
+
+# Spoonacular ids per informationBulk request
+BULK_CHUNK_SIZE = 100
+
+
+def recipe_detail_from_spoonacular(info: dict[str, Any]) -> RecipeDetail:
+    """Build a RecipeDetail from an information / informationBulk result."""
+    steps = [
+        step.get("step", "")
+        for block in info.get("analyzedInstructions") or []
+        for step in block.get("steps", [])
+    ]
+    if not steps and info.get("instructions"):
+        steps = [info["instructions"]]
+    return RecipeDetail(
+        id=str(info["id"]),
+        title=info.get("title", "Unknown Recipe"),
+        summary=info.get("summary"),
+        image_url=info.get("image"),
+        source_url=info.get("sourceUrl"),
+        ready_in_minutes=info.get("readyInMinutes"),
+        servings=info.get("servings"),
+        ingredients=recipe_ingredient_lines(info),
+        instructions=steps,
+        diets=info.get("diets", []),
+        dish_types=info.get("dishTypes", []),
+        cuisines=info.get("cuisines", []),
+    )
+
+
+class RecipeDetailService:
+    """
+    Two-tier cache in front of the information endpoints.
+
+    The store uses the caller's session. Store failures are logged and
+    treated as misses, so a broken cache table never hides a recipe.
+    """
+
+    def __init__(
+        self,
+        spoonacular_client: SpoonacularClient | None = None,
+        max_entries: int = 2048,
+        ttl_seconds: float = 6 * 3600,
+        store_ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        self.spoonacular_client = spoonacular_client or SpoonacularClient()
+        self.memory: TTLCache[str, RecipeDetail] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds
+        )
+        self.store_ttl_seconds = store_ttl_seconds
+        self.store_hits = 0
+        self.api_requests = 0
+
+    async def _load_stored(
+        self, db: AsyncSession, recipe_ids: list[str]
+    ) -> dict[str, RecipeDetail]:
+        try:
+            result = await db.execute(
+                select(RecipeDetailEntry.recipe_id, RecipeDetailEntry.detail).where(
+                    RecipeDetailEntry.recipe_id.in_(recipe_ids),
+                    RecipeDetailEntry.expires_at > datetime.now(UTC),
+                )
+            )
+            rows = result.all()
+        except Exception:
+            logger.exception("Recipe detail store read failed")
+            await db.rollback()
+            return {}
+        return {
+            recipe_id: RecipeDetail.model_validate(detail) for recipe_id, detail in rows
+        }
+
+    async def _store(self, db: AsyncSession, details: list[RecipeDetail]) -> None:
+        now = datetime.now(UTC)
+        expires_at = now + timedelta(seconds=self.store_ttl_seconds)
+        stmt = pg_insert(RecipeDetailEntry).values(
+            [
+                {
+                    "recipe_id": d.id,
+                    "detail": d.model_dump(mode="json"),
+                    "fetched_at": now,
+                    "expires_at": expires_at,
+                }
+                for d in details
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RecipeDetailEntry.recipe_id],
+            set_={
+                "detail": stmt.excluded.detail,
+                "fetched_at": stmt.excluded.fetched_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+        try:
+            await db.execute(stmt)
+            await db.commit()
+        except Exception:
+            logger.exception("Recipe detail store write failed")
+            await db.rollback()
+
+    async def _fetch(self, recipe_ids: list[str]) -> list[RecipeDetail]:
+        if len(recipe_ids) == 1:
+            self.api_requests += 1
+            try:
+                info = await self.spoonacular_client.get_recipe_information(
+                    recipe_ids[0]
+                )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    return []
+                raise
+            return [recipe_detail_from_spoonacular(info)]
+
+        details: list[RecipeDetail] = []
+        for start in range(0, len(recipe_ids), BULK_CHUNK_SIZE):
+            self.api_requests += 1
+            infos = await self.spoonacular_client.get_recipes_information_bulk(
+                recipe_ids[start : start + BULK_CHUNK_SIZE]
+            )
+            details.extend(recipe_detail_from_spoonacular(i) for i in infos)
+        return details
+
+    async def get_many(
+        self, db: AsyncSession, recipe_ids: list[str]
+    ) -> list[RecipeDetail]:
+        """
+        Details for recipe_ids in the given order (duplicates once). Ids that
+        Spoonacular does not know are left out.
+        """
+        recipe_ids = list(dict.fromkeys(recipe_ids))
+        found: dict[str, RecipeDetail] = {}
+        for recipe_id in recipe_ids:
+            detail = self.memory.get(recipe_id)
+            if detail is not None:
+                found[recipe_id] = detail
+
+        missing = [i for i in recipe_ids if i not in found]
+        if missing:
+            stored = await self._load_stored(db, missing)
+            self.store_hits += len(stored)
+            for recipe_id, detail in stored.items():
+                self.memory.set(recipe_id, detail)
+            found.update(stored)
+
+        missing = [i for i in recipe_ids if i not in found]
+        if missing:
+            fetched = await self._fetch(missing)
+            for detail in fetched:
+                self.memory.set(detail.id, detail)
+                found[detail.id] = detail
+            if fetched:
+                await self._store(db, fetched)
+
+        return [found[i] for i in recipe_ids if i in found]
+
+    async def get(self, db: AsyncSession, recipe_id: str) -> RecipeDetail | None:
+        details = await self.get_many(db, [recipe_id])
+        return details[0] if details else None
+
+
+_default_service: RecipeDetailService | None = None
+
+
+def get_recipe_detail_service() -> RecipeDetailService:
+    """Process-wide service, so the in-memory tier is shared by requests."""
+    global _default_service
+    if _default_service is None:
+        _default_service = RecipeDetailService(
+            max_entries=settings.RECIPE_DETAIL_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.RECIPE_DETAIL_CACHE_TTL_SECONDS,
+            store_ttl_seconds=settings.RECIPE_DETAIL_STORE_TTL_SECONDS,
+        )
+    return _default_service
@@ -0,0 +1,126 @@
+"""Compact view of a fetched recipe pool.
+
+Pools hold up to 50 raw Spoonacular results, but only a handful end up in a
+plan. PoolRecipe keeps what assignment needs (id, macros, prep time) in a
+slotted dataclass and builds the Recipe model only when a recipe is actually
+placed in a slot, once per recipe however often it is placed.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.schemas.recipe import Recipe, RecipeNutrients
+from app.services.spoonacular import recipe_ingredient_lines
+
+# Spoonacular nutrient name -> PoolRecipe field. Exact names, so that e.g.
+# "Saturated Fat" or "Net Carbohydrates" never stand in for the macro.
+NUTRIENT_FIELDS = {
+    "Calories": "calories",
+    "Protein": "protein",
+    "Carbohydrates": "carbohydrates",
+    "Fat": "fat",
+}
+
+
+@dataclass(slots=True)
+class PoolRecipe:
+    id: int | None
+    title: str
+    calories: int = 0
+    protein: int = 0
+    carbohydrates: int = 0
+    fat: int = 0
+    ready_in_minutes: int | None = None
+    data: dict[str, Any] = field(default_factory=dict, repr=False)
+    _recipe: Recipe | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_spoonacular(cls, data: dict[str, Any]) -> "PoolRecipe":
+        """Parse one complexSearch / catalog result."""
+        item = cls(
+            id=data.get("id"),
+            title=data.get("title", "Unknown Recipe"),
+            ready_in_minutes=data.get("readyInMinutes"),
+            data=data,
+        )
+        remaining = len(NUTRIENT_FIELDS)
+        for nutrient in (data.get("nutrition") or {}).get("nutrients", ()):
+            name = NUTRIENT_FIELDS.get(nutrient.get("name", ""))
+            if name is None:
+                continue
+            setattr(item, name, int(nutrient.get("amount", 0)))
+            remaining -= 1
+            if not remaining:
+                break
+        return item
+
+    def to_recipe(self) -> Recipe:
+        """The Recipe model for this entry, built on first use."""
+        if self._recipe is None:
+            data = self.data
+            self._recipe = Recipe(
+                id=str(self.id if self.id is not None else ""),
+                title=self.title,
+                description=data.get("summary", ""),
+                nutrients=RecipeNutrients(
+                    calories=self.calories,
+                    protein=self.protein,
+                    carbohydrates=self.carbohydrates,
+                    fat=self.fat,
+                ),
+                tags=[
+                    *data.get("diets", []),
+                    *data.get("dishTypes", []),
+                    *data.get("cuisines", []),
+                ],
+                ingredients=recipe_ingredient_lines(data),
+                preparation_time_minutes=self.ready_in_minutes,
+                source_url=data.get("sourceUrl"),
+                image_url=data.get("image"),
+            )
+        return self._recipe
+
+
+def parse_pool(pool: list[dict[str, Any]]) -> list[PoolRecipe]:
+    return [PoolRecipe.from_spoonacular(item) for item in pool]
+
+
+class PoolCursor:
+    """
+    Hands out pool recipes in order, each at most once.
+
+    Recipes whose id is in used_ids are skipped; every recipe taken is added
+    to it. used_ids may be shared by several cursors (and only ever grows),
+    so a recipe taken from one pool is skipped in another. The cursor only
+    moves forward, so taking k recipes costs O(k) amortized however large
+    the pool is.
+    """
+
+    __slots__ = ("pool", "used_ids", "position")
+
+    def __init__(self, pool: list[PoolRecipe], used_ids: set[int] | None = None):
+        self.pool = pool
+        self.used_ids = used_ids if used_ids is not None else set()
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.pool)
+
+    @property
+    def remaining(self) -> int:
+        """Upper bound on the recipes still available."""
+        return len(self.pool) - self.position
+
+    def take(self, n: int) -> list[PoolRecipe]:
+        """The next up to n unused recipes, marked as used."""
+        taken: list[PoolRecipe] = []
+        pool, used_ids = self.pool, self.used_ids
+        while len(taken) < n and self.position < len(pool):
+            item = pool[self.position]
+            self.position += 1
+            if item.id is None:
+                taken.append(item)
+            elif item.id not in used_ids:
+                used_ids.add(item.id)
+                taken.append(item)
+        return taken
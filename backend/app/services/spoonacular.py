@@ -1,17 +1,252 @@
-from typing import Any
+import asyncio
+import json
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal
 
 import httpx
 
 from app.core.config import settings
+from app.core.http import http_client
+from app.core.rate_limit import TokenBucket
+from app.core.singleflight import SingleFlight
 from app.domain.enums import MealType
 from app.schemas.dietary import DietaryConstraints
+from app.services.recipe_cache import RecipePoolCache, search_cache_key
+
+# Process-wide, so identical searches from concurrent plan generations (each
+# with its own client) share one complexSearch request. Stats are on /health.
+search_flight: SingleFlight[str, list[dict[str, Any]]] = SingleFlight()
+
+logger = logging.getLogger(__name__)
+
+SearchProfile = Literal["lean", "full"]
+
+# complexSearch enrichment flags per search profile. "full" returns every
+# nutrient (with per-ingredient breakdowns), analyzed instructions and
+# ingredient details. "lean" keeps recipe information and ingredient lines
+# and gets the four macros the planner reads through nutrient filters,
+# which makes Spoonacular report just those nutrients. Full details are
+# fetched per recipe with get_recipe_information when a user opens one.
+SEARCH_PROFILES: dict[str, dict[str, bool]] = {
+    "full": {
+        "addRecipeInformation": True,
+        "addRecipeNutrition": True,
+        "addRecipeInstructions": True,
+        "fillIngredients": True,
+    },
+    "lean": {
+        "addRecipeInformation": True,
+        "addRecipeNutrition": False,
+        "addRecipeInstructions": False,
+        "fillIngredients": True,
+    },
+}
+
+# Filter params that make a lean search report each macro the planner uses
+_MACRO_FILTERS = (
+    ("minCalories", "maxCalories"),
+    ("minProtein", "maxProtein"),
+    ("minCarbs", "maxCarbs"),
+    ("minFat", "maxFat"),
+)
+
+
+def _json_parser() -> Callable[[bytes], Any]:
+    """orjson when installed (several times faster on search pages), else json."""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+parse_json = _json_parser()
+
+
+def recipe_ingredient_lines(spoon_data: dict[str, Any]) -> list[str]:
+    """
+    Ingredient lines of a search or information result: extendedIngredients
+    when present, else the fillIngredients lists (missed, then used).
+    """
+    ingredients = spoon_data.get("extendedIngredients")
+    if ingredients is None:
+        ingredients = [
+            *spoon_data.get("missedIngredients", []),
+            *spoon_data.get("usedIngredients", []),
+        ]
+    return [ing.get("original", "") for ing in ingredients]
+
+
+# Retried with backoff; 402 (daily quota used up) is not retried
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class QuotaExceededError(Exception):
+    """
+    Spoonacular cannot be used right now: the daily quota is used up or down
+    to the reserve, requests are still being throttled after every retry, or
+    Spoonacular asks for a longer wait (Retry-After) than we back off.
+    Callers should fall back to cached or catalog recipes.
+    """
+
+
+def _header_float(headers: Any, name: str) -> float | None:
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+@dataclass
+class SpoonacularQuotaStats:
+    # Points used / left today, from the latest X-API-Quota-* headers
+    quota_used: float | None = None
+    quota_left: float | None = None
+    # Requests answered 429 (each one halves the request rate)
+    throttled: int = 0
+    # Requests sent again after a 429, 5xx or transport error
+    retries: int = 0
+    # Requests refused locally because the quota was exhausted or low
+    refused: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class SpoonacularRateLimiter:
+    """
+    Paces complexSearch/information requests and tracks the daily quota.
+
+    - A token bucket caps the request rate. A 429 halves the rate (down to
+      min_rate); every successful response restores a tenth of the
+      configured rate.
+    - X-API-Quota-Used / X-API-Quota-Left are read from every response. Once
+      reserve_points or fewer are left, or Spoonacular answers 402, requests
+      are refused with QuotaExceededError until the quota resets at the next
+      UTC midnight.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        reserve_points: float = 0.0,
+        min_rate: float = 0.2,
+        now: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.reserve_points = reserve_points
+        self.bucket = TokenBucket(rate=rate, capacity=max(1, burst))
+        self._now = now
+        self._blocked_until: datetime | None = None
+        self.stats = SpoonacularQuotaStats()
+
+    def _next_reset(self) -> datetime:
+        now = self._now()
+        return datetime.combine(
+            now.date() + timedelta(days=1), datetime.min.time(), UTC
+        )
+
+    @property
+    def quota_low(self) -> bool:
+        if self._blocked_until is None:
+            return False
+        if self._now() >= self._blocked_until:
+            # New quota day: forget yesterday's numbers
+            self._blocked_until = None
+            self.stats.quota_used = self.stats.quota_left = None
+            return False
+        return True
+
+    async def acquire(self) -> None:
+        """Wait for a request slot; raises QuotaExceededError if out of quota."""
+        if self.quota_low:
+            self.stats.refused += 1
+            raise QuotaExceededError("Spoonacular daily quota is exhausted")
+        await self.bucket.acquire()
+
+    def record_response(self, status_code: Any, headers: Any) -> None:
+        used = _header_float(headers, "X-API-Quota-Used")
+        left = _header_float(headers, "X-API-Quota-Left")
+        if used is not None:
+            self.stats.quota_used = used
+        if left is not None:
+            self.stats.quota_left = left
+            if left <= self.reserve_points:
+                self._blocked_until = self._next_reset()
+
+        if status_code == 402:
+            self._blocked_until = self._next_reset()
+        elif status_code == 429:
+            self.stats.throttled += 1
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate / 2))
+        elif status_code not in _RETRY_STATUSES:
+            self.bucket.set_rate(
+                min(self.max_rate, self.bucket.rate + self.max_rate / 10)
+            )
+
+
+_default_limiter: SpoonacularRateLimiter | None = None
+
+
+def get_spoonacular_limiter() -> SpoonacularRateLimiter:
+    """Process-wide limiter built from settings; quota is per API key."""
+    global _default_limiter
+    if _default_limiter is None:
+        _default_limiter = SpoonacularRateLimiter(
+            rate=settings.SPOONACULAR_REQUESTS_PER_SECOND,
+            burst=settings.SPOONACULAR_BURST,
+            reserve_points=settings.SPOONACULAR_QUOTA_RESERVE_POINTS,
+        )
+    return _default_limiter
+
+
+def constraint_diets(constraints: DietaryConstraints) -> list[str]:
+    """Spoonacular diet names implied by the user's dietary flags."""
+    diets = []
+    if constraints.is_gluten_free:
+        diets.append("gluten free")
+    if constraints.is_ketogenic:
+        diets.append("ketogenic")
+    if constraints.is_vegetarian:
+        diets.append("vegetarian")
+    if constraints.is_vegan:
+        diets.append("vegan")
+    if constraints.is_pescatarian:
+        diets.append("pescetarian")
+    return diets
 
 
 class SpoonacularClient:
     BASE_URL = "https://api.spoonacular.com"
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache: RecipePoolCache | None = None,
+        limiter: SpoonacularRateLimiter | None = None,
+        max_retries: int | None = None,
+        backoff_base_seconds: float | None = None,
+    ):
         self.api_key = api_key or settings.SPOONACULAR_API_KEY
+        self.cache = cache
+        self.limiter = limiter or get_spoonacular_limiter()
+        self.max_retries = (
+            settings.SPOONACULAR_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.backoff_base_seconds = (
+            settings.SPOONACULAR_BACKOFF_BASE_SECONDS
+            if backoff_base_seconds is None
+            else backoff_base_seconds
+        )
         if not self.api_key:
             # We might want to log a warning here/raise an error depending on strictness
             pass
@@ -27,10 +262,56 @@ class SpoonacularClient:
 
         headers["x-api-key"] = self.api_key
 
-        async with httpx.AsyncClient() as client:
-            response = await client.request(method, url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            retry_after = None
+            try:
+                async with http_client() as client:
+                    response = await client.request(
+                        method, url, headers=headers, params=params
+                    )
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+            else:
+                status_code = response.status_code
+                self.limiter.record_response(status_code, response.headers)
+                if status_code == 402:
+                    raise QuotaExceededError("Spoonacular daily quota is exhausted")
+                if status_code not in _RETRY_STATUSES:
+                    response.raise_for_status()
+                    return parse_json(response.content)
+                if attempt == self.max_retries:
+                    if status_code == 429:
+                        raise QuotaExceededError("Spoonacular is throttling requests")
+                    response.raise_for_status()
+                retry_after = _header_float(response.headers, "Retry-After")
+                if (
+                    retry_after is not None
+                    and retry_after > settings.SPOONACULAR_BACKOFF_MAX_SECONDS
+                ):
+                    # Don't hold a request (or a job past its lease) that long
+                    raise QuotaExceededError(
+                        f"Spoonacular asked to retry after {retry_after:g} s"
+                    )
+
+            self.limiter.stats.retries += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+        raise AssertionError("unreachable")
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        """
+        Full-jitter exponential backoff, never shorter than Retry-After and
+        never longer than SPOONACULAR_BACKOFF_MAX_SECONDS.
+        """
+        ceiling = min(
+            settings.SPOONACULAR_BACKOFF_MAX_SECONDS,
+            self.backoff_base_seconds * 2**attempt,
+        )
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, settings.SPOONACULAR_BACKOFF_MAX_SECONDS)
 
     async def search_recipes(
         self,
@@ -52,10 +333,12 @@ class SpoonacularClient:
         number: int = 1,
         offset: int = 0,
         sort: str | None = None,
-        add_recipe_information: bool = True,
-        add_recipe_nutrition: bool = True,
-        add_recipe_instructions: bool = True,
+        add_recipe_information: bool | None = None,
+        add_recipe_nutrition: bool | None = None,
+        add_recipe_instructions: bool | None = None,
         max_ready_time: int | None = None,
+        profile: SearchProfile | None = None,
+        on_fetch: Callable[[list[dict[str, Any]]], Awaitable[None]] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search for recipes using the complexSearch endpoint.
@@ -77,17 +360,28 @@ class SpoonacularClient:
         - Final endpoint list: cuisine, excludeCuisine, diet, intolerances,
         type, instructions required, recipeinfo/instructions/nutrition,
         macronutrients, number
+
+        When a RecipePoolCache is attached, queries with the same canonical
+        params (see recipe_cache.canonical_search_params) are served from it.
+        on_fetch is awaited with the results of a live Spoonacular request
+        only, not with cached or coalesced ones.
+
+        profile picks the enrichment flags (SEARCH_PROFILES; default
+        SPOONACULAR_SEARCH_PROFILE); explicit add_recipe_* arguments win.
         """
-        endpoint = "/recipes/complexSearch"
         params: dict[str, Any] = {
             "number": number,
             "offset": offset,
-            "addRecipeInformation": add_recipe_information,
-            "addRecipeNutrition": add_recipe_nutrition,
-            "addRecipeInstructions": add_recipe_instructions,
+            **SEARCH_PROFILES[profile or settings.SPOONACULAR_SEARCH_PROFILE],
             "instructionsRequired": True,  # displays the instructions
-            "fillIngredients": True,
         }
+        for name, override in (
+            ("addRecipeInformation", add_recipe_information),
+            ("addRecipeNutrition", add_recipe_nutrition),
+            ("addRecipeInstructions", add_recipe_instructions),
+        ):
+            if override is not None:
+                params[name] = override
 
         if sort:
             params["sort"] = sort
@@ -120,16 +414,7 @@ class SpoonacularClient:
         # Diets & Intolerances
         diets = []
         if constraints:
-            if constraints.is_gluten_free:
-                diets.append("gluten free")
-            if constraints.is_ketogenic:
-                diets.append("ketogenic")
-            if constraints.is_vegetarian:
-                diets.append("vegetarian")
-            if constraints.is_vegan:
-                diets.append("vegan")
-            if constraints.is_pescatarian:
-                diets.append("pescetarian")
+            diets.extend(constraint_diets(constraints))
 
             # Allergies as intolerances
             if constraints.allergies:
@@ -175,5 +460,74 @@ class SpoonacularClient:
         if type:
             params["type"] = type.value if isinstance(type, MealType) else type
 
-        data = await self._request("GET", endpoint, params=params)
-        return data.get("results", [])
+        if not params["addRecipeNutrition"]:
+            # Without full nutrition, only filtered nutrients are reported
+            for min_name, max_name in _MACRO_FILTERS:
+                if min_name not in params and max_name not in params:
+                    params[min_name] = 0
+
+        return await self._search(params, on_fetch)
+
+    async def get_recipe_information(
+        self, recipe_id: int | str, include_nutrition: bool = False
+    ) -> dict[str, Any]:
+        """Full details (ingredients, instructions, summary) of one recipe."""
+        return await self._request(
+            "GET",
+            f"/recipes/{recipe_id}/information",
+            params={"includeNutrition": include_nutrition},
+        )
+
+    async def get_recipes_information_bulk(
+        self, recipe_ids: list[int] | list[str], include_nutrition: bool = False
+    ) -> list[dict[str, Any]]:
+        """
+        get_recipe_information for many recipes in one request
+        (informationBulk). Unknown ids are left out of the result.
+        """
+        data: Any = await self._request(
+            "GET",
+            "/recipes/informationBulk",
+            params={
+                "ids": ",".join(str(i) for i in recipe_ids),
+                "includeNutrition": include_nutrition,
+            },
+        )
+        return data
+
+    async def _search(
+        self,
+        params: dict[str, Any],
+        on_fetch: Callable[[list[dict[str, Any]]], Awaitable[None]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Run complexSearch with prebuilt params, consulting the cache if any.
+
+        Concurrent calls with the same canonical params (exact calories, same
+        API key) are coalesced into one request; each caller gets its own list.
+        """
+        if self.cache is not None:
+            cached = await self.cache.get(params)
+            if cached is not None:
+                return cached
+
+        key = f"{self.api_key}:{search_cache_key(params, calorie_band=0)}"
+        results = await search_flight.do(
+            key, lambda: self._fetch_search(params, on_fetch)
+        )
+        # Callers shuffle pools in place; never share the list between them
+        return list(results)
+
+    async def _fetch_search(
+        self,
+        params: dict[str, Any],
+        on_fetch: Callable[[list[dict[str, Any]]], Awaitable[None]] | None = None,
+    ) -> list[dict[str, Any]]:
+        data = await self._request("GET", "/recipes/complexSearch", params=params)
+        results = data.get("results", [])
+
+        if self.cache is not None:
+            await self.cache.set(params, results)
+        if on_fetch is not None:
+            await on_fetch(list(results))
+        return results
@@ -0,0 +1,136 @@
+"""Cost of placing a week of meals and exercise against dense calendars.
+
+Compares the previous busy-block scan (every candidate start re-checked
+against every busy block of the day) with FreeIntervalIndex, built once per
+day and shared by the meal, exercise and availability lookups. No network or
+database needed:
+
+    python -m benchmarks.bench_allocator --busy-blocks 300 --iterations 200
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import time as time_of_day
+
+from app.domain.enums import Day
+from app.schemas.user import BusyTime, UserSchedule
+from app.services.meal_allocator import MealAllocator, _time_to_mins
+from benchmarks.common import summarize_ms
+
+MEAL_DURATION = 30
+EXERCISE_DURATION = 60
+
+
+def _weekly_schedules(busy_blocks: int, seed: int) -> dict[Day, UserSchedule]:
+    """Per-day schedules (as MealPlanService builds them) packed with short,
+    mostly back-to-back calendar blocks, leaving a few gaps late in the day."""
+    rng = random.Random(seed)
+    per_day = busy_blocks // len(Day)
+    schedules = {}
+    for day in Day:
+        busy_times = []
+        cursor = 6 * 60
+        for _ in range(per_day):
+            length = rng.choice([5, 10, 15])
+            end = min(cursor + length, 22 * 60)
+            if end <= cursor:
+                break
+            busy_times.append(
+                BusyTime(
+                    day=day,
+                    start=time_of_day(cursor // 60, cursor % 60),
+                    end=time_of_day(end // 60, end % 60),
+                )
+            )
+            cursor = end + rng.choice([0, 0, 0, 5])
+        schedules[day] = UserSchedule(busy_times=busy_times)
+    return schedules
+
+
+def _scan(busy: list[tuple[int, int]], start: int, end: int, duration: int):
+    current = start
+    while current + duration <= end:
+        for b_start, b_end in busy:
+            if current < b_end and current + duration > b_start:
+                current = max(current, b_end)
+                break
+        else:
+            return current
+    return None
+
+
+def _windows(schedule: UserSchedule) -> list[tuple[int, int]]:
+    wake = _time_to_mins(schedule.wake_up_time)
+    return [
+        (max(_time_to_mins(s), wake), _time_to_mins(e))
+        for s, e in MealAllocator.SEARCH_WINDOWS.values()
+    ]
+
+
+def week_by_scan(schedules: dict[Day, UserSchedule]) -> list:
+    placed = []
+    for day, schedule in schedules.items():
+        wake = _time_to_mins(schedule.wake_up_time)
+        sleep = _time_to_mins(schedule.sleep_time)
+        busy = sorted(
+            (_time_to_mins(b.start), _time_to_mins(b.end))
+            for b in schedule.busy_times
+            if b.day == day
+        )
+        # availability check, then placement, each scanning from scratch
+        for start, end in _windows(schedule):
+            _scan(busy, start, end, MEAL_DURATION)
+        meals = [_scan(busy, s, e, MEAL_DURATION) for s, e in _windows(schedule)]
+        buffers = [(m - 60, m + 60) for m in meals if m is not None]
+        exercise = _scan(sorted(busy + buffers), wake, sleep, EXERCISE_DURATION)
+        placed.append((meals, exercise))
+    return placed
+
+
+def week_by_index(schedules: dict[Day, UserSchedule]) -> list:
+    placed = []
+    for day, schedule in schedules.items():
+        wake = _time_to_mins(schedule.wake_up_time)
+        sleep = _time_to_mins(schedule.sleep_time)
+        index = MealAllocator.free_interval_index(schedule, day)
+        for start, end in _windows(schedule):
+            index.first_fit(start, end, MEAL_DURATION)
+        meals = [index.first_fit(s, e, MEAL_DURATION) for s, e in _windows(schedule)]
+        buffers = [(m - 60, m + 60) for m in meals if m is not None]
+        exercise = index.first_fit(wake, sleep, EXERCISE_DURATION, extra_busy=buffers)
+        placed.append((meals, exercise))
+    return placed
+
+
+def run(busy_blocks: int, iterations: int) -> dict:
+    schedules = _weekly_schedules(busy_blocks, seed=1)
+    assert week_by_scan(schedules) == week_by_index(schedules)
+
+    report: dict = {
+        "benchmark": "allocator",
+        "busy_blocks": sum(len(s.busy_times) for s in schedules.values()),
+        "iterations": iterations,
+        "paths": {},
+    }
+    for name, fn in (("scan", week_by_scan), ("index", week_by_index)):
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            fn(schedules)
+            samples.append(time.perf_counter() - started)
+        report["paths"][name] = summarize_ms(samples)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--busy-blocks", type=int, default=300)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.busy_blocks, args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Plan quality and latency of greedy, scored and solver recipe assignment.
+
+Generates weekly plans for synthetic users with each MEAL_PLAN_ASSIGNMENT_MODE
+value from the same pools (6 breakfasts, 50 main courses with varied macro
+splits) and reports, per mode:
+
+- assign: solver model + search time (solver only; greedy and scored
+  hand-outs are part of the plan time),
+- plan: the whole generate_weekly_plan call,
+- slot_deviation: mean relative |recipe - target| per macro over every slot,
+- day_calorie_deviation: mean relative |day total - day target| calories.
+
+    python -m benchmarks.bench_assignment --users 20 --output assign.json
+
+No database or API key is needed.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.domain.enums import MealType
+from app.schemas.dietary import DietaryConstraints
+from app.schemas.meal_plan import WeeklyMealPlan
+from app.schemas.user import UserRead
+from app.services import meal_plan
+from app.services.meal_assignment import AssignmentMode
+from app.services.meal_plan import MealPlanService
+from benchmarks.common import summarize_ms
+
+MACROS = ("calories", "protein", "carbohydrates", "fat")
+
+
+def synthetic_pool(rng: random.Random, meal_type: MealType, count: int) -> list[dict]:
+    """Recipes with calories around the slot sizes and varied macro splits."""
+    base = 450 if meal_type == MealType.BREAKFAST else 750
+    results = []
+    for n in range(count):
+        calories = base + rng.randint(-300, 300)
+        protein_share, fat_share = rng.uniform(0.1, 0.4), rng.uniform(0.15, 0.45)
+        carb_share = max(0.05, 1 - protein_share - fat_share)
+        results.append(
+            {
+                "id": (1 if meal_type == MealType.BREAKFAST else 2) * 100000 + n,
+                "title": f"Synthetic {meal_type.value} {n}",
+                "readyInMinutes": rng.choice([10, 20, 30, 45]),
+                "nutrition": {
+                    "nutrients": [
+                        {"name": "Calories", "amount": calories},
+                        {"name": "Protein", "amount": calories * protein_share / 4},
+                        {"name": "Carbohydrates", "amount": calories * carb_share / 4},
+                        {"name": "Fat", "amount": calories * fat_share / 9},
+                    ]
+                },
+            }
+        )
+    return results
+
+
+def synthetic_user(rng: random.Random, n: int) -> UserRead:
+    return UserRead(
+        id=f"bench_assignment_{n}",
+        email=f"bench_assignment_{n}@example.com",
+        age=rng.randint(20, 60),
+        weight=rng.uniform(55, 110),
+        height=rng.uniform(155, 195),
+        show_imperial=False,
+        gender=rng.choice(["male", "female"]),
+        activity_level=rng.choice(["sedentary", "light", "moderate", "active"]),
+        allergies=[],
+        include_cuisine=[],
+        exclude_cuisine=[],
+        is_gluten_free=False,
+        is_ketogenic=False,
+        is_vegetarian=False,
+        is_vegan=False,
+        is_pescatarian=False,
+    )
+
+
+class FixedPoolService(MealPlanService):
+    """Answers pool requests from fixed pools (no cache, catalog or API)."""
+
+    def __init__(self, pools: dict[MealType, list[dict]], mode: AssignmentMode):
+        super().__init__(spoonacular_client=object(), catalog=None)  # type: ignore[arg-type]
+        self.assignment_mode = mode
+        self.pools = pools
+
+    async def _fetch_recipe_pool(
+        self,
+        meal_type: MealType,
+        target_calories: int,
+        constraints: DietaryConstraints,
+        count: int = 20,
+    ) -> list[dict]:
+        return self.pools[meal_type][:count]
+
+
+def plan_quality(plan: WeeklyMealPlan) -> tuple[float, float]:
+    """(mean slot macro deviation, mean day calorie deviation), relative."""
+    slot_devs, day_devs = [], []
+    for day in plan.daily_plans:
+        day_total = 0
+        for slot in day.slots:
+            if slot.plan is None:
+                continue
+            nutrients = slot.plan.main_recipe.nutrients
+            for macro in MACROS:
+                target = max(getattr(slot, macro), 1)
+                slot_devs.append(abs(getattr(nutrients, macro) - target) / target)
+            day_total += nutrients.calories
+        day_target = sum(s.calories for s in day.slots)
+        day_devs.append(abs(day_total - day_target) / max(day_target, 1))
+    return statistics.fmean(slot_devs), statistics.fmean(day_devs)
+
+
+async def run(users: int) -> dict[str, Any]:
+    rng = random.Random(7)
+    report: dict[str, Any] = {
+        "users": users,
+        "time_limit_ms": settings.MEAL_PLAN_SOLVER_TIME_LIMIT_MS,
+    }
+    cases = [
+        (
+            synthetic_user(rng, n),
+            {
+                MealType.BREAKFAST: synthetic_pool(rng, MealType.BREAKFAST, 6),
+                MealType.MAIN_COURSE: synthetic_pool(rng, MealType.MAIN_COURSE, 50),
+            },
+        )
+        for n in range(users)
+    ]
+
+    solve = meal_plan.solve_weekly_primaries
+    solve_seconds: list[float] = []
+    statuses: dict[str, int] = {}
+
+    def timed_solve(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        result = solve(*args, **kwargs)
+        solve_seconds.append(time.perf_counter() - start)
+        status = result.status if result else "FALLBACK"
+        statuses[status] = statuses.get(status, 0) + 1
+        return result
+
+    modes: tuple[AssignmentMode, ...] = ("greedy", "scored", "solver")
+    for mode in modes:
+        plan_seconds, slot_devs, day_devs = [], [], []
+        solve_seconds.clear()
+        statuses.clear()
+        meal_plan.solve_weekly_primaries = timed_solve
+        try:
+            for user, pools in cases:
+                service = FixedPoolService(pools, mode)
+                start = time.perf_counter()
+                plan = await service.generate_weekly_plan(user)
+                plan_seconds.append(time.perf_counter() - start)
+                slot_dev, day_dev = plan_quality(plan)
+                slot_devs.append(slot_dev)
+                day_devs.append(day_dev)
+        finally:
+            meal_plan.solve_weekly_primaries = solve
+        entry: dict[str, Any] = {
+            "plan": summarize_ms(plan_seconds),
+            "slot_deviation": round(statistics.fmean(slot_devs), 4),
+            "day_calorie_deviation": round(statistics.fmean(day_devs), 4),
+        }
+        if solve_seconds:
+            entry["assign"] = summarize_ms(solve_seconds)
+            entry["solver_status"] = dict(statuses)
+        report[mode] = entry
+
+    greedy = report["greedy"]
+    for mode in modes[1:]:
+        report[f"{mode}_vs_greedy"] = {
+            key: round(report[mode][key] / greedy[key], 3)
+            for key in ("slot_deviation", "day_calorie_deviation")
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--output", type=Path, help="also write the report here")
+    args = parser.parse_args()
+
+    output = json.dumps(asyncio.run(run(args.users)), indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Per-request cost of authenticating a Clerk session token.
+
+Compares the previous get_auth_payload (jwt.decode against the PEM string,
+which re-parses the RSA key every call) with TokenVerifier on a cache miss
+(pre-parsed JWKS key) and on a cache hit (same token reused). No network or
+database needed:
+
+    python -m benchmarks.bench_auth --iterations 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.core.security import JWKSKeyStore, TokenVerifier
+from benchmarks.common import summarize_us
+
+
+def _keys() -> tuple[str, str]:
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def _token(private_pem: str, n: int) -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": f"user_{n}", "iat": now, "exp": now + 600},
+        private_pem,
+        algorithm="RS256",
+        headers={"kid": "bench"},
+    )
+
+
+async def run(iterations: int) -> dict:
+    private_pem, public_pem = _keys()
+    # Distinct tokens for the paths that must verify every time
+    tokens = [_token(private_pem, n) for n in range(iterations)]
+    reused = tokens[0]
+
+    store = JWKSKeyStore("https://clerk.bench/.well-known/jwks.json")
+    jwk_dict = jwk.construct(public_pem, "RS256").to_dict()
+    store._fetch_jwks = AsyncMock(  # type: ignore[method-assign]
+        return_value={"keys": [{**jwk_dict, "kid": "bench", "use": "sig"}]}
+    )
+
+    samples: dict[str, list[float]] = {
+        "pem_decode": [],
+        "verifier_miss": [],
+        "verifier_hit": [],
+    }
+
+    for token in tokens:
+        started = time.perf_counter()
+        jwt.decode(token, key=public_pem, algorithms=["RS256"])
+        samples["pem_decode"].append(time.perf_counter() - started)
+
+    cold = TokenVerifier(key_store=store, cache_max_entries=1)
+    await store.refresh()  # JWKS fetch is a one-off, not per request
+    for token in tokens:
+        cold.cache.clear()
+        started = time.perf_counter()
+        await cold.verify(token)
+        samples["verifier_miss"].append(time.perf_counter() - started)
+
+    warm = TokenVerifier(key_store=store)
+    await warm.verify(reused)
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await warm.verify(reused)
+        samples["verifier_hit"].append(time.perf_counter() - started)
+
+    report: dict = {"benchmark": "auth", "iterations": iterations, "paths": {}}
+    for name, values in samples.items():
+        report["paths"][name] = summarize_us(values)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.iterations)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
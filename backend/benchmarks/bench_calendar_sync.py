@@ -0,0 +1,177 @@
+"""Google Calendar sync of many busy blocks: ORM inserts vs COPY.
+
+Syncs a throwaway user against a stubbed FreeBusy endpoint returning --blocks
+synthetic busy blocks (2,000 by default) and reports, per insert strategy:
+
+- full: sync into an empty window, so every block is inserted,
+- resync: the same blocks again, which the diff turns into a no-op.
+
+"orm" is the previous path (one ScheduleItem per block, flushed by the unit
+of work as insertmanyvalues batches); "copy" is _insert_busy_blocks. COPY
+goes straight to asyncpg, so the statement counts leave it out. Needs
+DATABASE_URL pointing at a migrated database; the bench user is removed
+afterwards.
+
+    DATABASE_URL=... python -m benchmarks.bench_calendar_sync --runs 20
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import httpx
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import http
+from app.core.config import settings
+from app.domain.enums import ActivityLevel, ActivityType, PregnancyStatus, Sex
+from app.models.google_calendar import GoogleCalendarConnection
+from app.models.schedule import ScheduleItem
+from app.models.user import User
+from app.services import google_calendar
+from app.services.google_calendar import (
+    BUSY_BLOCK_COLUMNS,
+    SYNC_WEEKS,
+    GoogleCalendarService,
+)
+from benchmarks.common import StatementCounter, summarize_ms
+
+BENCH_USER_ID = "bench_calendar_sync"
+
+
+def synthetic_busy(blocks: int) -> list[dict[str, str]]:
+    """Non-overlapping blocks of 15-60 minutes spread over the sync window."""
+    start = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    step = timedelta(weeks=SYNC_WEEKS) / (blocks + 1)
+    busy = []
+    for n in range(blocks):
+        block_start = start + step * (n + 1)
+        block_end = block_start + min(step, timedelta(minutes=15 + n % 4 * 15))
+        busy.append(
+            {
+                "start": block_start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "end": block_end.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        )
+    return busy
+
+
+def stub_google(busy: list[dict[str, str]]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"calendars": {"primary": {"busy": busy}}})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def insert_orm(db: AsyncSession, records: list[tuple]) -> None:
+    """The previous insert path: one ORM object per busy block."""
+    for record in records:
+        row = dict(zip(BUSY_BLOCK_COLUMNS, record, strict=True))
+        row["activity_type"] = ActivityType[row["activity_type"]]
+        db.add(ScheduleItem(**row))
+
+
+async def run(runs: int, blocks: int) -> dict:
+    engine = create_async_engine(
+        settings.DATABASE_URL, connect_args={"statement_cache_size": 0}
+    )
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    )
+    service = GoogleCalendarService()
+    report: dict = {"benchmark": "calendar_sync", "runs": runs, "blocks": blocks}
+    previous_client = http._client
+    http._client = stub_google(synthetic_busy(blocks))
+    copy_insert = google_calendar._insert_busy_blocks
+
+    async with session_factory() as db:
+        await db.merge(
+            User(
+                id=BENCH_USER_ID,
+                email=f"{BENCH_USER_ID}@example.com",
+                age=30,
+                weight=75.0,
+                height=175.0,
+                show_imperial=False,
+                gender=Sex.MALE,
+                activity_level=ActivityLevel.MODERATE,
+                pregnancy_status=PregnancyStatus.NOT_PREGNANT,
+            )
+        )
+        connection = await db.merge(
+            GoogleCalendarConnection(
+                user_id=BENCH_USER_ID,
+                google_account_email=f"{BENCH_USER_ID}@example.com",
+                sync_status="synced",
+            )
+        )
+        await db.commit()
+
+        async def clear() -> None:
+            await db.execute(
+                delete(ScheduleItem).where(ScheduleItem.user_id == BENCH_USER_ID)
+            )
+            connection.sync_status = "pending"
+            await db.commit()
+            db.expunge_all()
+            db.add(connection)
+
+        try:
+            for name, insert_rows in (("orm", insert_orm), ("copy", copy_insert)):
+                google_calendar._insert_busy_blocks = insert_rows
+                entry: dict[str, Any] = {}
+                for phase in ("full", "resync"):
+                    latencies = []
+                    statements = executions = 0
+                    for _ in range(runs):
+                        if phase == "full":
+                            await clear()
+                        with StatementCounter(engine) as counter:
+                            started = time.perf_counter()
+                            result = await service.sync_for_user(
+                                connection, "bench-token", db
+                            )
+                            latencies.append(time.perf_counter() - started)
+                        expected = blocks if phase == "full" else 0
+                        assert result.added == expected, result
+                        statements = counter.count
+                        executions = counter.executions
+                    entry[phase] = {
+                        "statements_per_sync": statements,
+                        "executions_per_sync": executions,
+                        **summarize_ms(latencies),
+                    }
+                report[name] = entry
+        finally:
+            google_calendar._insert_busy_blocks = copy_insert
+            await http._client.aclose()
+            http._client = previous_client
+            await db.rollback()
+            for model in (ScheduleItem, GoogleCalendarConnection, User):
+                column = model.id if model is User else model.user_id
+                await db.execute(delete(model).where(column == BENCH_USER_ID))
+            await db.commit()
+
+    await engine.dispose()
+    report["full_speedup"] = round(
+        report["orm"]["full"]["p50_ms"] / report["copy"]["full"]["p50_ms"], 2
+    )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--blocks", type=int, default=2000)
+    args = parser.parse_args()
+    if not settings.DATABASE_URL:
+        raise SystemExit("DATABASE_URL must point at a migrated database")
+    print(json.dumps(asyncio.run(run(args.runs, args.blocks)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
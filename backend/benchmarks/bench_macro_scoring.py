@@ -0,0 +1,170 @@
+"""Scoring recipe pools against slot targets: NumPy vs per-recipe Python loops.
+
+For pools of 50, 200 and 1000 recipes and the 21 slots of a week, times:
+
+- score_all: every recipe against every slot, as one deviation_matrix call
+  on prebuilt matrices vs slot_deviation in nested Python loops,
+- rank_slot: the 3 best unused recipes for one slot, RankedPool.rank vs
+  scoring and sorting the pool in Python,
+- build: turning the pool into its macro matrix (paid once per pool).
+
+    python -m benchmarks.bench_macro_scoring --runs 200 --output scoring.json
+
+No database or API key is needed.
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from app.domain.enums import MealSlot
+from app.schemas.meal_plan import MealSlotTarget
+from app.services.macro_scoring import (
+    RankedPool,
+    deviation_matrix,
+    macro_matrix,
+    slot_deviation,
+)
+from app.services.recipe_pool import PoolRecipe
+from benchmarks.common import summarize_us
+
+POOL_SIZES = (50, 200, 1000)
+WEEK_SLOTS = 21
+
+
+def synthetic_recipes(rng: random.Random, count: int) -> list[PoolRecipe]:
+    return [
+        PoolRecipe(
+            id=n,
+            title=f"Recipe {n}",
+            calories=rng.randint(300, 1200),
+            protein=rng.randint(5, 80),
+            carbohydrates=rng.randint(10, 150),
+            fat=rng.randint(5, 70),
+        )
+        for n in range(count)
+    ]
+
+
+def synthetic_slots(rng: random.Random) -> list[MealSlotTarget]:
+    names = [MealSlot.BREAKFAST, MealSlot.LUNCH, MealSlot.DINNER]
+    return [
+        MealSlotTarget(
+            slot_name=names[n % 3],
+            calories=rng.randint(400, 900),
+            protein=rng.randint(20, 60),
+            carbohydrates=rng.randint(40, 110),
+            fat=rng.randint(15, 40),
+        )
+        for n in range(WEEK_SLOTS)
+    ]
+
+
+def loop_rank(
+    recipes: list[PoolRecipe], slot: MealSlotTarget, used_ids: set[int], n: int
+) -> list[PoolRecipe]:
+    scored = [
+        (slot_deviation(recipe, slot), i)
+        for i, recipe in enumerate(recipes)
+        if recipe.id not in used_ids
+    ]
+    scored.sort()
+    return [recipes[i] for _, i in scored[:n]]
+
+
+def _time(fn: Callable[[], Any], runs: int) -> list[float]:
+    """Per-call seconds; fast calls are timed in batches of about 1 ms."""
+    start = time.perf_counter()
+    fn()
+    batch = max(1, int(1e-3 / max(time.perf_counter() - start, 1e-7)))
+    samples = []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(batch):
+            fn()
+        samples.append((time.perf_counter() - start) / batch)
+    return samples
+
+
+def run(runs: int) -> dict[str, Any]:
+    rng = random.Random(5)
+    slots = synthetic_slots(rng)
+    report: dict[str, Any] = {"slots": WEEK_SLOTS}
+    for size in POOL_SIZES:
+        recipes = synthetic_recipes(rng, size)
+        recipe_macros = macro_matrix(recipes)
+        slot_macros = macro_matrix(slots)
+        pool = RankedPool(recipes, used_ids=set(range(0, size, 4)))
+
+        # Both must agree before anything is timed
+        loop_scores = [[slot_deviation(r, s) for r in recipes] for s in slots]
+        vector_scores = deviation_matrix(recipe_macros, slot_macros)
+        assert all(
+            abs(loop_scores[t][r] - vector_scores[t, r]) < 1e-9
+            for t in range(len(slots))
+            for r in range(size)
+        )
+        assert [r.id for r in pool.rank(slots[0], 3)] == [
+            r.id for r in loop_rank(recipes, slots[0], pool.used_ids, 3)
+        ]
+
+        loop_all = _time(
+            lambda recipes=recipes: [
+                [slot_deviation(r, s) for r in recipes] for s in slots
+            ],
+            runs,
+        )
+        vector_all = _time(
+            lambda recipe_macros=recipe_macros, slot_macros=slot_macros: (
+                deviation_matrix(recipe_macros, slot_macros)
+            ),
+            runs,
+        )
+        loop_slot = _time(
+            lambda recipes=recipes, pool=pool: loop_rank(
+                recipes, slots[0], pool.used_ids, 3
+            ),
+            runs,
+        )
+        vector_slot = _time(lambda pool=pool: pool.rank(slots[0], 3), runs)
+        build = _time(lambda recipes=recipes: RankedPool(recipes), runs)
+
+        entry: dict[str, Any] = {
+            "score_all": {
+                "python": summarize_us(loop_all),
+                "numpy": summarize_us(vector_all),
+            },
+            "rank_slot": {
+                "python": summarize_us(loop_slot),
+                "numpy": summarize_us(vector_slot),
+            },
+            "build": summarize_us(build),
+        }
+        for stage in ("score_all", "rank_slot"):
+            entry[stage]["speedup"] = round(
+                entry[stage]["python"]["p50_us"] / entry[stage]["numpy"]["p50_us"], 1
+            )
+        report[f"pool_{size}"] = entry
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--output", type=Path, help="also write the report here")
+    args = parser.parse_args()
+
+    output = json.dumps(run(args.runs), indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,571 @@
+"""Weekly meal-plan generation, end to end and per pipeline stage.
+
+Runs MealPlanService.generate_and_persist for synthetic users whose busy-time
+density and dietary constraints vary by profile. It needs a migrated
+database, and SpoonacularClient replays recorded complexSearch responses
+instead of calling the API. The JSON report has p50/p95/p99 latency, SQL
+statements and peak Python allocations for each stage (exercise plan,
+allocation, leftovers, pool fetch, recipe conversion, persistence):
+
+    DATABASE_URL=... python -m benchmarks.bench_meal_plan --runs 20 \\
+        --output meal_plan.json
+
+Responses are read from benchmarks/fixtures/complex_search_<type>.json.
+Record them once with a real key:
+
+    SPOONACULAR_API_KEY=... python -m benchmarks.bench_meal_plan --record
+
+Without recordings, synthetic responses of the same shape are used. Bench
+users are removed afterwards.
+"""
+
+import argparse
+import asyncio
+import functools
+import inspect
+import json
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from datetime import time as time_type
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.domain.enums import (
+    ActivityLevel,
+    ActivityType,
+    Allergy,
+    Cuisine,
+    MealType,
+    PregnancyStatus,
+    Sex,
+)
+from app.models.dietary import UserAllergy, UserExcludeCuisine, UserIncludeCuisine
+from app.models.schedule import ScheduleItem
+from app.models.user import User
+from app.schemas.user import UserRead
+from app.services.exercise_service import ExercisePlanService
+from app.services.meal_allocator import MealAllocator
+from app.services.meal_plan import MealPlanService
+from app.services.recipe_pool import PoolRecipe
+from app.services.spoonacular import SpoonacularClient
+from benchmarks.common import driver_executions, summarize_ms
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+RECORDED_TYPES = (MealType.BREAKFAST, MealType.MAIN_COURSE)
+WEEK_START = date(2025, 6, 2)
+USER_PREFIX = "bench_meal_plan"
+
+# Stage name -> the (owner, attribute) callables whose time is charged to it
+STAGES: dict[str, list[tuple[type, str]]] = {
+    "exercise_plan": [(ExercisePlanService, "generate_weekly_plan")],
+    "allocation": [
+        (MealAllocator, "free_interval_index"),
+        (MealAllocator, "allocate_targets"),
+        (MealAllocator, "allocate_exercise_time"),
+    ],
+    "leftovers": [(MealPlanService, "_apply_adaptive_leftovers")],
+    "pool_fetch": [(MealPlanService, "_fetch_recipe_pool")],
+    "recipe_conversion": [
+        (PoolRecipe, "from_spoonacular"),
+        (PoolRecipe, "to_recipe"),
+    ],
+    "persistence": [(MealPlanService, "_persist_weekly_plan")],
+}
+
+# name, Google Calendar blocks per week, dietary profile
+PROFILES: list[tuple[str, int, dict[str, Any]]] = [
+    ("free_omnivore", 0, {}),
+    (
+        "typical_vegetarian",
+        25,
+        {"is_vegetarian": True, "allergies": [Allergy.PEANUT]},
+    ),
+    (
+        "packed_gluten_free",
+        150,
+        {
+            "is_gluten_free": True,
+            "allergies": [Allergy.DAIRY, Allergy.SEAFOOD],
+            "include_cuisines": [Cuisine.ITALIAN, Cuisine.AMERICAN],
+        },
+    ),
+    (
+        "packed_vegan",
+        300,
+        {"is_vegan": True, "exclude_cuisines": [Cuisine.BRITISH]},
+    ),
+]
+
+
+# ── Spoonacular replay ────────────────────────────────────────────────────────
+
+
+def _fixture_path(meal_type: MealType) -> Path:
+    return FIXTURES_DIR / f"complex_search_{meal_type.value.replace(' ', '_')}.json"
+
+
+def _synthetic_response(meal_type: MealType, count: int = 100) -> dict[str, Any]:
+    """A complexSearch body shaped like a recorded one (nutrition included)."""
+    rng = random.Random(meal_type.value)
+    base = 500 if meal_type == MealType.BREAKFAST else 700
+    results = []
+    for n in range(count):
+        calories = base + rng.randint(-200, 200)
+        results.append(
+            {
+                "id": (1 if meal_type == MealType.BREAKFAST else 2) * 100000 + n,
+                "title": f"Synthetic {meal_type.value} {n}",
+                "image": f"https://img.spoonacular.com/recipes/{n}-312x231.jpg",
+                "summary": "A <b>synthetic</b> recipe. " * 20,
+                "readyInMinutes": rng.choice([10, 20, 30, 45, 60]),
+                "servings": rng.choice([1, 2, 4]),
+                "sourceUrl": f"https://example.com/recipes/{n}",
+                "diets": rng.sample(
+                    ["gluten free", "vegetarian", "vegan", "pescatarian"], 2
+                ),
+                "dishTypes": [meal_type.value],
+                "cuisines": rng.sample(["Italian", "American", "Mexican"], 1),
+                "nutrition": {
+                    "nutrients": [
+                        {"name": "Calories", "amount": calories, "unit": "kcal"},
+                        {"name": "Fat", "amount": calories * 0.3 / 9, "unit": "g"},
+                        {"name": "Saturated Fat", "amount": 5.0, "unit": "g"},
+                        {
+                            "name": "Carbohydrates",
+                            "amount": calories * 0.45 / 4,
+                            "unit": "g",
+                        },
+                        {"name": "Sugar", "amount": 8.0, "unit": "g"},
+                        {
+                            "name": "Protein",
+                            "amount": calories * 0.25 / 4,
+                            "unit": "g",
+                        },
+                        {"name": "Sodium", "amount": 600.0, "unit": "mg"},
+                        {"name": "Fiber", "amount": 6.0, "unit": "g"},
+                    ]
+                },
+                "extendedIngredients": [
+                    {"id": i, "name": f"ingredient {i}", "original": f"1 cup item {i}"}
+                    for i in range(rng.randint(5, 12))
+                ],
+                "analyzedInstructions": [
+                    {
+                        "name": "",
+                        "steps": [
+                            {"number": s, "step": f"Step {s} of the method."}
+                            for s in range(1, 7)
+                        ],
+                    }
+                ],
+            }
+        )
+    return {"results": results, "offset": 0, "number": count, "totalResults": count}
+
+
+def load_responses() -> tuple[dict[str, bytes], str]:
+    """Raw complexSearch bodies per meal type, and where they came from."""
+    paths = {t: _fixture_path(t) for t in RECORDED_TYPES}
+    if all(p.exists() for p in paths.values()):
+        return {t.value: p.read_bytes() for t, p in paths.items()}, "recorded"
+    return {
+        t.value: json.dumps(_synthetic_response(t)).encode() for t in RECORDED_TYPES
+    }, "synthetic"
+
+
+class ReplaySpoonacularClient(SpoonacularClient):
+    """
+    Answers complexSearch from recorded bodies (parsed on every call, like a
+    real response) sliced by offset/number. Other query parameters are ignored.
+    """
+
+    def __init__(self, responses: dict[str, bytes], latency_seconds: float = 0.0):
+        super().__init__(api_key="replay")
+        self.responses = responses
+        self.latency_seconds = latency_seconds
+
+    async def _request(
+        self, method: str, endpoint: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        params = params or {}
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        data = json.loads(self.responses[params["type"]])
+        offset = params.get("offset", 0)
+        data["results"] = data["results"][offset : offset + params.get("number", 10)]
+        return data
+
+
+async def record() -> None:
+    """Save one complexSearch page (100 recipes) per meal type."""
+    client = SpoonacularClient()
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    for meal_type in RECORDED_TYPES:
+        data = await client._request(
+            "GET",
+            "/recipes/complexSearch",
+            params={
+                "type": meal_type.value,
+                "number": 100,
+                "addRecipeInformation": True,
+                "addRecipeNutrition": True,
+                "addRecipeInstructions": True,
+                "instructionsRequired": True,
+                "fillIngredients": True,
+            },
+        )
+        _fixture_path(meal_type).write_text(json.dumps(data))
+        print(f"recorded {len(data.get('results', []))} {meal_type.value} recipes")
+
+
+# ── Stage profiling ───────────────────────────────────────────────────────────
+
+
+class StageProfiler:
+    """
+    Charges wall time, SQL statements and peak traced allocations to the
+    pipeline stage that is running. Concurrent calls of one stage (the pool
+    fetches are gathered) count their overlapping time once. Anything outside
+    a stage is charged to "other".
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self._stack: list[str] = []
+        self._depth: dict[str, int] = defaultdict(int)
+        self._entered: dict[str, float] = {}
+        self._alloc_base: dict[str, int] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.statements: dict[str, int] = defaultdict(int)
+        self.executions: dict[str, int] = defaultdict(int)
+        self.peak_bytes: dict[str, int] = defaultdict(int)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        stage = self._stack[-1] if self._stack else "other"
+        self.statements[stage] += 1
+        self.executions[stage] += driver_executions(parameters, context)
+
+    def _enter(self, stage: str) -> None:
+        self._stack.append(stage)
+        self._depth[stage] += 1
+        if self._depth[stage] == 1:
+            self._entered[stage] = time.perf_counter()
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                self._alloc_base[stage] = tracemalloc.get_traced_memory()[0]
+
+    def _exit(self, stage: str) -> None:
+        # Remove the innermost entry of this stage (gathered calls may finish
+        # out of order)
+        del self._stack[len(self._stack) - 1 - self._stack[::-1].index(stage)]
+        self._depth[stage] -= 1
+        if self._depth[stage] == 0:
+            self.seconds[stage] += time.perf_counter() - self._entered[stage]
+            if tracemalloc.is_tracing():
+                peak = tracemalloc.get_traced_memory()[1] - self._alloc_base[stage]
+                self.peak_bytes[stage] = max(self.peak_bytes[stage], peak)
+
+    def _wrap(self, stage: str, func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                self._enter(stage)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self._exit(stage)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self._enter(stage)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit(stage)
+
+        return wrapper
+
+    @contextmanager
+    def installed(self) -> Iterator["StageProfiler"]:
+        """Patch the stage callables (and an SQL listener) while active."""
+        originals: list[tuple[type, str, Any]] = []
+        for stage, targets in STAGES.items():
+            for owner, name in targets:
+                raw = inspect.getattr_static(owner, name)
+                if isinstance(raw, staticmethod | classmethod):
+                    patched: Any = type(raw)(self._wrap(stage, raw.__func__))
+                else:
+                    patched = self._wrap(stage, raw)
+                originals.append((owner, name, raw))
+                setattr(owner, name, patched)
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._on_execute)
+        try:
+            yield self
+        finally:
+            event.remove(
+                self.engine.sync_engine, "before_cursor_execute", self._on_execute
+            )
+            for owner, name, raw in originals:
+                setattr(owner, name, raw)
+
+
+# ── Synthetic users ───────────────────────────────────────────────────────────
+
+
+def _bench_user(user_id: str, rng: random.Random, diet: dict[str, Any]) -> User:
+    return User(
+        id=user_id,
+        email=f"{user_id}@example.com",
+        age=rng.randint(20, 60),
+        weight=round(rng.uniform(55, 110), 1),
+        height=round(rng.uniform(155, 195), 1),
+        show_imperial=False,
+        gender=rng.choice([Sex.MALE, Sex.FEMALE]),
+        activity_level=rng.choice(list(ActivityLevel)),
+        pregnancy_status=PregnancyStatus.NOT_PREGNANT,
+        wake_up_time=time_type(rng.choice([6, 7]), 0),
+        sleep_time=time_type(rng.choice([22, 23]), 0),
+        is_gluten_free=diet.get("is_gluten_free", False),
+        is_vegetarian=diet.get("is_vegetarian", False),
+        is_vegan=diet.get("is_vegan", False),
+        user_allergies=[UserAllergy(value=a) for a in diet.get("allergies", [])],
+        user_include_cuisines=[
+            UserIncludeCuisine(value=c) for c in diet.get("include_cuisines", [])
+        ],
+        user_exclude_cuisines=[
+            UserExcludeCuisine(value=c) for c in diet.get("exclude_cuisines", [])
+        ],
+    )
+
+
+def _calendar_blocks(
+    user_id: str, rng: random.Random, count: int
+) -> list[ScheduleItem]:
+    """Google Calendar busy blocks spread over the bench week's waking hours."""
+    blocks = []
+    for _ in range(count):
+        start = datetime.combine(
+            WEEK_START + timedelta(days=rng.randrange(7)),
+            time_type(rng.randrange(7, 21), rng.choice([0, 15, 30, 45])),
+        )
+        blocks.append(
+            ScheduleItem(
+                user_id=user_id,
+                date=start,
+                activity_type=ActivityType.OTHER,
+                duration_minutes=rng.choice([15, 30, 30, 60, 90]),
+                source_type="google_calendar",
+            )
+        )
+    return blocks
+
+
+async def seed_users(
+    db: AsyncSession, users_per_profile: int, seed: int
+) -> list[tuple[str, str, int]]:
+    """Create the bench users; returns (user_id, profile, busy_blocks)."""
+    rng = random.Random(seed)
+    users = []
+    for profile, busy_blocks, diet in PROFILES:
+        for n in range(users_per_profile):
+            user_id = f"{USER_PREFIX}_{profile}_{n}"
+            db.add(_bench_user(user_id, rng, diet))
+            await db.flush()
+            db.add_all(_calendar_blocks(user_id, rng, busy_blocks))
+            users.append((user_id, profile, busy_blocks))
+    await db.commit()
+    db.expunge_all()
+    return users
+
+
+async def load_user(db: AsyncSession, user_id: str) -> UserRead:
+    result = await db.execute(
+        select(User)
+        .where(User.id == user_id)
+        .options(
+            selectinload(User.user_allergies),
+            selectinload(User.user_include_cuisines),
+            selectinload(User.user_exclude_cuisines),
+            selectinload(User.user_busy_times),
+        )
+    )
+    return UserRead.model_validate(result.scalar_one())
+
+
+async def remove_users(db: AsyncSession) -> None:
+    bench_users = select(User.id).where(User.id.startswith(USER_PREFIX))
+    for model in (ScheduleItem, UserAllergy, UserIncludeCuisine, UserExcludeCuisine):
+        await db.execute(delete(model).where(model.user_id.in_(bench_users)))
+    await db.execute(delete(User).where(User.id.startswith(USER_PREFIX)))
+    await db.commit()
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+
+async def run(
+    runs: int,
+    alloc_runs: int,
+    users_per_profile: int,
+    api_latency_ms: float,
+    seed: int,
+) -> dict:
+    random.seed(seed)  # pool offsets and shuffles
+    engine = create_async_engine(
+        settings.DATABASE_URL, connect_args={"statement_cache_size": 0}
+    )
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    )
+    responses, source = load_responses()
+    service = MealPlanService(
+        spoonacular_client=ReplaySpoonacularClient(
+            responses, latency_seconds=api_latency_ms / 1000
+        ),
+        catalog=None,
+        local_first=False,
+    )
+    profiler = StageProfiler(engine)
+    stage_names = [*STAGES, "other"]
+
+    seconds: dict[str, list[float]] = defaultdict(list)
+    statements: dict[str, list[int]] = defaultdict(list)
+    executions: dict[str, list[int]] = defaultdict(list)
+    peak_bytes: dict[str, list[int]] = defaultdict(list)
+    totals: list[float] = []
+    by_profile: dict[str, list[float]] = defaultdict(list)
+
+    async def generate(db: AsyncSession, user: UserRead) -> float:
+        profiler.reset()
+        started = time.perf_counter()
+        await service.generate_and_persist(user, WEEK_START, db)
+        total = time.perf_counter() - started
+        db.expunge_all()
+        profiler.seconds["other"] = total - sum(profiler.seconds.values())
+        return total
+
+    async with session_factory() as db:
+        await remove_users(db)  # leftovers of an interrupted run
+        users = await seed_users(db, users_per_profile, seed)
+        try:
+            with profiler.installed():
+                for user_id, profile, _ in users:
+                    user = await load_user(db, user_id)
+                    await generate(db, user)  # warm-up: creates the shared meals
+                    for _ in range(runs):
+                        total = await generate(db, user)
+                        totals.append(total)
+                        by_profile[profile].append(total)
+                        for stage in stage_names:
+                            seconds[stage].append(profiler.seconds[stage])
+                            statements[stage].append(profiler.statements[stage])
+                            executions[stage].append(profiler.executions[stage])
+
+                # Separate pass: tracemalloc slows everything down
+                if alloc_runs:
+                    tracemalloc.start()
+                    try:
+                        for user_id, _, _ in users:
+                            user = await load_user(db, user_id)
+                            for _ in range(alloc_runs):
+                                await generate(db, user)
+                                for stage in STAGES:
+                                    peak_bytes[stage].append(profiler.peak_bytes[stage])
+                    finally:
+                        tracemalloc.stop()
+        finally:
+            await remove_users(db)
+
+    await engine.dispose()
+
+    report: dict = {
+        "benchmark": "meal_plan",
+        "runs_per_user": runs,
+        "spoonacular_responses": source,
+        "api_latency_ms": api_latency_ms,
+        "users": [
+            {"profile": profile, "busy_blocks": busy} for _, profile, busy in users
+        ],
+        "total": summarize_ms(totals),
+        "profiles": {name: summarize_ms(v) for name, v in by_profile.items()},
+        "stages": {},
+    }
+    for stage in stage_names:
+        entry = {
+            **summarize_ms(seconds[stage]),
+            "statements_per_plan": max(statements[stage]),
+            "executions_per_plan": max(executions[stage]),
+        }
+        if peak_bytes.get(stage):
+            ordered = sorted(peak_bytes[stage])
+            entry["peak_alloc_kib"] = round(ordered[len(ordered) // 2] / 1024, 1)
+        report["stages"][stage] = entry
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="plans per user")
+    parser.add_argument(
+        "--alloc-runs", type=int, default=3, help="traced plans per user (0: off)"
+    )
+    parser.add_argument("--users-per-profile", type=int, default=2)
+    parser.add_argument(
+        "--api-latency-ms",
+        type=float,
+        default=0.0,
+        help="simulated Spoonacular round trip per search",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="also write the report here")
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="record Spoonacular fixtures (needs SPOONACULAR_API_KEY) and exit",
+    )
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record())
+        return
+    if not settings.DATABASE_URL:
+        raise SystemExit("DATABASE_URL must point at a migrated database")
+
+    report = asyncio.run(
+        run(
+            args.runs,
+            args.alloc_runs,
+            args.users_per_profile,
+            args.api_latency_ms,
+            args.seed,
+        )
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
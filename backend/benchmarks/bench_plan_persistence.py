@@ -0,0 +1,293 @@
+"""Weekly plan persistence: row-by-row ORM writes vs the bulk insert path.
+
+Writes the same synthetic week (21 meal slots with leftovers and two
+alternatives each, plus four workouts) for a throwaway user with both
+strategies and reports statements per write and latency. Needs DATABASE_URL
+pointing at a migrated database; the bench user is removed afterwards.
+
+    DATABASE_URL=... python -m benchmarks.bench_plan_persistence --runs 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as time_type
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.domain.enums import (
+    ActivityLevel,
+    ActivityType,
+    Day,
+    ExerciseCategory,
+    MealSlot,
+    PregnancyStatus,
+    Sex,
+)
+from app.models.meal import ScheduleItemAlternative
+from app.models.schedule import ScheduleItem
+from app.models.user import User
+from app.schemas.meal_plan import DailyMealPlan, MealOption, MealSlotTarget
+from app.schemas.recipe import Recipe, RecipeNutrients
+from app.services.exercise_service import ExerciseRecommendation
+from app.services.plan_persistence import (
+    _DAY_OFFSETS,
+    PLAN_ACTIVITY_TYPES,
+    WeeklyPlanWrite,
+    upsert_shared_meals,
+    week_bounds,
+    write_weekly_plans,
+)
+from benchmarks.common import StatementCounter, summarize_ms
+
+BENCH_USER_ID = "bench_plan_persistence"
+WEEK_START = date(2025, 6, 2)
+SLOT_TIMES = {
+    MealSlot.BREAKFAST: time_type(8, 0),
+    MealSlot.LUNCH: time_type(12, 30),
+    MealSlot.DINNER: time_type(18, 30),
+}
+
+
+def _recipe(recipe_id: int) -> Recipe:
+    return Recipe(
+        id=f"bench-{recipe_id}",
+        title=f"Bench recipe {recipe_id}",
+        nutrients=RecipeNutrients(calories=600, protein=35, carbohydrates=60, fat=20),
+        ingredients=["1 cup rice", "200 g chicken"],
+        preparation_time_minutes=25,
+    )
+
+
+def build_week() -> list[DailyMealPlan]:
+    """Dinner is cooked for two on Mon/Wed/Fri and eaten as next-day lunch."""
+    days = list(Day)
+    plans = []
+    next_recipe = 0
+    for offset, day in enumerate(days):
+        slots = []
+        for slot_name in (MealSlot.BREAKFAST, MealSlot.LUNCH, MealSlot.DINNER):
+            previous = days[offset - 1] if offset else None
+            if slot_name == MealSlot.LUNCH and previous in (
+                Day.MONDAY,
+                Day.WEDNESDAY,
+                Day.FRIDAY,
+            ):
+                slots.append(
+                    MealSlotTarget(
+                        slot_name=slot_name,
+                        calories=600,
+                        protein=35,
+                        carbohydrates=60,
+                        fat=20,
+                        time=SLOT_TIMES[slot_name],
+                        is_leftover=True,
+                        leftover_from_day=previous,
+                        leftover_from_slot=MealSlot.DINNER,
+                    )
+                )
+                continue
+            main, alt_a, alt_b = (_recipe(next_recipe + i) for i in range(3))
+            next_recipe += 3
+            slots.append(
+                MealSlotTarget(
+                    slot_name=slot_name,
+                    calories=600,
+                    protein=35,
+                    carbohydrates=60,
+                    fat=20,
+                    time=SLOT_TIMES[slot_name],
+                    prep_time_minutes=25,
+                    plan=MealOption(main_recipe=main, alternatives=[alt_a, alt_b]),
+                )
+            )
+        exercise = None
+        if day in (Day.MONDAY, Day.TUESDAY, Day.THURSDAY, Day.SATURDAY):
+            exercise = ExerciseRecommendation(
+                category=ExerciseCategory.WEIGHT_LIFTING,
+                duration_minutes=60,
+                time=time_type(7, 0),
+                calories_burned=350,
+                muscle_gain_estimate_kg=0.01,
+            )
+        plans.append(
+            DailyMealPlan(
+                day=day,
+                slots=slots,
+                exercise=exercise,
+                total_calories=1800,
+                total_protein=105,
+                total_carbs=180,
+                total_fat=60,
+            )
+        )
+    return plans
+
+
+async def write_row_by_row(
+    db: AsyncSession, user_id: str, week_start: date, daily_plans: list[DailyMealPlan]
+) -> None:
+    """The previous persistence path: one ORM object per row, two flushes."""
+    week_start_dt, week_end_dt = week_bounds(week_start)
+    await db.execute(
+        delete(ScheduleItem).where(
+            ScheduleItem.user_id == user_id,
+            ScheduleItem.activity_type.in_(PLAN_ACTIVITY_TYPES),
+            ScheduleItem.date >= week_start_dt,
+            ScheduleItem.date <= week_end_dt,
+        )
+    )
+
+    recipes: dict[str, Recipe] = {}
+    for plan in daily_plans:
+        for slot in plan.slots:
+            if slot.is_leftover or not slot.plan:
+                continue
+            if slot.plan.main_recipe:
+                recipes.setdefault(slot.plan.main_recipe.id, slot.plan.main_recipe)
+            for alt in slot.plan.alternatives:
+                recipes.setdefault(alt.id, alt)
+    meal_ids = await upsert_shared_meals(db, list(recipes.values()))
+
+    items: dict[tuple, ScheduleItem] = {}
+    for plan in daily_plans:
+        slot_date = week_start + timedelta(days=_DAY_OFFSETS[plan.day])
+        for slot in plan.slots:
+            prep = 5 if slot.is_leftover else (slot.prep_time_minutes or 30)
+            meal_id = None
+            if not slot.is_leftover and slot.plan and slot.plan.main_recipe:
+                meal_id = meal_ids.get(slot.plan.main_recipe.id)
+            item = ScheduleItem(
+                user_id=user_id,
+                date=datetime.combine(slot_date, slot.time or time_type(12, 0)),
+                activity_type=ActivityType.MEAL,
+                meal_type=slot.slot_name.value,
+                duration_minutes=max(30, prep),
+                prep_time_minutes=prep,
+                is_completed=False,
+                meal_id=meal_id,
+            )
+            db.add(item)
+            items[(plan.day, slot.slot_name)] = item
+    await db.flush()
+
+    for plan in daily_plans:
+        if not plan.exercise:
+            continue
+        slot_date = week_start + timedelta(days=_DAY_OFFSETS[plan.day])
+        db.add(
+            ScheduleItem(
+                user_id=user_id,
+                date=datetime.combine(slot_date, plan.exercise.time or time_type(7)),
+                activity_type=ActivityType.EXERCISE,
+                duration_minutes=plan.exercise.duration_minutes,
+                prep_time_minutes=0,
+                is_completed=False,
+                exercise_category=plan.exercise.category,
+                exercise_calorie_burn=plan.exercise.calories_burned,
+                exercise_muscle_gain=plan.exercise.muscle_gain_estimate_kg,
+            )
+        )
+
+    for plan in daily_plans:
+        for slot in plan.slots:
+            if slot.is_leftover:
+                leftover = items[(plan.day, slot.slot_name)]
+                source = items.get((slot.leftover_from_day, slot.leftover_from_slot))
+                if source:
+                    leftover.source_schedule_item_id = source.id
+                    leftover.meal_id = source.meal_id
+            elif slot.plan:
+                for alt in slot.plan.alternatives:
+                    db.add(
+                        ScheduleItemAlternative(
+                            schedule_item_id=items[(plan.day, slot.slot_name)].id,
+                            meal_id=meal_ids[alt.id],
+                        )
+                    )
+
+
+async def write_bulk(
+    db: AsyncSession, user_id: str, week_start: date, daily_plans: list[DailyMealPlan]
+) -> None:
+    await write_weekly_plans(db, [WeeklyPlanWrite(user_id, week_start, daily_plans)])
+
+
+async def run(runs: int) -> dict:
+    engine = create_async_engine(
+        settings.DATABASE_URL, connect_args={"statement_cache_size": 0}
+    )
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    )
+    week = build_week()
+    report: dict = {"benchmark": "plan_persistence", "runs": runs, "strategies": {}}
+
+    async with session_factory() as db:
+        await db.merge(
+            User(
+                id=BENCH_USER_ID,
+                email=f"{BENCH_USER_ID}@example.com",
+                age=30,
+                weight=75.0,
+                height=175.0,
+                show_imperial=False,
+                gender=Sex.MALE,
+                activity_level=ActivityLevel.MODERATE,
+                pregnancy_status=PregnancyStatus.NOT_PREGNANT,
+            )
+        )
+        await db.commit()
+
+        try:
+            for name, write in (
+                ("row_by_row", write_row_by_row),
+                ("bulk", write_bulk),
+            ):
+                # Warm-up: first write creates the shared meals
+                await write(db, BENCH_USER_ID, WEEK_START, week)
+                await db.commit()
+                db.expunge_all()
+
+                latencies = []
+                statements = executions = 0
+                for _ in range(runs):
+                    with StatementCounter(engine) as counter:
+                        started = time.perf_counter()
+                        await write(db, BENCH_USER_ID, WEEK_START, week)
+                        await db.commit()
+                        latencies.append(time.perf_counter() - started)
+                    db.expunge_all()
+                    statements = counter.count
+                    executions = counter.executions
+                report["strategies"][name] = {
+                    "statements_per_write": statements,
+                    "executions_per_write": executions,
+                    **summarize_ms(latencies),
+                }
+        finally:
+            await db.execute(
+                delete(ScheduleItem).where(ScheduleItem.user_id == BENCH_USER_ID)
+            )
+            await db.execute(delete(User).where(User.id == BENCH_USER_ID))
+            await db.commit()
+
+    await engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+    if not settings.DATABASE_URL:
+        raise SystemExit("DATABASE_URL must point at a migrated database")
+    print(json.dumps(asyncio.run(run(args.runs)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
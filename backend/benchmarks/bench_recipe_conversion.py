@@ -0,0 +1,163 @@
+"""Cost of turning a recipe pool into plan recipes, before and after PoolRecipe.
+
+Replays the conversions one weekly plan makes from a 50-recipe main pool and
+a 6-recipe breakfast pool:
+
+    python -m benchmarks.bench_recipe_conversion --runs 500 --output conv.json
+
+- legacy: the old MealPlanService._convert_to_recipe (substring nutrient
+  matching over every nutrient), called once per placement, so breakfasts
+  rotating through the week are converted again every day.
+- pool: parse_pool once per pool, then PoolRecipe.to_recipe per placement
+  (built once per recipe).
+
+Recipes carry the full ~30 nutrient list of the full search profile. No
+database or API key is needed.
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from app.schemas.recipe import Recipe, RecipeNutrients
+from app.services.recipe_pool import parse_pool
+from app.services.spoonacular import recipe_ingredient_lines
+from benchmarks.bench_search_payload import synthetic_full_result
+from benchmarks.common import summarize_us
+
+MAIN_POOL_SIZE = 50
+BREAKFAST_POOL_SIZE = 6
+# Lunch + dinner slots that are cooked (not leftovers) in a typical week,
+# each placing a primary and two alternatives
+COOKED_MAIN_SLOTS = 10
+DAYS = 7
+
+
+def legacy_convert(spoon_data: dict) -> Recipe:
+    """MealPlanService._convert_to_recipe as it was before PoolRecipe."""
+    nutrients_list = spoon_data.get("nutrition", {}).get("nutrients", [])
+    calories = protein = carbs = fat = 0
+    for nutrient in nutrients_list:
+        name = nutrient.get("name", "").lower()
+        amount = int(nutrient.get("amount", 0))
+        if "calorie" in name:
+            calories = amount
+        elif "protein" in name:
+            protein = amount
+        elif "carbohydrate" in name:
+            carbs = amount
+        elif "fat" in name:
+            fat = amount
+    tags = [
+        *spoon_data.get("diets", []),
+        *spoon_data.get("dishTypes", []),
+        *spoon_data.get("cuisines", []),
+    ]
+    return Recipe(
+        id=str(spoon_data.get("id", "")),
+        title=spoon_data.get("title", "Unknown Recipe"),
+        description=spoon_data.get("summary", ""),
+        nutrients=RecipeNutrients(
+            calories=calories, protein=protein, carbohydrates=carbs, fat=fat
+        ),
+        tags=tags,
+        ingredients=recipe_ingredient_lines(spoon_data),
+        preparation_time_minutes=spoon_data.get("readyInMinutes"),
+        source_url=spoon_data.get("sourceUrl"),
+        image_url=spoon_data.get("image"),
+    )
+
+
+def _placements() -> tuple[list[int], list[int]]:
+    """Pool indexes placed over one week: (breakfast, main)."""
+    breakfast = []
+    for day in range(DAYS):
+        breakfast += [day % 3, 3, 4]
+    main = list(range(COOKED_MAIN_SLOTS * 3))
+    return breakfast, main
+
+
+def run_legacy(breakfast_pool: list[dict], main_pool: list[dict]) -> list[Recipe]:
+    breakfast, main = _placements()
+    return [legacy_convert(breakfast_pool[i]) for i in breakfast] + [
+        legacy_convert(main_pool[i]) for i in main
+    ]
+
+
+def run_pool(breakfast_pool: list[dict], main_pool: list[dict]) -> list[Recipe]:
+    breakfast, main = _placements()
+    breakfast_recipes = parse_pool(breakfast_pool)
+    main_recipes = parse_pool(main_pool)
+    return [breakfast_recipes[i].to_recipe() for i in breakfast] + [
+        main_recipes[i].to_recipe() for i in main
+    ]
+
+
+def _time(fn: Callable[[], Any], runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run(runs: int) -> dict[str, Any]:
+    rng = random.Random(1)
+    breakfast_pool = [
+        synthetic_full_result(rng, n, "breakfast") for n in range(BREAKFAST_POOL_SIZE)
+    ]
+    main_pool = [
+        synthetic_full_result(rng, n, "main course") for n in range(MAIN_POOL_SIZE)
+    ]
+    # Both paths must agree on what ends up in the plan (the legacy substring
+    # match reads "Saturated Fat" / "Net Carbohydrates" into the macros, so
+    # only compare what it got right)
+    for old, new in zip(
+        run_legacy(breakfast_pool, main_pool),
+        run_pool(breakfast_pool, main_pool),
+        strict=True,
+    ):
+        assert (old.id, old.title, old.ingredients) == (
+            new.id,
+            new.title,
+            new.ingredients,
+        )
+
+    legacy = _time(lambda: run_legacy(breakfast_pool, main_pool), runs)
+    pool = _time(lambda: run_pool(breakfast_pool, main_pool), runs)
+    parse_only = _time(lambda: parse_pool(main_pool), runs)
+    report: dict[str, Any] = {
+        "main_pool": MAIN_POOL_SIZE,
+        "breakfast_pool": BREAKFAST_POOL_SIZE,
+        "placements": sum(len(p) for p in _placements()),
+        "legacy": summarize_us(legacy),
+        "pool": summarize_us(pool),
+        "parse_main_pool": summarize_us(parse_only),
+    }
+    report["pool_vs_legacy"] = round(
+        report["pool"]["p50_us"] / report["legacy"]["p50_us"], 3
+    )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--output", type=Path, help="also write the report here")
+    args = parser.parse_args()
+
+    output = json.dumps(run(args.runs), indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Size and parse cost of complexSearch pages, full vs lean search profile.
+
+For one page (100 recipes by default) of each profile the report has the
+body size in bytes and the time to parse it with json and with orjson (when
+installed), plus the time to convert the page with
+MealPlanService._convert_to_recipe:
+
+    python -m benchmarks.bench_search_payload --runs 200 --output payload.json
+
+Full pages come from the recordings of bench_meal_plan
+(benchmarks/fixtures/complex_search_<type>.json, recorded with the full
+profile) when present, otherwise from synthetic results shaped like a full
+response (every nutrient, per-ingredient nutrition, analyzed instructions).
+Lean pages are the same recipes reduced to what the lean profile returns.
+No database or API key is needed.
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from app.services.meal_plan import MealPlanService
+from benchmarks.bench_meal_plan import RECORDED_TYPES, _fixture_path
+from benchmarks.common import summarize_us
+
+NUTRIENTS = [
+    ("Calories", "kcal"),
+    ("Fat", "g"),
+    ("Saturated Fat", "g"),
+    ("Carbohydrates", "g"),
+    ("Net Carbohydrates", "g"),
+    ("Sugar", "g"),
+    ("Cholesterol", "mg"),
+    ("Sodium", "mg"),
+    ("Alcohol", "g"),
+    ("Protein", "g"),
+    ("Vitamin K", "µg"),
+    ("Vitamin A", "IU"),
+    ("Vitamin C", "mg"),
+    ("Manganese", "mg"),
+    ("Folate", "µg"),
+    ("Fiber", "g"),
+    ("Vitamin B6", "mg"),
+    ("Potassium", "mg"),
+    ("Magnesium", "mg"),
+    ("Vitamin B2", "mg"),
+    ("Vitamin B1", "mg"),
+    ("Vitamin E", "mg"),
+    ("Phosphorus", "mg"),
+    ("Copper", "mg"),
+    ("Iron", "mg"),
+    ("Vitamin B3", "mg"),
+    ("Zinc", "mg"),
+    ("Calcium", "mg"),
+    ("Vitamin B5", "mg"),
+    ("Selenium", "µg"),
+]
+# What the lean profile's nutrient filters report
+LEAN_NUTRIENTS = {"Calories", "Protein", "Carbohydrates", "Fat"}
+# Keys only present because of addRecipeNutrition / addRecipeInstructions
+FULL_ONLY_KEYS = {"analyzedInstructions", "nutrition"}
+
+
+def _nutrients(rng: random.Random, scale: float) -> list[dict[str, Any]]:
+    return [
+        {
+            "name": name,
+            "amount": round(rng.uniform(0, 100) * scale, 2),
+            "unit": unit,
+            "percentOfDailyNeeds": round(rng.uniform(0, 80), 2),
+        }
+        for name, unit in NUTRIENTS
+    ]
+
+
+def _ingredient(rng: random.Random, i: int) -> dict[str, Any]:
+    return {
+        "id": 10000 + i,
+        "amount": rng.choice([0.5, 1, 2, 3]),
+        "unit": rng.choice(["cup", "tbsp", "g", "cloves"]),
+        "unitLong": "cups",
+        "unitShort": "cup",
+        "aisle": "Produce",
+        "name": f"ingredient {i}",
+        "original": f"1 cup ingredient {i}, chopped",
+        "originalName": f"ingredient {i}, chopped",
+        "meta": ["chopped"],
+        "image": f"https://img.spoonacular.com/ingredients_100x100/{i}.jpg",
+    }
+
+
+def synthetic_full_result(rng: random.Random, n: int, meal_type: str) -> dict:
+    """One complexSearch result as returned with the full profile."""
+    calories = rng.randint(300, 900)
+    ingredients = [_ingredient(rng, i) for i in range(rng.randint(6, 14))]
+    nutrients = _nutrients(rng, 1.0)
+    nutrients[0]["amount"] = calories
+    return {
+        "id": 700000 + n,
+        "title": f"Synthetic {meal_type} {n}",
+        "image": f"https://img.spoonacular.com/recipes/{n}-312x231.jpg",
+        "imageType": "jpg",
+        "servings": rng.choice([1, 2, 4]),
+        "readyInMinutes": rng.choice([10, 20, 30, 45]),
+        "sourceUrl": f"https://example.com/recipes/{n}",
+        "summary": "A <b>synthetic</b> recipe with a long HTML summary. " * 8,
+        "cuisines": ["Italian"],
+        "dishTypes": [meal_type],
+        "diets": ["gluten free", "dairy free"],
+        "vegetarian": False,
+        "vegan": False,
+        "glutenFree": True,
+        "dairyFree": True,
+        "healthScore": rng.randint(0, 100),
+        "pricePerServing": round(rng.uniform(50, 400), 2),
+        "missedIngredientCount": len(ingredients),
+        "missedIngredients": ingredients,
+        "usedIngredients": [],
+        "unusedIngredients": [],
+        "nutrition": {
+            "nutrients": nutrients,
+            "properties": [
+                {"name": "Glycemic Index", "amount": 40.1, "unit": ""},
+                {"name": "Glycemic Load", "amount": 12.3, "unit": ""},
+            ],
+            "flavonoids": [
+                {"name": f"Flavonoid {f}", "amount": 0.0, "unit": "mg"}
+                for f in range(26)
+            ],
+            "ingredients": [
+                {
+                    "id": ing["id"],
+                    "name": ing["name"],
+                    "amount": ing["amount"],
+                    "unit": ing["unit"],
+                    "nutrients": _nutrients(rng, 0.1),
+                }
+                for ing in ingredients
+            ],
+            "caloricBreakdown": {
+                "percentProtein": 20.0,
+                "percentFat": 30.0,
+                "percentCarbs": 50.0,
+            },
+            "weightPerServing": {"amount": 350, "unit": "g"},
+        },
+        "analyzedInstructions": [
+            {
+                "name": "",
+                "steps": [
+                    {
+                        "number": s,
+                        "step": f"Step {s}: combine and cook until done. " * 2,
+                        "ingredients": [
+                            {"id": ing["id"], "name": ing["name"], "image": ""}
+                            for ing in ingredients[:3]
+                        ],
+                        "equipment": [{"id": 404784, "name": "oven", "image": ""}],
+                    }
+                    for s in range(1, 8)
+                ],
+            }
+        ],
+    }
+
+
+def lean_result(full: dict[str, Any]) -> dict[str, Any]:
+    """The same recipe as the lean profile returns it."""
+    lean = {k: v for k, v in full.items() if k not in FULL_ONLY_KEYS}
+    nutrients = full.get("nutrition", {}).get("nutrients", [])
+    lean["nutrition"] = {
+        "nutrients": [
+            {"name": n["name"], "amount": n["amount"], "unit": n.get("unit", "")}
+            for n in nutrients
+            if n["name"] in LEAN_NUTRIENTS
+        ]
+    }
+    return lean
+
+
+def load_full_pages(count: int) -> tuple[list[dict[str, Any]], str]:
+    paths = [_fixture_path(t) for t in RECORDED_TYPES]
+    if all(p.exists() for p in paths):
+        return [json.loads(p.read_bytes()) for p in paths], "recorded"
+    rng = random.Random(1)
+    pages = []
+    for meal_type in RECORDED_TYPES:
+        results = [synthetic_full_result(rng, n, meal_type.value) for n in range(count)]
+        pages.append({"results": results, "offset": 0, "number": count})
+    return pages, "synthetic"
+
+
+def _parsers() -> dict[str, Callable[[bytes], Any]]:
+    parsers: dict[str, Callable[[bytes], Any]] = {"json": json.loads}
+    try:
+        import orjson
+    except ImportError:
+        return parsers
+    parsers["orjson"] = orjson.loads
+    return parsers
+
+
+def _time(fn: Callable[[], Any], runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        # Collect outside the timed region; parsing a page allocates heavily
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run(runs: int, count: int) -> dict[str, Any]:
+    full_pages, source = load_full_pages(count)
+    profiles = {
+        "full": full_pages,
+        "lean": [
+            {**page, "results": [lean_result(r) for r in page["results"]]}
+            for page in full_pages
+        ],
+    }
+    report: dict[str, Any] = {"source": source, "recipes_per_page": count}
+    for profile, pages in profiles.items():
+        bodies = [json.dumps(page).encode() for page in pages]
+        entry: dict[str, Any] = {
+            "bytes_per_page": round(sum(len(b) for b in bodies) / len(bodies)),
+        }
+        for name, parse in _parsers().items():
+            entry[f"parse_{name}"] = summarize_us(
+                _time(
+                    lambda parse=parse, bodies=bodies: [parse(b) for b in bodies],
+                    runs,
+                )
+            )
+        results = [r for page in pages for r in page["results"]]
+        entry["convert"] = summarize_us(
+            _time(
+                lambda results=results: [
+                    MealPlanService._convert_to_recipe(r) for r in results
+                ],
+                runs,
+            )
+        )
+        report[profile] = entry
+
+    full, lean = report["full"], report["lean"]
+    report["lean_vs_full"] = {
+        "bytes": round(lean["bytes_per_page"] / full["bytes_per_page"], 3),
+        "parse_json": round(
+            lean["parse_json"]["p50_us"] / full["parse_json"]["p50_us"], 3
+        ),
+    }
+    if "parse_orjson" in lean:
+        report["lean_vs_full"]["lean_orjson_vs_full_json"] = round(
+            lean["parse_orjson"]["p50_us"] / full["parse_json"]["p50_us"], 3
+        )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument(
+        "--recipes", type=int, default=100, help="recipes per synthetic page"
+    )
+    parser.add_argument("--output", type=Path, help="also write the report here")
+    args = parser.parse_args()
+
+    output = json.dumps(run(args.runs, args.recipes), indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Helpers shared by the benchmark scripts in this package.
+
+Benchmarks are plain scripts, run from backend/ with e.g.
+
+    DATABASE_URL=... python -m benchmarks.bench_plan_persistence
+
+and print a JSON report to stdout. They are not collected by pytest.
+"""
+
+import statistics
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import ExecuteStyle
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Register every mapped class so relationships resolve outside the app
+from app.models.dietary import UserAllergy  # noqa: F401
+from app.models.google_calendar import GoogleCalendarConnection  # noqa: F401
+from app.models.meal import Meal  # noqa: F401
+from app.models.progress import UserWeightLog  # noqa: F401
+from app.models.schedule import ScheduleItem  # noqa: F401
+from app.models.user import User  # noqa: F401
+
+
+def driver_executions(parameters: Any, context: Any) -> int:
+    """Times the driver runs a statement: once per parameter set for executemany."""
+    if context is not None and context.execute_style is ExecuteStyle.EXECUTEMANY:
+        return len(parameters)
+    return 1
+
+
+class StatementCounter:
+    """
+    Counts the statements an engine sends to the database while active.
+
+    count is what SQLAlchemy hands the driver. A plain executemany counts
+    once there, but the driver still executes the statement once per
+    parameter set, so executions counts those individually. Multi-row
+    INSERT ... VALUES batches are a single execution.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.count = 0
+        self.executions = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.executions += driver_executions(parameters, context)
+
+    def __enter__(self) -> "StatementCounter":
+        self.count = 0
+        self.executions = 0
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        event.remove(self.engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+
+def _summarize(samples: list[float], scale: float, unit: str) -> dict[str, Any]:
+    ordered = sorted(samples)
+
+    def percentile(q: float) -> float:
+        return ordered[max(0, int(round(q * len(ordered))) - 1)]
+
+    return {
+        "runs": len(ordered),
+        f"p50_{unit}": round(statistics.median(ordered) * scale, 2),
+        f"p95_{unit}": round(percentile(0.95) * scale, 2),
+        f"p99_{unit}": round(percentile(0.99) * scale, 2),
+        f"mean_{unit}": round(statistics.fmean(ordered) * scale, 2),
+    }
+
+
+def summarize_ms(samples: list[float]) -> dict[str, Any]:
+    """p50 / p95 / p99 / mean of latency samples in seconds, in milliseconds."""
+    return _summarize(samples, 1e3, "ms")
+
+
+def summarize_us(samples: list[float]) -> dict[str, Any]:
+    """p50 / p95 / p99 / mean of latency samples in seconds, in microseconds."""
+    return _summarize(samples, 1e6, "us")
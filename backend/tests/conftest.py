@@ -23,10 +23,19 @@ from app.models.dietary import (  # noqa: F401 — registers models with Base.me
 from app.models.meal import Meal, ScheduleItemAlternative  # noqa: F401
 from app.models.schedule import ScheduleItem  # noqa: F401
 from app.models.user import User
+from app.schemas.user import UserRead
 
 MOCK_USER_ID = "test_clerk_user_id"
 
 
+@pytest.fixture(autouse=True)
+def clear_user_profile_cache():
+    """The profile cache is process-wide; never let it leak between tests."""
+    deps._profile_cache.clear()
+    yield
+    deps._profile_cache.clear()
+
+
 @pytest_asyncio.fixture
 async def engine():
     if not settings.DATABASE_URL:
@@ -121,8 +130,15 @@ async def client(
     async def override_get_current_user():
         return mock_user
 
+    async def override_get_current_user_profile():
+        return UserRead.model_validate(mock_user)
+
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[deps.get_current_user] = override_get_current_user
+    app.dependency_overrides[deps.get_current_user_profile] = (
+        override_get_current_user_profile
+    )
+    app.dependency_overrides[deps.get_current_user_id] = lambda: mock_user.id
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -0,0 +1,97 @@
+"""In-process fake of the Spoonacular API for tests.
+
+Serves /recipes/complexSearch with quota bookkeeping modelled on the real
+API: every request costs points, X-API-Quota-Request / -Used / -Left are
+returned on each response, and once the daily quota is spent requests are
+answered 402. Rate limiting can be simulated by queueing 429 responses.
+
+Use it through the shared HTTP client so SpoonacularClient is unchanged:
+
+    async with fake.installed():
+        await SpoonacularClient(api_key="k").search_recipes(number=5)
+"""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core import http
+from tests.test_meal_plan import _make_spoonacular_response
+
+
+class FakeSpoonacular:
+    def __init__(
+        self,
+        daily_quota: float = 150.0,
+        points_per_request: float = 1.0,
+        points_per_result: float = 0.01,
+    ):
+        self.daily_quota = daily_quota
+        self.points_per_request = points_per_request
+        self.points_per_result = points_per_result
+        self.quota_used = 0.0
+        # Status codes to answer with (before any quota check), in order
+        self.queued_errors: list[int] = []
+        self.retry_after: str | None = None
+        self.requests: list[dict[str, Any]] = []
+
+        self.app = FastAPI()
+        self.app.get("/recipes/complexSearch")(self._complex_search)
+
+    def exhaust(self) -> None:
+        self.quota_used = self.daily_quota
+
+    def _quota_headers(self, cost: float) -> dict[str, str]:
+        return {
+            "X-API-Quota-Request": f"{cost:g}",
+            "X-API-Quota-Used": f"{self.quota_used:g}",
+            "X-API-Quota-Left": f"{max(0.0, self.daily_quota - self.quota_used):g}",
+        }
+
+    async def _complex_search(self, request: Request) -> JSONResponse:
+        params = dict(request.query_params)
+        self.requests.append(params)
+
+        if self.queued_errors:
+            status_code = self.queued_errors.pop(0)
+            headers = self._quota_headers(0)
+            if status_code == 429 and self.retry_after is not None:
+                headers["Retry-After"] = self.retry_after
+            return JSONResponse({"status": "failure"}, status_code, headers=headers)
+
+        if self.quota_used >= self.daily_quota:
+            return JSONResponse(
+                {"status": "failure", "message": "Your daily points limit is reached"},
+                402,
+                headers=self._quota_headers(0),
+            )
+
+        number = int(params.get("number", 10))
+        offset = int(params.get("offset", 0))
+        calories = int(params.get("minCalories", 400))
+        results = [
+            _make_spoonacular_response(i, f"Recipe {i}", calories + i % 50, 30, 60, 15)
+            for i in range(offset + 1, offset + number + 1)
+        ]
+        cost = self.points_per_request + self.points_per_result * number
+        self.quota_used += cost
+        return JSONResponse(
+            {"results": results, "offset": offset, "number": number},
+            headers=self._quota_headers(cost),
+        )
+
+    @asynccontextmanager
+    async def installed(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Route the shared outbound HTTP client to this fake."""
+        previous = http._client
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app))
+        http._client = client
+        try:
+            yield client
+        finally:
+            http._client = previous
+            await client.aclose()
@@ -0,0 +1,64 @@
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.main import app
+from app.schemas.meal_plan import BatchWeekPlanResult
+
+URL = "/api/v1/admin/meal-plans/generate-week"
+BODY = {"user_ids": ["u1", "u2"], "week_start_date": "2025-06-02"}
+
+
+@pytest.fixture
+async def admin_client(monkeypatch) -> AsyncClient:
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "secret")
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        yield ac
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_batch_generate_requires_admin_key(admin_client, monkeypatch):
+    assert (await admin_client.post(URL, json=BODY)).status_code == 403
+    response = await admin_client.post(
+        URL, json=BODY, headers={"X-Admin-API-Key": "wrong"}
+    )
+    assert response.status_code == 403
+
+    # No key configured: the admin API is closed to everyone
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    response = await admin_client.post(URL, json=BODY, headers={"X-Admin-API-Key": ""})
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_batch_generate_runs_service(admin_client):
+    headers = {"X-Admin-API-Key": "secret"}
+    response = await admin_client.post(
+        URL, json={**BODY, "week_start_date": "2025-06-03"}, headers=headers
+    )
+    assert response.status_code == 400
+
+    result = BatchWeekPlanResult(
+        week_start_date=date(2025, 6, 2),
+        succeeded=2,
+        failed=0,
+        recipe_pool_fetches=2,
+        results=[],
+    )
+    with patch("app.api.endpoints.admin.BatchMealPlanService") as service:
+        service.return_value.generate_week = AsyncMock(return_value=result)
+        response = await admin_client.post(URL, json=BODY, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 2
+    _, user_ids, week_start = service.return_value.generate_week.await_args.args
+    assert user_ids == ["u1", "u2"]
+    assert week_start == date(2025, 6, 2)
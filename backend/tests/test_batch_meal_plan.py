@@ -0,0 +1,101 @@
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import func, select
+
+from app.domain.enums import ActivityLevel, ActivityType, PregnancyStatus, Sex
+from app.models.schedule import ScheduleItem
+from app.models.user import User
+from app.services.batch_meal_plan import BatchMealPlanService
+from tests.test_meal_plan import _make_spoonacular_response
+
+MONDAY = date(2025, 6, 2)
+
+
+def _pool_client(fail_vegan: bool = False) -> AsyncMock:
+    breakfast_pool = [
+        _make_spoonacular_response(i, f"Breakfast {i}", 500 + i * 5, 20, 70, 12)
+        for i in range(1, 7)
+    ]
+    main_pool = [
+        _make_spoonacular_response(1000 + i, f"Main {i}", 700 + i * 3, 40, 55, 22)
+        for i in range(1, 51)
+    ]
+
+    def search_recipes_side_effect(**kwargs):
+        if fail_vegan and kwargs["constraints"].is_vegan:
+            raise RuntimeError("Spoonacular unavailable")
+        if "breakfast" in str(kwargs.get("type")).lower():
+            return list(breakfast_pool)
+        return list(main_pool)
+
+    client = AsyncMock()
+    client.search_recipes = AsyncMock(side_effect=search_recipes_side_effect)
+    return client
+
+
+@pytest.fixture
+async def batch_users(db, mock_user):
+    """mock_user, a twin with the same profile, and a vegan with the same body."""
+    for user_id, is_vegan in (("batch_twin", False), ("batch_vegan", True)):
+        db.add(
+            User(
+                id=user_id,
+                email=f"{user_id}@sophros.com",
+                age=mock_user.age,
+                weight=mock_user.weight,
+                height=mock_user.height,
+                show_imperial=False,
+                gender=Sex.MALE,
+                activity_level=ActivityLevel.MODERATE,
+                pregnancy_status=PregnancyStatus.NOT_PREGNANT,
+                is_vegan=is_vegan,
+            )
+        )
+    await db.commit()
+    return [mock_user.id, "batch_twin", "batch_vegan"]
+
+
+async def _meal_items(db, user_id: str) -> int:
+    result = await db.execute(
+        select(func.count())
+        .select_from(ScheduleItem)
+        .where(
+            ScheduleItem.user_id == user_id,
+            ScheduleItem.activity_type == ActivityType.MEAL,
+        )
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_batch_shares_pools_within_dietary_groups(db, batch_users):
+    client = _pool_client()
+    service = BatchMealPlanService(spoonacular_client=client, persist_chunk_size=2)
+
+    result = await service.generate_week(db, [*batch_users, "missing"], MONDAY)
+
+    assert [r.user_id for r in result.results] == [*batch_users, "missing"]
+    assert (result.succeeded, result.failed) == (3, 1)
+    assert result.results[-1].error == "User not found"
+    # Two groups (omnivore twins, vegan) x (breakfast, main) pools
+    assert result.recipe_pool_fetches == 4
+    assert client.search_recipes.await_count == 4
+    for user_id, user_result in zip(batch_users, result.results, strict=False):
+        assert user_result.scheduled_meals == 21
+        assert await _meal_items(db, user_id) == 21
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_planning_failures_per_user(db, batch_users):
+    service = BatchMealPlanService(spoonacular_client=_pool_client(fail_vegan=True))
+
+    result = await service.generate_week(db, batch_users, MONDAY)
+
+    by_user = {r.user_id: r for r in result.results}
+    assert not by_user["batch_vegan"].success
+    assert "Spoonacular unavailable" in by_user["batch_vegan"].error
+    assert by_user["batch_twin"].success
+    assert await _meal_items(db, "batch_vegan") == 0
+    assert await _meal_items(db, "batch_twin") == 21
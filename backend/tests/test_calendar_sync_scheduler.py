@@ -0,0 +1,178 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.enums import ActivityLevel, PregnancyStatus, Sex
+from app.models.google_calendar import GoogleCalendarConnection
+from app.models.user import User
+from app.schemas.google_calendar import GoogleCalendarSyncResult
+from app.services.calendar_sync_scheduler import (
+    ADVISORY_LOCK_NAMESPACE,
+    CalendarSyncScheduler,
+    due_connection_ids,
+    retry_delay_seconds,
+)
+from app.services.clerk_oauth import ClerkOAuthError
+
+STALE_AFTER = 1800.0
+
+
+@pytest.fixture
+def session_factory(engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    )
+
+
+async def _connection(db, user_id: str, **kwargs) -> GoogleCalendarConnection:
+    if await db.get(User, user_id) is None:
+        db.add(
+            User(
+                id=user_id,
+                email=f"{user_id}@example.com",
+                age=30,
+                weight=75.0,
+                height=175.0,
+                show_imperial=False,
+                gender=Sex.MALE,
+                activity_level=ActivityLevel.MODERATE,
+                pregnancy_status=PregnancyStatus.NOT_PREGNANT,
+            )
+        )
+        await db.flush()
+    kwargs.setdefault("sync_status", "synced")
+    connection = GoogleCalendarConnection(
+        user_id=user_id, google_account_email=f"{user_id}@example.com", **kwargs
+    )
+    db.add(connection)
+    await db.commit()
+    return connection
+
+
+def _scheduler(session_factory, service=None, clerk=None) -> CalendarSyncScheduler:
+    if service is None:
+        service = MagicMock()
+        service.sync_for_user = AsyncMock(
+            return_value=GoogleCalendarSyncResult(synced_count=0, sync_batch_id="b")
+        )
+    if clerk is None:
+        clerk = MagicMock()
+        clerk.get_google_access_token = AsyncMock(return_value="google-token")
+    return CalendarSyncScheduler(
+        session_factory,
+        concurrency=2,
+        stale_after_seconds=STALE_AFTER,
+        jitter_seconds=0,
+        backoff_base_seconds=60,
+        backoff_max_seconds=600,
+        service_factory=lambda: service,
+        clerk_factory=lambda: clerk,
+    )
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert [retry_delay_seconds(n, 60, 600) for n in range(1, 6)] == [
+        60,
+        120,
+        240,
+        480,
+        600,
+    ]
+    assert retry_delay_seconds(10_000, 60, 600) == 600
+
+
+@pytest.mark.asyncio
+async def test_due_connections_are_past_their_next_sync(db, mock_user):
+    now = datetime.now(UTC)
+    never = await _connection(db, mock_user.id, next_sync_at=None)
+    due = await _connection(db, "due_user", next_sync_at=now - timedelta(minutes=1))
+    overdue = await _connection(
+        db, "overdue_user", next_sync_at=now - timedelta(hours=2)
+    )
+    await _connection(db, "fresh_user", next_sync_at=now + timedelta(minutes=25))
+    await _connection(
+        db,
+        "backoff_user",
+        last_synced_at=now - timedelta(hours=3),
+        sync_status="failed",
+        next_sync_at=now + timedelta(minutes=10),
+    )
+
+    assert await due_connection_ids(db, now, 10) == [never.id, overdue.id, due.id]
+    assert await due_connection_ids(db, now, 2) == [never.id, overdue.id]
+
+
+@pytest.mark.asyncio
+async def test_run_once_syncs_due_connections_and_backs_off_failures(
+    db, mock_user, session_factory
+):
+    ok = await _connection(db, mock_user.id, utc_offset_minutes=-240)
+    broken = await _connection(db, "broken_user")
+
+    clerk = MagicMock()
+
+    async def token(user_id: str, refresh: bool = False) -> str:
+        assert refresh
+        if user_id == "broken_user":
+            raise ClerkOAuthError("Google account is not connected in Clerk")
+        return "google-token"
+
+    clerk.get_google_access_token = AsyncMock(side_effect=token)
+    service = MagicMock()
+    service.sync_for_user = AsyncMock(
+        return_value=GoogleCalendarSyncResult(synced_count=0, sync_batch_id="b")
+    )
+    scheduler = _scheduler(session_factory, service, clerk)
+
+    assert await scheduler.run_once() == {"synced": 1, "failed": 1}
+    service.sync_for_user.assert_awaited_once()
+    synced_connection, token_arg, _, offset = service.sync_for_user.await_args.args
+    assert (synced_connection.id, token_arg, offset) == (ok.id, "google-token", -240)
+
+    now = datetime.now(UTC)
+    async with session_factory() as session:
+        ok_row = await session.get(GoogleCalendarConnection, ok.id)
+        broken_row = await session.get(GoogleCalendarConnection, broken.id)
+    assert ok_row.sync_failures == 0
+    assert ok_row.token_valid_at is not None
+    assert ok_row.needs_reconnect is False
+    assert ok_row.next_sync_at > now + timedelta(seconds=STALE_AFTER - 60)
+    assert broken_row.sync_status == "failed"
+    assert broken_row.sync_failures == 1
+    # Clerk refused the token: /status reports the connection as broken
+    assert broken_row.needs_reconnect is True
+    assert now < broken_row.next_sync_at <= now + timedelta(seconds=60)
+
+    # Nothing is due until the next sync time or the backoff passes
+    assert await scheduler.run_once() == {}
+
+
+@pytest.mark.asyncio
+async def test_sync_skips_a_connection_locked_by_another_instance(
+    db, mock_user, session_factory
+):
+    connection = await _connection(db, mock_user.id)
+    scheduler = _scheduler(session_factory)
+
+    async with session_factory() as holder:
+        assert await holder.scalar(
+            select(
+                func.pg_try_advisory_xact_lock(ADVISORY_LOCK_NAMESPACE, connection.id)
+            )
+        )
+        assert await scheduler.sync_connection(connection.id) == "skipped"
+
+    assert await scheduler.sync_connection(connection.id) == "synced"
+    # Synced: no longer due
+    assert await scheduler.sync_connection(connection.id) == "skipped"
+
+    # The session-level lock is released once the sync is done
+    async with session_factory() as other:
+        assert await other.scalar(
+            select(
+                func.pg_try_advisory_xact_lock(ADVISORY_LOCK_NAMESPACE, connection.id)
+            )
+        )
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.core import http
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.services.clerk_oauth import (
+    ClerkOAuthError,
+    ClerkOAuthService,
+    is_token_rejected,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeClerk:
+    """Answers oauth_access_tokens lookups; counts the requests it gets."""
+
+    def __init__(self, expires_in: float | None = 3600):
+        self.requests = 0
+        self.status_code = 200
+        self.expires_in = expires_in
+        self.delay = 0.0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code, json={"errors": []})
+        token = {"token": f"google-token-{self.requests}"}
+        if self.expires_in is not None:
+            token["expires_at"] = int(time.time() + self.expires_in)
+        return httpx.Response(200, json=[token])
+
+
+@pytest.fixture
+def clerk():
+    fake = FakeClerk()
+    previous = http._client
+    http._client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    with patch.object(settings, "CLERK_SECRET_KEY", "sk_test"):
+        yield fake
+    http._client = previous
+
+
+def _service(clock: FakeClock | None = None) -> ClerkOAuthService:
+    return ClerkOAuthService(
+        cache=TTLCache(max_entries=10, ttl_seconds=1800, clock=clock or time.time),
+        flight=SingleFlight(),
+        clock=clock or time.time,
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_is_cached_until_shortly_before_it_expires(clerk):
+    clock = FakeClock(time.time())
+    service = _service(clock)
+
+    assert await service.get_google_access_token("user_1") == "google-token-1"
+    assert await service.get_google_access_token("user_1") == "google-token-1"
+    assert clerk.requests == 1
+
+    # Within the expiry margin the token is fetched again
+    clock.now += 3600 - settings.CLERK_OAUTH_TOKEN_EXPIRY_MARGIN_SECONDS + 1
+    assert await service.get_google_access_token("user_1") == "google-token-2"
+    assert clerk.requests == 2
+
+    # A token Google rejected is dropped
+    service.invalidate_google_access_token("user_1")
+    assert await service.get_google_access_token("user_1") == "google-token-3"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_clerk_request(clerk):
+    clerk.delay = 0.05
+    service = _service()
+
+    tokens = await asyncio.gather(
+        *(service.get_google_access_token("user_1") for _ in range(5))
+    )
+
+    assert tokens == ["google-token-1"] * 5
+    assert clerk.requests == 1
+    assert service.flight.stats.coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_refused_lookup_and_missing_expiry_are_not_cached(clerk):
+    clock = FakeClock(time.time())
+    service = _service(clock)
+    await service.get_google_access_token("user_1")
+
+    clerk.status_code = 403
+    clock.now += 3600
+    with pytest.raises(ClerkOAuthError):
+        await service.get_google_access_token("user_1")
+    assert "user_1" not in service.cache
+
+    clerk.status_code = 200
+    clerk.expires_in = None
+    await service.get_google_access_token("user_1")
+    await service.get_google_access_token("user_1")
+    assert clerk.requests == 4
+
+
+def test_token_rejected_only_for_auth_failures():
+    request = httpx.Request("POST", "https://www.googleapis.com/calendar/v3/freeBusy")
+
+    def error(status_code: int) -> httpx.HTTPStatusError:
+        response = httpx.Response(status_code, request=request)
+        return httpx.HTTPStatusError("error", request=request, response=response)
+
+    assert is_token_rejected(error(401))
+    assert is_token_rejected(error(403))
+    assert not is_token_rejected(error(500))
+    assert not is_token_rejected(ValueError("calendar error"))
@@ -9,6 +9,7 @@ from app.db.session import get_db
 from app.domain.enums import ActivityLevel, PregnancyStatus, Sex
 from app.main import app
 from app.models.google_calendar import GoogleCalendarConnection
+from app.schemas.google_calendar import GoogleCalendarSyncResult
 from app.services.clerk_oauth import ClerkOAuthError
 
 BASE = "/api/v1/calendar/google"
@@ -57,6 +58,7 @@ async def mock_google_calendar_client() -> AsyncClient:
 
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[deps.get_current_user] = override_get_current_user
+    app.dependency_overrides[deps.get_current_user_id] = lambda: mock_user.id
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -80,7 +82,9 @@ async def test_connect_calendar_creates_connection(mock_google_calendar_client):
         assert utc_offset_minutes == 0
         connection.last_synced_at = datetime(2026, 4, 26, 12, 0, tzinfo=UTC)
         connection.sync_status = "synced"
-        return 7, "batch-123"
+        return GoogleCalendarSyncResult(
+            synced_count=7, sync_batch_id="batch-123", added=7
+        )
 
     mock_service.sync_for_user = AsyncMock(side_effect=sync_side_effect)
 
@@ -99,8 +103,14 @@ async def test_connect_calendar_creates_connection(mock_google_calendar_client):
     ):
         response = await mock_google_calendar_client.post(f"{BASE}/connect")
 
+    mock_clerk.get_google_access_token.assert_awaited_once_with(
+        "test_user_id", refresh=True
+    )
     assert response.status_code == 200
-    assert response.json() == {
+    body = response.json()
+    # Clerk just provided a token
+    assert body.pop("token_valid_at") is not None
+    assert body == {
         "connected": True,
         "email": "calendar@example.com",
         "last_synced_at": "2026-04-26T12:00:00Z",
@@ -135,3 +145,128 @@ async def test_connect_calendar_returns_409_when_clerk_has_no_google_token(
 
     assert response.status_code == 409
     assert "Google account is not connected in Clerk" in response.json()["detail"]
+
+
+def _stored_connection(**kwargs) -> GoogleCalendarConnection:
+    return GoogleCalendarConnection(
+        user_id="test_user_id",
+        google_account_email="calendar@example.com",
+        last_synced_at=datetime(2026, 4, 26, 12, 0, tzinfo=UTC),
+        sync_status="synced",
+        needs_reconnect=False,
+        token_valid_at=datetime(2026, 4, 26, 12, 0, tzinfo=UTC),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_status_is_served_from_the_connection_row_with_an_etag(
+    mock_google_calendar_client,
+):
+    mock_db = mock_google_calendar_client.mock_db
+    mock_db.execute.return_value.value = _stored_connection()
+    mock_clerk = MagicMock()
+    mock_clerk.get_google_access_token = AsyncMock()
+
+    with patch(
+        "app.api.endpoints.google_calendar._get_clerk_oauth_service",
+        return_value=mock_clerk,
+    ):
+        response = await mock_google_calendar_client.get(f"{BASE}/status")
+        assert response.status_code == 200
+        assert response.json()["connected"] is True
+        etag = response.headers["ETag"]
+
+        unchanged = await mock_google_calendar_client.get(
+            f"{BASE}/status", headers={"If-None-Match": etag}
+        )
+        assert unchanged.status_code == 304
+        assert unchanged.headers["ETag"] == etag
+
+        # A recorded failed check changes the status and its ETag
+        mock_db.execute.return_value.value.needs_reconnect = True
+        changed = await mock_google_calendar_client.get(
+            f"{BASE}/status", headers={"If-None-Match": etag}
+        )
+
+    mock_clerk.get_google_access_token.assert_not_awaited()
+    assert changed.status_code == 200
+    assert changed.json()["connected"] is False
+    assert changed.json()["needs_reconnect"] is True
+    assert changed.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_status_verify_checks_clerk_and_records_the_result(
+    mock_google_calendar_client,
+):
+    mock_db = mock_google_calendar_client.mock_db
+    connection = _stored_connection()
+    mock_db.execute.return_value.value = connection
+    mock_clerk = MagicMock()
+    mock_clerk.get_google_access_token = AsyncMock(
+        side_effect=ClerkOAuthError("Google account is not connected in Clerk")
+    )
+
+    with patch(
+        "app.api.endpoints.google_calendar._get_clerk_oauth_service",
+        return_value=mock_clerk,
+    ):
+        response = await mock_google_calendar_client.get(
+            f"{BASE}/status", params={"verify": "true"}
+        )
+
+    mock_clerk.get_google_access_token.assert_awaited_once_with(
+        "test_user_id", refresh=True
+    )
+    assert response.status_code == 200
+    assert response.json()["needs_reconnect"] is True
+    assert connection.needs_reconnect is True
+    assert connection.sync_status == "failed"
+    mock_db.commit.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_sync_records_token_health_only_when_clerk_was_asked(
+    mock_google_calendar_client,
+):
+    mock_db = mock_google_calendar_client.mock_db
+    connection = _stored_connection()
+    checked_at = connection.token_valid_at
+    mock_db.execute.return_value.value = connection
+    mock_service = MagicMock()
+    mock_service.sync_for_user = AsyncMock(
+        return_value=GoogleCalendarSyncResult(synced_count=0, sync_batch_id="b")
+    )
+    mock_clerk = MagicMock()
+    mock_clerk.get_google_access_token = AsyncMock(return_value="google-token")
+
+    with (
+        patch(
+            "app.api.endpoints.google_calendar._get_service",
+            return_value=mock_service,
+        ),
+        patch(
+            "app.api.endpoints.google_calendar._get_clerk_oauth_service",
+            return_value=mock_clerk,
+        ),
+    ):
+        # A possibly cached token is not a health check
+        response = await mock_google_calendar_client.post(f"{BASE}/sync")
+        assert response.status_code == 200
+        mock_clerk.get_google_access_token.assert_awaited_once_with(
+            "test_user_id", refresh=False
+        )
+        assert connection.token_valid_at == checked_at
+
+        # A connection flagged as broken is verified with Clerk
+        connection.needs_reconnect = True
+        mock_clerk.get_google_access_token.reset_mock()
+        response = await mock_google_calendar_client.post(f"{BASE}/sync")
+
+    assert response.status_code == 200
+    mock_clerk.get_google_access_token.assert_awaited_once_with(
+        "test_user_id", refresh=True
+    )
+    assert connection.needs_reconnect is False
+    assert connection.token_valid_at > checked_at
@@ -0,0 +1,88 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.domain.enums import ActivityType
+from app.models.google_calendar import GoogleCalendarConnection
+from app.models.schedule import ScheduleItem
+from app.services.google_calendar import GoogleCalendarService
+
+
+def _busy(days: int, hour: int, minutes: int = 60) -> dict[str, str]:
+    start = datetime.now(UTC).replace(
+        hour=hour, minute=0, second=0, microsecond=0
+    ) + timedelta(days=days)
+    end = start + timedelta(minutes=minutes)
+    return {
+        "start": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "end": end.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+async def _stored(db, user_id: str) -> list[tuple[int, datetime, int]]:
+    result = await db.execute(
+        select(ScheduleItem.id, ScheduleItem.date, ScheduleItem.duration_minutes)
+        .where(
+            ScheduleItem.user_id == user_id,
+            ScheduleItem.source_type == "google_calendar",
+        )
+        .order_by(ScheduleItem.date)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.asyncio
+async def test_sync_only_writes_busy_blocks_that_changed(db, mock_user):
+    connection = GoogleCalendarConnection(
+        user_id=mock_user.id,
+        google_account_email="calendar@example.com",
+        sync_status="pending",
+    )
+    db.add(connection)
+    await db.commit()
+    service = GoogleCalendarService()
+    blocks = [_busy(1, 9), _busy(1, 14, 30), _busy(3, 18, 90)]
+
+    async def sync(busy: list[dict[str, str]]):
+        with patch.object(
+            service, "fetch_freebusy", AsyncMock(return_value={"primary": busy})
+        ):
+            return await service.sync_for_user(connection, "token", db)
+
+    first = await sync(blocks)
+    assert (first.synced_count, first.added, first.removed, first.unchanged) == (
+        3,
+        3,
+        0,
+        0,
+    )
+    assert connection.sync_status == "synced"
+    rows = await _stored(db, mock_user.id)
+    assert [duration for _, _, duration in rows] == [60, 30, 90]
+    item = await db.get(ScheduleItem, rows[0][0])
+    assert item.activity_type == ActivityType.OTHER
+    assert item.source_calendar_id == "primary"
+    assert (item.prep_time_minutes, item.is_completed) == (0, False)
+
+    # Nothing changed: busy blocks keep their rows, but the check still
+    # counts as a sync
+    first_synced_at = connection.last_synced_at
+    repeat = await sync(blocks)
+    assert (repeat.added, repeat.removed, repeat.unchanged) == (0, 0, 3)
+    assert await _stored(db, mock_user.id) == rows
+    assert connection.last_synced_at > first_synced_at
+
+    # One block moved, one vanished; the untouched block keeps its row
+    moved = await sync([blocks[0], _busy(2, 14, 30)])
+    assert (moved.synced_count, moved.added, moved.removed, moved.unchanged) == (
+        2,
+        1,
+        2,
+        1,
+    )
+    after = await _stored(db, mock_user.id)
+    assert len(after) == 2
+    assert after[0] == rows[0]
+    assert after[1][0] not in {row_id for row_id, _, _ in rows}
@@ -0,0 +1,57 @@
+import pytest
+
+from app.core import http
+from app.core.http import (
+    close_http_client,
+    http_client,
+    init_http_client,
+    pool_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+async def reset_pool():
+    await close_http_client()
+    pool_stats.hits = 0
+    pool_stats.misses = 0
+    yield
+    await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_http_client_without_pool_is_a_miss():
+    async with http_client() as client:
+        assert client is not http._client
+
+    assert client.is_closed
+    assert pool_stats.as_dict() == {"hits": 0, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_http_client_reuses_shared_pool():
+    shared = await init_http_client()
+
+    async with http_client() as first:
+        pass
+    async with http_client() as second:
+        pass
+
+    assert first is shared
+    assert second is shared
+    # The shared client stays open between uses
+    assert not shared.is_closed
+    assert pool_stats.as_dict() == {"hits": 2, "misses": 0}
+
+
+@pytest.mark.asyncio
+async def test_init_http_client_is_idempotent_and_close_resets():
+    first = await init_http_client()
+    second = await init_http_client()
+    assert first is second
+
+    await close_http_client()
+    assert first.is_closed
+
+    async with http_client():
+        pass
+    assert pool_stats.misses == 1
@@ -0,0 +1,81 @@
+import numpy as np
+
+from app.domain.enums import MealSlot
+from app.schemas.meal_plan import MealSlotTarget
+from app.services.macro_scoring import (
+    RankedPool,
+    deviation_matrix,
+    macro_matrix,
+    slot_deviation,
+)
+from app.services.meal_plan import MealPlanService
+from app.services.recipe_pool import PoolRecipe
+
+
+def _recipe(recipe_id: int | None, calories: int, protein: int = 30) -> PoolRecipe:
+    return PoolRecipe(
+        id=recipe_id,
+        title=f"Recipe {recipe_id}",
+        calories=calories,
+        protein=protein,
+        carbohydrates=calories // 8,
+        fat=calories // 36,
+    )
+
+
+def _slot(calories: int, protein: int = 30) -> MealSlotTarget:
+    return MealSlotTarget(
+        slot_name=MealSlot.LUNCH,
+        calories=calories,
+        protein=protein,
+        carbohydrates=calories // 8,
+        fat=calories // 36,
+    )
+
+
+def test_deviation_matrix_matches_per_recipe_scoring():
+    recipes = [_recipe(1, 500), _recipe(2, 900, 60), _recipe(3, 0, 0)]
+    slots = [_slot(600), _slot(800, 50), _slot(0, 0)]
+
+    matrix = deviation_matrix(macro_matrix(recipes), macro_matrix(slots))
+
+    assert matrix.shape == (3, 3)
+    expected = [[slot_deviation(r, s) for r in recipes] for s in slots]
+    assert np.allclose(matrix, expected)
+    # Perfect fit scores zero
+    assert slot_deviation(_recipe(9, 800, 50), _slot(800, 50)) == 0
+
+
+def test_ranked_pool_takes_best_fits_and_respects_shared_used_ids():
+    used_ids = {2}
+    pool = RankedPool(
+        [
+            _recipe(1, 1200),
+            _recipe(2, 610),
+            _recipe(3, 640),
+            _recipe(3, 640),
+            _recipe(None, 590),
+            _recipe(4, 700),
+        ],
+        used_ids,
+    )
+
+    assert [r.id for r in pool.rank(_slot(600), 3)] == [None, 3, 4]
+    assert [r.id for r in pool.take(_slot(600), 2)] == [None, 3]
+    assert used_ids == {2, 3}
+    # Taken elsewhere after the pool was built
+    used_ids.add(4)
+    assert [r.id for r in pool.take(_slot(600), 3)] == [1]
+    assert pool.take(_slot(600), 3) == []
+
+
+def test_assign_slot_recipes_from_a_ranked_pool_picks_the_closest_fit():
+    pool = RankedPool([_recipe(i, 300 + 100 * i) for i in range(1, 10)])
+    slot = _slot(750)
+
+    MealPlanService._assign_slot_recipes(slot, pool)
+
+    assert slot.plan is not None
+    assert slot.plan.main_recipe.id == "4"
+    assert [a.id for a in slot.plan.alternatives] == ["5", "3"]
+    assert pool.used_ids == {3, 4, 5}
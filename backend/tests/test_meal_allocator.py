@@ -1,8 +1,10 @@
+import random
 from datetime import time
 
 from app.schemas.meal_plan import MealDistributionConfig, MealSlot
 from app.schemas.nutrient import DRIOutput, NutrientRange
 from app.schemas.user import BusyTime, UserSchedule
+from app.services.free_intervals import FreeIntervalIndex
 from app.services.meal_allocator import MealAllocator
 
 
@@ -99,3 +101,58 @@ def test_allocate_with_schedule():
 
     assert dinner.time is not None
     assert dinner.time >= time(19, 30)
+
+
+def _scan_first_fit(busy, start, end, duration):
+    """The per-candidate busy-block scan the allocator used before the index."""
+    busy = sorted(busy)
+    current = start
+    while current + duration <= end:
+        for b_start, b_end in busy:
+            if current < b_end and current + duration > b_start:
+                current = max(current, b_end)
+                break
+        else:
+            return current
+    return None
+
+
+def test_free_interval_index_matches_scan():
+    rng = random.Random(7)
+    for _ in range(300):
+        busy = []
+        for _ in range(rng.randint(0, 200)):
+            start = rng.randint(0, 1400)
+            busy.append((start, start + rng.randint(1, 90)))
+        meal_buffers = [(m - 60, m + 60) for m in rng.sample(range(360, 1260), 3)]
+        index = FreeIntervalIndex(busy)
+
+        for _ in range(10):
+            start = rng.randint(0, 1300)
+            end = rng.randint(start, 1440)
+            duration = rng.choice([15, 30, 60])
+            assert index.first_fit(start, end, duration) == _scan_first_fit(
+                busy, start, end, duration
+            )
+            assert index.first_fit(
+                start, end, duration, extra_busy=meal_buffers
+            ) == _scan_first_fit(busy + meal_buffers, start, end, duration)
+
+
+def test_meal_window_availability_reuses_given_index():
+    schedule = UserSchedule(
+        busy_times=[BusyTime(day="Monday", start=time(6, 0), end=time(10, 0))]
+    )
+    monday = MealAllocator.free_interval_index(schedule, "Monday")
+
+    availability = MealAllocator.check_meal_window_availability(
+        schedule, days=["Monday"], free_intervals={"Monday": monday}
+    )
+
+    assert availability[(MealSlot.BREAKFAST, "Monday")] is False
+    assert availability[(MealSlot.LUNCH, "Monday")] is True
+    # The supplied index is used as-is, not rebuilt from the schedule
+    availability = MealAllocator.check_meal_window_availability(
+        UserSchedule(), days=["Monday"], free_intervals={"Monday": monday}
+    )
+    assert availability[(MealSlot.BREAKFAST, "Monday")] is False
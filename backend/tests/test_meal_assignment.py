@@ -0,0 +1,199 @@
+import random
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.domain.enums import Day, MealSlot
+from app.schemas.meal_plan import DailyMealPlan, MealSlotTarget
+from app.services.macro_scoring import slot_deviation
+from app.services.meal_assignment import solve_weekly_primaries
+from app.services.meal_plan import MealPlanService
+from app.services.recipe_pool import PoolRecipe
+from tests.generate_mock_user import create_mock_user
+from tests.test_meal_plan import _make_spoonacular_response
+
+
+def _slot(name: MealSlot, calories: int, **kwargs) -> MealSlotTarget:
+    return MealSlotTarget(
+        slot_name=name,
+        calories=calories,
+        protein=calories // 16,
+        carbohydrates=calories // 8,
+        fat=calories // 36,
+        **kwargs,
+    )
+
+
+def _day(day: Day, *slots: MealSlotTarget) -> DailyMealPlan:
+    return DailyMealPlan(
+        day=day,
+        slots=list(slots),
+        total_calories=sum(s.calories for s in slots),
+        total_protein=0,
+        total_carbs=0,
+        total_fat=0,
+    )
+
+
+def _recipe(recipe_id: int, calories: int) -> PoolRecipe:
+    return PoolRecipe(
+        id=recipe_id,
+        title=f"Recipe {recipe_id}",
+        calories=calories,
+        protein=calories // 16,
+        carbohydrates=calories // 8,
+        fat=calories // 36,
+    )
+
+
+def test_solver_fits_recipes_to_slot_targets_and_leftovers():
+    plans = [
+        _day(
+            Day.MONDAY,
+            _slot(MealSlot.BREAKFAST, 400),
+            _slot(MealSlot.LUNCH, 600),
+            _slot(MealSlot.DINNER, 900),
+        ),
+        _day(
+            Day.TUESDAY,
+            _slot(MealSlot.BREAKFAST, 400),
+            _slot(
+                MealSlot.LUNCH,
+                900,
+                is_leftover=True,
+                leftover_from_day=Day.MONDAY,
+                leftover_from_slot=MealSlot.DINNER,
+            ),
+            _slot(MealSlot.DINNER, 600),
+        ),
+    ]
+    breakfasts = [_recipe(1, 800), _recipe(2, 410)]
+    # In pool order greedy would give Monday lunch the 1500 kcal recipe
+    mains = [_recipe(10, 1500), _recipe(11, 880), _recipe(12, 610), _recipe(13, 590)]
+
+    result = solve_weekly_primaries(plans, breakfasts, mains, 5.0)
+
+    assert result is not None
+    assert result.status == "OPTIMAL"
+    picked = {key: recipe.id for key, recipe in result.primaries.items()}
+    assert picked[(Day.MONDAY, MealSlot.DINNER)] == 11
+    assert {
+        picked[(Day.MONDAY, MealSlot.LUNCH)],
+        picked[(Day.TUESDAY, MealSlot.DINNER)],
+    } == {12, 13}
+    # Each breakfast primary may repeat ceil(2 / 2) = 1 time
+    assert {
+        picked[(Day.MONDAY, MealSlot.BREAKFAST)],
+        picked[(Day.TUESDAY, MealSlot.BREAKFAST)],
+    } == {1, 2}
+    assert (Day.TUESDAY, MealSlot.LUNCH) not in picked
+
+
+def test_solver_gives_up_without_enough_recipes_or_time():
+    plans = [_day(Day.MONDAY, _slot(MealSlot.LUNCH, 600), _slot(MealSlot.DINNER, 700))]
+
+    assert solve_weekly_primaries(plans, [], [_recipe(10, 600)], 5.0) is None
+    assert (
+        solve_weekly_primaries(plans, [], [_recipe(10, 600), _recipe(11, 700)], 0)
+        is None
+    )
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.meal_plan.ExercisePlanService.generate_weekly_plan",
+    return_value={day: None for day in Day},
+)
+# Generous budget so a loaded test machine never falls back to greedy
+@patch.object(settings, "MEAL_PLAN_SOLVER_TIME_LIMIT_MS", 2000.0)
+async def test_scored_and_solver_weekly_plans_beat_greedy(mock_exercise):
+    rng = random.Random(3)
+    breakfast_pool = [
+        _make_spoonacular_response(i, f"Breakfast {i}", rng.randint(200, 900))
+        for i in range(1, 7)
+    ]
+    main_pool = [
+        _make_spoonacular_response(
+            1000 + i,
+            f"Main {i}",
+            rng.randint(300, 1300),
+            rng.randint(10, 70),
+            rng.randint(20, 140),
+            rng.randint(5, 60),
+        )
+        for i in range(1, 51)
+    ]
+
+    def search_recipes_side_effect(**kwargs):
+        if "breakfast" in str(kwargs.get("type")).lower():
+            return list(breakfast_pool)
+        return list(main_pool)
+
+    solver_threads = []
+
+    def solve_off_loop(*args):
+        solver_threads.append(threading.get_ident())
+        return solve_weekly_primaries(*args)
+
+    user = create_mock_user()
+    plans = {}
+    with patch(
+        "app.services.meal_plan.solve_weekly_primaries", side_effect=solve_off_loop
+    ):
+        for mode in ("greedy", "scored", "solver"):
+            client = AsyncMock()
+            client.search_recipes = AsyncMock(side_effect=search_recipes_side_effect)
+            service = MealPlanService(spoonacular_client=client, assignment_mode=mode)
+            random.seed(0)
+            plans[mode] = await service.generate_weekly_plan(user)
+
+    # Only the solver mode solves, and never on the event loop's thread
+    assert len(solver_threads) == 1
+    assert solver_threads[0] != threading.get_ident()
+
+    def deviation(weekly_plan) -> float:
+        return sum(
+            slot_deviation(
+                PoolRecipe.from_spoonacular(
+                    next(
+                        r
+                        for r in breakfast_pool + main_pool
+                        if str(r["id"]) == slot.plan.main_recipe.id
+                    )
+                ),
+                slot,
+            )
+            for plan in weekly_plan.daily_plans
+            for slot in plan.slots
+        )
+
+    assert deviation(plans["scored"]) < deviation(plans["greedy"])
+    assert deviation(plans["solver"]) < deviation(plans["greedy"])
+
+    solved = plans["solver"]
+    primaries = [
+        slot.plan.main_recipe.id
+        for plan in solved.daily_plans
+        for slot in plan.slots
+        if slot.slot_name != MealSlot.BREAKFAST and not slot.is_leftover
+    ]
+    assert len(primaries) == len(set(primaries))
+    alternatives = {
+        alt.id
+        for plan in solved.daily_plans
+        for slot in plan.slots
+        for alt in slot.plan.alternatives
+        if slot.slot_name != MealSlot.BREAKFAST
+    }
+    assert not alternatives & set(primaries)
+    by_key = {
+        (plan.day, slot.slot_name): slot
+        for plan in solved.daily_plans
+        for slot in plan.slots
+    }
+    for slot in by_key.values():
+        if slot.is_leftover:
+            source = by_key[(slot.leftover_from_day, slot.leftover_from_slot)]
+            assert slot.plan.main_recipe.id == source.plan.main_recipe.id
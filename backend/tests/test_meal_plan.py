@@ -1,4 +1,4 @@
-from datetime import datetime, time
+from datetime import date, datetime, time
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
@@ -12,10 +12,12 @@ from app.domain.enums import (
     ExerciseCategory,
     MealSlot,
 )
+from app.schemas.meal_plan import MealSlotTarget
 from app.services.exercise_service import ExerciseRecommendation
 from app.services.google_calendar import _parse_google_dt
 from app.services.meal_allocator import MealAllocator
 from app.services.meal_plan import MealPlanService
+from app.services.recipe_pool import PoolCursor, PoolRecipe, parse_pool
 from tests.generate_mock_user import create_mock_user
 
 
@@ -259,6 +261,76 @@ async def test_generate_weekly_plan(mock_exercise):
     )
 
 
+def test_pool_recipe_reads_macros_by_exact_nutrient_name():
+    data = _make_spoonacular_response(1, "Oats", 400, 15, 60, 10)
+    # Full-profile results list related nutrients after the macros
+    data["nutrition"]["nutrients"] = [
+        {"name": "Calories", "amount": 400},
+        {"name": "Fat", "amount": 10},
+        {"name": "Saturated Fat", "amount": 2},
+        {"name": "Carbohydrates", "amount": 60},
+        {"name": "Net Carbohydrates", "amount": 48},
+        {"name": "Protein", "amount": 15},
+    ]
+
+    item = PoolRecipe.from_spoonacular(data)
+
+    assert (item.calories, item.protein, item.carbohydrates, item.fat) == (
+        400,
+        15,
+        60,
+        10,
+    )
+    recipe = item.to_recipe()
+    assert recipe.nutrients.fat == 10
+    assert recipe.nutrients.carbohydrates == 60
+    assert recipe.ingredients == ["1 cup ingredient A", "2 tbsp ingredient B"]
+    assert item.to_recipe() is recipe
+
+
+def test_only_assigned_pool_recipes_are_materialized():
+    pool = parse_pool(
+        [_make_spoonacular_response(i, f"Main {i}") for i in range(1, 51)]
+    )
+    slot = MealSlotTarget(
+        slot_name=MealSlot.LUNCH, calories=700, protein=40, carbohydrates=60, fat=20
+    )
+    used_ids: set[int] = {1}
+
+    MealPlanService._assign_slot_recipes(slot, PoolCursor(pool, used_ids))
+
+    assert [r.id for r in pool if r._recipe is not None] == [2, 3, 4]
+    assert used_ids == {1, 2, 3, 4}
+    assert slot.plan is not None
+    assert slot.plan.main_recipe.id == "2"
+    assert [a.id for a in slot.plan.alternatives] == ["3", "4"]
+
+
+def test_pool_cursor_skips_used_and_duplicate_recipes():
+    ids = [1, 2, 2, 3, 4, 5, 3, 6]
+    pool = parse_pool([_make_spoonacular_response(i, f"Main {i}") for i in ids])
+    used_ids = {4}
+    cursor = PoolCursor(pool, used_ids)
+
+    assert [r.id for r in cursor.take(3)] == [1, 2, 3]
+    # Taken elsewhere after the cursor was created
+    used_ids.add(5)
+    assert [r.id for r in cursor.take(3)] == [6]
+    assert cursor.take(3) == []
+    assert used_ids == {1, 2, 3, 4, 5, 6}
+
+
+def test_pool_cursor_looks_at_each_entry_once():
+    pool = parse_pool([_make_spoonacular_response(i, f"Main {i}") for i in range(600)])
+    cursor = PoolCursor(pool)
+
+    slots = [cursor.take(3) for _ in range(200)]
+
+    assert [r.id for taken in slots for r in taken] == list(range(600))
+    # Every entry is looked at exactly once across all slots
+    assert cursor.position == 600
+
+
 def test_google_calendar_busy_blocks_are_merged_into_user_schedule():
     # generate_and_persist converts google_calendar ScheduleItems via
     # _google_blocks_to_busy_times and merges them into user.busy_times
@@ -307,3 +379,53 @@ def test_parse_google_dt_preserves_wall_clock_time_from_offset():
     parsed = _parse_google_dt("2026-04-27T09:30:00-04:00")
 
     assert parsed == datetime(2026, 4, 27, 9, 30)
+
+
+def _mock_pool_client() -> AsyncMock:
+    breakfast_pool = [
+        _make_spoonacular_response(i, f"Breakfast {i}", 500 + i * 5, 20, 70, 12)
+        for i in range(1, 7)
+    ]
+    main_pool = [
+        _make_spoonacular_response(1000 + i, f"Main {i}", 700 + i * 3, 40, 55, 22)
+        for i in range(1, 51)
+    ]
+
+    def search_recipes_side_effect(**kwargs):
+        if "breakfast" in str(kwargs.get("type")).lower():
+            return list(breakfast_pool)
+        return list(main_pool)
+
+    mock_client = AsyncMock()
+    mock_client.search_recipes = AsyncMock(side_effect=search_recipes_side_effect)
+    return mock_client
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.meal_plan.ExercisePlanService.generate_weekly_plan",
+    return_value={day: None for day in Day},
+)
+async def test_regenerating_week_reuses_shared_meal_rows(mock_exercise, db, mock_user):
+    from sqlalchemy import func, select
+
+    from app.models.meal import Meal
+    from app.schemas.user import UserRead
+
+    service = MealPlanService(spoonacular_client=_mock_pool_client())
+    user = UserRead.model_validate(mock_user)
+    monday = date(2025, 6, 2)
+
+    first = await service.generate_and_persist(user, monday, db)
+    meal_count = (await db.execute(select(func.count()).select_from(Meal))).scalar()
+    second = await service.generate_and_persist(user, monday, db)
+    second_count = (await db.execute(select(func.count()).select_from(Meal))).scalar()
+
+    assert len(first) == len(second) == 21
+    # 6 breakfasts + 50 mains at most; regeneration must not add duplicates
+    assert meal_count <= 56
+    assert second_count <= 56
+    recipe_ids = (await db.execute(select(Meal.recipe_id))).scalars().all()
+    assert len(recipe_ids) == len(set(recipe_ids))
+    for item in second:
+        assert item.meal is not None
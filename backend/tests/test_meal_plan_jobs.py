@@ -0,0 +1,240 @@
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.enums import JobStatus
+from app.models.meal_plan_job import MealPlanJob
+from app.services.meal_plan import MealPlanService
+from app.services.meal_plan_jobs import (
+    MealPlanJobWorker,
+    claim_next_job,
+    enqueue_generate_week,
+)
+from tests.test_batch_meal_plan import _meal_items, _pool_client
+
+BASE = "/api/v1/meal-plans"
+MONDAY = date(2025, 6, 2)
+
+
+@pytest.fixture
+def session_factory(engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    )
+
+
+def _worker(session_factory, service=None) -> MealPlanJobWorker:
+    if service is None:
+        service = MealPlanService(spoonacular_client=_pool_client())
+    return MealPlanJobWorker(
+        session_factory,
+        concurrency=1,
+        lease_seconds=60,
+        service_factory=lambda: service,
+    )
+
+
+async def _job(session_factory, job_id: int) -> MealPlanJob:
+    async with session_factory() as session:
+        job = await session.get(MealPlanJob, job_id)
+        assert job is not None
+        return job
+
+
+@pytest.mark.asyncio
+async def test_enqueue_deduplicates_pending_jobs(db, mock_user, session_factory):
+    first = await enqueue_generate_week(db, mock_user.id, MONDAY)
+    again = await enqueue_generate_week(db, mock_user.id, MONDAY)
+    other_week = await enqueue_generate_week(
+        db, mock_user.id, MONDAY + timedelta(days=7)
+    )
+
+    assert again.id == first.id
+    assert other_week.id != first.id
+
+    # Once the job is running, a new request queues a fresh job, which is not
+    # claimed while the first one holds the week
+    async with session_factory() as session:
+        claimed = await claim_next_job(session, lease_seconds=60, max_attempts=3)
+    assert claimed is not None and claimed.id == first.id
+    follow_up = await enqueue_generate_week(db, mock_user.id, MONDAY)
+    assert follow_up.id != first.id
+
+    async with session_factory() as session:
+        next_claim = await claim_next_job(session, lease_seconds=60, max_attempts=3)
+        assert next_claim is not None and next_claim.id == other_week.id
+        assert await claim_next_job(session, 60, 3) is None
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_rows_locked_by_another_worker(
+    db, mock_user, session_factory
+):
+    job = await enqueue_generate_week(db, mock_user.id, MONDAY)
+
+    async with session_factory() as holder, session_factory() as other:
+        await holder.execute(
+            select(MealPlanJob).where(MealPlanJob.id == job.id).with_for_update()
+        )
+        # Does not block on the locked row, and finds nothing else to do
+        assert await asyncio.wait_for(claim_next_job(other, 60, 3), 5) is None
+        await holder.rollback()
+
+        claimed = await claim_next_job(other, 60, 3)
+        assert claimed is not None and claimed.id == job.id
+
+
+@pytest.mark.asyncio
+async def test_worker_generates_and_persists_the_week(db, mock_user, session_factory):
+    job = await enqueue_generate_week(db, mock_user.id, MONDAY)
+
+    worker = _worker(session_factory)
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+
+    done = await _job(session_factory, job.id)
+    assert done.status == JobStatus.SUCCEEDED
+    assert done.attempts == 1
+    assert done.error is None
+    assert done.finished_at is not None and done.lease_expires_at is None
+    assert await _meal_items(db, mock_user.id) == 21
+
+
+@pytest.mark.asyncio
+async def test_worker_records_failures(db, mock_user, session_factory):
+    job = await enqueue_generate_week(db, mock_user.id, MONDAY)
+    service = MagicMock()
+    service.generate_and_persist = AsyncMock(side_effect=RuntimeError("API down"))
+
+    assert await _worker(session_factory, service).run_once() is True
+
+    failed = await _job(session_factory, job.id)
+    assert failed.status == JobStatus.FAILED
+    assert "API down" in failed.error
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed_until_attempts_run_out(
+    db, mock_user, session_factory
+):
+    job = await enqueue_generate_week(db, mock_user.id, MONDAY)
+    expired = datetime.now(UTC) - timedelta(seconds=1)
+
+    async with session_factory() as session:
+        claimed = await claim_next_job(session, lease_seconds=60, max_attempts=2)
+        assert claimed is not None
+        claimed.lease_expires_at = expired
+        await session.commit()
+
+        reclaimed = await claim_next_job(session, lease_seconds=60, max_attempts=2)
+        assert reclaimed is not None and reclaimed.attempts == 2
+        reclaimed.lease_expires_at = expired
+        await session.commit()
+
+        assert await claim_next_job(session, lease_seconds=60, max_attempts=2) is None
+
+    abandoned = await _job(session_factory, job.id)
+    assert abandoned.status == JobStatus.FAILED
+    assert "abandoned" in abandoned.error
+
+
+@pytest.mark.asyncio
+async def test_worker_renews_the_lease_of_a_long_job(db, mock_user, session_factory):
+    job = await enqueue_generate_week(db, mock_user.id, MONDAY)
+
+    async def generate(*args) -> None:
+        await asyncio.sleep(0.5)
+
+    service = MagicMock()
+    service.generate_and_persist = AsyncMock(side_effect=generate)
+    worker = MealPlanJobWorker(
+        session_factory, lease_seconds=0.3, service_factory=lambda: service
+    )
+
+    run = asyncio.create_task(worker.run_once())
+    await asyncio.sleep(0.4)
+    # Past the first lease, the job is still held by its worker
+    async with session_factory() as session:
+        assert await claim_next_job(session, lease_seconds=60, max_attempts=3) is None
+    assert await run is True
+
+    done = await _job(session_factory, job.id)
+    assert done.status == JobStatus.SUCCEEDED
+    assert done.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_abandons_an_attempt_that_lost_its_lease(
+    db, mock_user, session_factory
+):
+    job = await enqueue_generate_week(db, mock_user.id, MONDAY)
+    started = asyncio.Event()
+    cancelled = False
+
+    async def generate(*args) -> None:
+        nonlocal cancelled
+        started.set()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    service = MagicMock()
+    service.generate_and_persist = AsyncMock(side_effect=generate)
+    worker = MealPlanJobWorker(
+        session_factory, lease_seconds=0.3, service_factory=lambda: service
+    )
+
+    run = asyncio.create_task(worker.run_once())
+    await started.wait()
+    # Another worker re-claims the job, e.g. after a stalled renewal
+    async with session_factory() as session:
+        claimed = await session.get(MealPlanJob, job.id)
+        claimed.attempts += 1
+        await session.commit()
+
+    assert await asyncio.wait_for(run, 2) is True
+    assert cancelled
+    reclaimed = await _job(session_factory, job.id)
+    # The first worker neither finished nor failed the new attempt
+    assert reclaimed.status == JobStatus.RUNNING
+    assert reclaimed.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_job_endpoints(client: AsyncClient, db, mock_user, session_factory):
+    response = await client.post(
+        f"{BASE}/jobs", params={"week_start_date": MONDAY.isoformat()}
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "pending"
+
+    repeat = await client.post(
+        f"{BASE}/jobs", params={"week_start_date": MONDAY.isoformat()}
+    )
+    assert repeat.json()["id"] == job["id"]
+
+    tuesday = await client.post(
+        f"{BASE}/jobs", params={"week_start_date": "2025-06-03"}
+    )
+    assert tuesday.status_code == 400
+
+    async def finish_later():
+        await asyncio.sleep(0.2)
+        await _worker(session_factory).run_once()
+
+    worker_task = asyncio.create_task(finish_later())
+    polled = await client.get(f"{BASE}/jobs/{job['id']}", params={"wait": 10})
+    await worker_task
+    assert polled.status_code == 200
+    assert polled.json()["status"] == "succeeded"
+
+    missing = await client.get(f"{BASE}/jobs/{job['id'] + 1}")
+    assert missing.status_code == 404
@@ -51,6 +51,8 @@ async def mock_client() -> AsyncClient:
 
     app.dependency_overrides[get_db] = lambda: mock_db
     app.dependency_overrides[deps.get_current_user] = lambda: mock_user
+    app.dependency_overrides[deps.get_current_user_profile] = lambda: mock_user
+    app.dependency_overrides[deps.get_current_user_id] = lambda: mock_user.id
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -0,0 +1,223 @@
+import asyncio
+from datetime import date, time
+
+import pytest
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from app.domain.enums import (
+    ActivityLevel,
+    ActivityType,
+    Day,
+    ExerciseCategory,
+    MealSlot,
+    PregnancyStatus,
+    Sex,
+)
+from app.models.schedule import ScheduleItem
+from app.models.user import User
+from app.schemas.meal_plan import DailyMealPlan, MealOption, MealSlotTarget
+from app.schemas.recipe import Recipe, RecipeNutrients
+from app.services.exercise_service import ExerciseRecommendation
+from app.services.plan_persistence import (
+    WeeklyPlanWrite,
+    upsert_shared_meals,
+    write_weekly_plans,
+)
+
+MONDAY = date(2025, 6, 2)
+
+
+def _recipe(recipe_id: int, title: str | None = None) -> Recipe:
+    return Recipe(
+        id=str(recipe_id),
+        title=title or f"Recipe {recipe_id}",
+        nutrients=RecipeNutrients(calories=600, protein=30, carbohydrates=60, fat=20),
+    )
+
+
+def _slot(slot: MealSlot, recipe_id: int, **kwargs) -> MealSlotTarget:
+    return MealSlotTarget(
+        slot_name=slot,
+        calories=600,
+        protein=30,
+        carbohydrates=60,
+        fat=20,
+        time=time(12, 0) if slot == MealSlot.LUNCH else time(18, 0),
+        plan=MealOption(
+            main_recipe=_recipe(recipe_id),
+            alternatives=[_recipe(recipe_id + 1), _recipe(recipe_id + 2)],
+        ),
+        **kwargs,
+    )
+
+
+def _week() -> list[DailyMealPlan]:
+    """Monday cooks dinner; Tuesday lunch eats the leftovers. Monday trains."""
+    totals = {
+        "total_calories": 1200,
+        "total_protein": 60,
+        "total_carbs": 120,
+        "total_fat": 40,
+    }
+    leftover = MealSlotTarget(
+        slot_name=MealSlot.LUNCH,
+        calories=600,
+        protein=30,
+        carbohydrates=60,
+        fat=20,
+        time=time(12, 30),
+        is_leftover=True,
+        leftover_from_day=Day.MONDAY,
+        leftover_from_slot=MealSlot.DINNER,
+    )
+    return [
+        DailyMealPlan(
+            day=Day.MONDAY,
+            slots=[_slot(MealSlot.LUNCH, 100), _slot(MealSlot.DINNER, 200)],
+            exercise=ExerciseRecommendation(
+                category=ExerciseCategory.CARDIO,
+                duration_minutes=45,
+                time=time(7, 0),
+                calories_burned=400,
+            ),
+            **totals,
+        ),
+        DailyMealPlan(
+            day=Day.TUESDAY,
+            slots=[leftover, _slot(MealSlot.DINNER, 300)],
+            **totals,
+        ),
+    ]
+
+
+async def _load_week(db, user_id: str) -> list[ScheduleItem]:
+    result = await db.execute(
+        select(ScheduleItem)
+        .where(ScheduleItem.user_id == user_id)
+        .order_by(ScheduleItem.date)
+        .options(selectinload(ScheduleItem.alternatives))
+    )
+    return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_write_links_leftovers_alternatives_and_exercise(db, mock_user):
+    await write_weekly_plans(db, [WeeklyPlanWrite(mock_user.id, MONDAY, _week())])
+    await db.commit()
+
+    items = await _load_week(db, mock_user.id)
+    exercise = [i for i in items if i.activity_type == ActivityType.EXERCISE]
+    meals = {
+        (i.date.weekday(), i.meal_type): i
+        for i in items
+        if i.activity_type == ActivityType.MEAL
+    }
+
+    assert len(exercise) == 1
+    assert exercise[0].exercise_calorie_burn == 400
+    assert len(meals) == 4
+
+    source = meals[(0, "Dinner")]
+    leftover = meals[(1, "Lunch")]
+    assert leftover.source_schedule_item_id == source.id
+    assert leftover.meal_id == source.meal_id is not None
+    assert leftover.alternatives == []
+    assert len(source.alternatives) == 2
+
+
+@pytest.mark.asyncio
+async def test_write_uses_constant_statements_for_batched_weeks(engine, db, mock_user):
+    other = User(
+        id="second_user",
+        email="second@sophros.com",
+        age=40,
+        weight=60.0,
+        height=165.0,
+        show_imperial=False,
+        gender=Sex.FEMALE,
+        activity_level=ActivityLevel.LIGHT,
+        pregnancy_status=PregnancyStatus.NOT_PREGNANT,
+    )
+    db.add(other)
+    await db.commit()
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        await write_weekly_plans(db, [WeeklyPlanWrite(mock_user.id, MONDAY, _week())])
+        single = len(statements)
+
+        statements.clear()
+        await write_weekly_plans(
+            db,
+            [
+                WeeklyPlanWrite(mock_user.id, MONDAY, _week()),
+                WeeklyPlanWrite("second_user", MONDAY, _week()),
+            ],
+        )
+        batched = len(statements)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    await db.commit()
+
+    # delete, meal upsert, items, leftovers, alternatives
+    assert single == 5
+    # The batched weeks reuse the same, unchanged meals: their ids are read
+    # back in one more statement
+    assert batched == 6
+    assert len(await _load_week(db, mock_user.id)) == 5
+    assert len(await _load_week(db, "second_user")) == 5
+
+
+@pytest.mark.asyncio
+async def test_upsert_skips_unchanged_meals(db):
+    recipes = [_recipe(i) for i in range(1, 4)]
+    first = await upsert_shared_meals(db, recipes)
+    await db.commit()
+
+    def versions():
+        return db.execute(text("SELECT recipe_id, xmin::text FROM meals"))
+
+    before = dict((await versions()).all())
+    assert await upsert_shared_meals(db, recipes) == first
+    await db.commit()
+    assert dict((await versions()).all()) == before
+
+    renamed = await upsert_shared_meals(db, [_recipe(1, "Renamed"), *recipes[1:]])
+    await db.commit()
+    assert renamed == first
+    after = dict((await versions()).all())
+    assert after["1"] != before["1"]
+    assert after["2"] == before["2"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_upserts_in_any_order_do_not_deadlock(engine):
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    recipe_ids = list(range(1, 401))
+
+    async def upsert(ids: list[int], title: str) -> dict[str, int]:
+        async with session_factory() as session:
+            meal_ids = await upsert_shared_meals(
+                session, [_recipe(i, f"{title} {i}") for i in ids]
+            )
+            # Hold the row locks like a plan transaction does
+            await asyncio.sleep(0.05)
+            await session.commit()
+            return meal_ids
+
+    for round_ in range(5):
+        forward, backward = await asyncio.gather(
+            upsert(recipe_ids, f"Forward {round_}"),
+            upsert(recipe_ids[::-1], f"Backward {round_}"),
+        )
+        assert forward == backward
+        assert len(forward) == len(recipe_ids)
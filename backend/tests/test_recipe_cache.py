@@ -0,0 +1,154 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.cache import TTLCache
+from app.domain.enums import Day
+from app.services.meal_plan import MealPlanService
+from app.services.recipe_cache import (
+    RecipePoolCache,
+    canonical_search_params,
+    search_cache_key,
+)
+from app.services.spoonacular import MealType, SpoonacularClient
+from tests.generate_mock_user import create_mock_user
+from tests.test_meal_plan import _make_spoonacular_response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(max_entries=4, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats.evictions == 1
+
+
+def test_canonical_params_ignore_list_order_and_case():
+    a = {"diet": "vegan,gluten free", "intolerances": "Peanut,dairy", "number": 50}
+    b = {"intolerances": "dairy, peanut", "number": 50, "diet": "Gluten Free,vegan"}
+
+    assert canonical_search_params(a, 50) == canonical_search_params(b, 50)
+    assert search_cache_key(a, 50) == search_cache_key(b, 50)
+
+
+def test_canonical_params_bucket_calories():
+    near = {"minCalories": 489, "maxCalories": 909, "type": "main course"}
+    also_near = {"minCalories": 506, "maxCalories": 890, "type": "main course"}
+    far = {"minCalories": 560, "maxCalories": 1040, "type": "main course"}
+
+    assert search_cache_key(near, 50) == search_cache_key(also_near, 50)
+    assert search_cache_key(near, 50) != search_cache_key(far, 50)
+
+
+@pytest.mark.asyncio
+async def test_cache_returns_copies_and_skips_empty_results():
+    cache = RecipePoolCache()
+    params = {"type": "breakfast", "number": 5}
+    pool = [{"id": 1}, {"id": 2}]
+
+    await cache.set(params, pool)
+    first = await cache.get(params)
+    first.reverse()
+
+    assert await cache.get(params) == pool
+
+    await cache.set({"type": "snack"}, [])
+    assert await cache.get({"type": "snack"}) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_falls_through_to_store_and_warms_memory():
+    store = AsyncMock()
+    store.get = AsyncMock(return_value=[{"id": 7}])
+    cache = RecipePoolCache(store=store)
+    params = {"type": "breakfast"}
+
+    assert await cache.get(params) == [{"id": 7}]
+    assert await cache.get(params) == [{"id": 7}]
+
+    store.get.assert_awaited_once()
+    assert cache.store_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_treats_store_errors_as_misses():
+    store = AsyncMock()
+    store.get = AsyncMock(side_effect=RuntimeError("db down"))
+    store.set = AsyncMock(side_effect=RuntimeError("db down"))
+    cache = RecipePoolCache(store=store)
+
+    assert await cache.get({"type": "breakfast"}) is None
+    await cache.set({"type": "breakfast"}, [{"id": 1}])
+    assert await cache.get({"type": "breakfast"}) == [{"id": 1}]
+
+
+@pytest.mark.asyncio
+async def test_client_serves_identical_search_from_cache():
+    client = SpoonacularClient(api_key="test_key", cache=RecipePoolCache())
+    client._request = AsyncMock(return_value={"results": [{"id": 101}]})
+
+    first = await client.search_recipes(
+        type=MealType.BREAKFAST, min_calories=401, max_calories=749, number=5
+    )
+    second = await client.search_recipes(
+        type=MealType.BREAKFAST, min_calories=398, max_calories=752, number=5
+    )
+
+    assert first == second == [{"id": 101}]
+    client._request.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch(
+    "app.services.meal_plan.ExercisePlanService.generate_weekly_plan",
+    return_value={day: None for day in Day},
+)
+async def test_warm_cache_generates_week_without_outbound_calls(mock_exercise):
+    breakfast_pool = [
+        _make_spoonacular_response(i, f"Breakfast {i}") for i in range(1, 7)
+    ]
+    main_pool = [
+        _make_spoonacular_response(1000 + i, f"Main {i}") for i in range(1, 51)
+    ]
+
+    async def fake_request(method, endpoint, params=None):
+        pool = breakfast_pool if params["type"] == "breakfast" else main_pool
+        return {"results": list(pool)}
+
+    client = SpoonacularClient(api_key="test_key", cache=RecipePoolCache())
+    client._request = AsyncMock(side_effect=fake_request)
+    service = MealPlanService(spoonacular_client=client)
+    user = create_mock_user()
+
+    with patch("app.services.meal_plan.random.randint", return_value=0):
+        await service.generate_weekly_plan(user)
+        assert client._request.await_count == 2
+
+        await service.generate_weekly_plan(user)
+        assert client._request.await_count == 2
@@ -0,0 +1,166 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.enums import Allergy, Cuisine
+from app.schemas.dietary import DietaryConstraints
+from app.services.meal_plan import MealPlanService
+from app.services.recipe_cache import RecipePoolCache
+from app.services.recipe_catalog import (
+    RecipeCatalog,
+    catalog_row_from_spoonacular,
+)
+from app.services.spoonacular import MealType, SpoonacularClient
+from tests.fake_spoonacular import FakeSpoonacular
+from tests.test_meal_plan import _make_spoonacular_response
+
+
+def test_catalog_row_folds_in_verified_query_filters():
+    constraints = DietaryConstraints(
+        allergies=[Allergy.PEANUT], is_vegetarian=True, is_gluten_free=True
+    )
+    spoon = _make_spoonacular_response(42, "Pasta", 610, 25, 80, 18)
+    spoon["diets"] = ["lacto ovo vegetarian", "Gluten Free"]
+
+    row = catalog_row_from_spoonacular(spoon, MealType.MAIN_COURSE, constraints)
+
+    assert row["recipe_id"] == "42"
+    assert (row["calories"], row["protein"], row["carbohydrates"], row["fat"]) == (
+        610,
+        25,
+        80,
+        18,
+    )
+    assert row["diets"] == ["gluten free", "lacto ovo vegetarian", "vegetarian"]
+    assert row["dish_types"] == ["main course"]
+    assert row["cuisines"] == ["italian"]
+    assert row["safe_intolerances"] == ["peanut"]
+    assert row["ingredients"] == ["1 cup ingredient A", "2 tbsp ingredient B"]
+
+
+def test_catalog_row_ignores_results_without_id():
+    assert catalog_row_from_spoonacular({"title": "No id"}) is None
+
+
+def _service_with(catalog, pool):
+    async def live_search(on_fetch=None, **kwargs):
+        results = list(pool)
+        if on_fetch is not None:
+            await on_fetch(results)
+        return results
+
+    client = AsyncMock()
+    client.search_recipes = AsyncMock(side_effect=live_search)
+    return MealPlanService(spoonacular_client=client, catalog=catalog, local_first=True)
+
+
+@pytest.mark.asyncio
+async def test_local_first_serves_pool_from_catalog():
+    local_pool = [_make_spoonacular_response(i, f"Local {i}") for i in range(5)]
+    catalog = AsyncMock()
+    catalog.search = AsyncMock(return_value=local_pool)
+    service = _service_with(catalog, [])
+
+    pool = await service._fetch_recipe_pool(
+        MealType.BREAKFAST, 500, DietaryConstraints(), count=5
+    )
+
+    assert pool == local_pool
+    service.spoonacular_client.search_recipes.assert_not_awaited()
+    catalog.ingest.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_local_first_falls_back_and_ingests_when_catalog_is_short():
+    live_pool = [_make_spoonacular_response(i, f"Live {i}") for i in range(5)]
+    catalog = AsyncMock()
+    catalog.search = AsyncMock(return_value=live_pool[:2])
+    service = _service_with(catalog, list(live_pool))
+    constraints = DietaryConstraints(is_vegan=True)
+
+    pool = await service._fetch_recipe_pool(
+        MealType.BREAKFAST, 500, constraints, count=5
+    )
+
+    assert sorted(r["id"] for r in pool) == [0, 1, 2, 3, 4]
+    service.spoonacular_client.search_recipes.assert_awaited_once()
+    catalog.ingest.assert_awaited_once()
+    assert catalog.ingest.await_args.args[1:] == (MealType.BREAKFAST, constraints)
+
+
+@pytest.mark.asyncio
+async def test_only_live_spoonacular_pools_are_ingested():
+    catalog = AsyncMock()
+    catalog.search = AsyncMock(return_value=[])
+    client = SpoonacularClient(api_key="fake-key", cache=RecipePoolCache())
+    service = MealPlanService(
+        spoonacular_client=client, catalog=catalog, local_first=False
+    )
+
+    async with FakeSpoonacular().installed():
+        for _ in range(2):
+            with patch("app.services.meal_plan.random.randint", return_value=0):
+                await service._fetch_recipe_pool(
+                    MealType.BREAKFAST, 500, DietaryConstraints(), count=5
+                )
+
+    # The second pool is served from the pool cache
+    catalog.ingest.assert_awaited_once()
+    assert len(catalog.ingest.await_args.args[0]) == 5
+
+
+@pytest.mark.asyncio
+async def test_catalog_failures_fall_back_to_spoonacular():
+    live_pool = [_make_spoonacular_response(i, f"Live {i}") for i in range(3)]
+    catalog = AsyncMock()
+    catalog.search = AsyncMock(side_effect=RuntimeError("db down"))
+    catalog.ingest = AsyncMock(side_effect=RuntimeError("db down"))
+    service = _service_with(catalog, list(live_pool))
+
+    pool = await service._fetch_recipe_pool(
+        MealType.BREAKFAST, 500, DietaryConstraints(), count=3
+    )
+
+    assert len(pool) == 3
+
+
+@pytest.mark.asyncio
+async def test_catalog_search_applies_filters(engine):
+    catalog = RecipeCatalog(
+        async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    )
+    vegan_italian = _make_spoonacular_response(1, "Vegan Pasta", 600)
+    vegan_italian["cuisines"] = ["Italian"]
+    vegan_mexican = _make_spoonacular_response(2, "Vegan Tacos", 600)
+    vegan_mexican["cuisines"] = ["Mexican"]
+    too_big = _make_spoonacular_response(3, "Huge Lasagna", 1500)
+    vegan = DietaryConstraints(is_vegan=True, allergies=[Allergy.PEANUT])
+
+    await catalog.ingest(
+        [vegan_italian, vegan_mexican, too_big], MealType.MAIN_COURSE, vegan
+    )
+    # Re-ingesting merges tags instead of duplicating the row
+    assert await catalog.ingest([vegan_italian], MealType.MAIN_COURSE) == 1
+
+    found = await catalog.search(
+        MealType.MAIN_COURSE,
+        400,
+        800,
+        DietaryConstraints(
+            is_vegan=True,
+            allergies=[Allergy.PEANUT],
+            exclude_cuisine=[Cuisine.MEXICAN],
+        ),
+        count=10,
+    )
+    assert [r["id"] for r in found] == [1]
+
+    unverified = await catalog.search(
+        MealType.MAIN_COURSE,
+        400,
+        800,
+        DietaryConstraints(allergies=[Allergy.SHELLFISH]),
+        count=10,
+    )
+    assert unverified == []
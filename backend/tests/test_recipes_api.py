@@ -0,0 +1,114 @@
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.models.recipe_detail import RecipeDetailEntry
+from app.services import recipe_details
+from app.services.recipe_details import (
+    RecipeDetailService,
+    recipe_detail_from_spoonacular,
+)
+from app.services.spoonacular import QuotaExceededError
+
+BASE = "/api/v1/recipes"
+
+
+def _info(recipe_id: int) -> dict:
+    return {
+        "id": recipe_id,
+        "title": f"Recipe {recipe_id}",
+        "summary": "<b>Tasty</b>",
+        "readyInMinutes": 25,
+        "servings": 2,
+        "extendedIngredients": [{"original": "1 onion"}],
+        "analyzedInstructions": [
+            {"steps": [{"number": 1, "step": "Chop."}, {"number": 2, "step": "Fry."}]}
+        ],
+        "diets": ["vegan"],
+    }
+
+
+def _spoonacular() -> AsyncMock:
+    async def bulk(recipe_ids, include_nutrition=False):
+        # Spoonacular leaves unknown ids out
+        return [_info(int(i)) for i in recipe_ids if int(i) < 900]
+
+    async def single(recipe_id, include_nutrition=False):
+        if int(recipe_id) >= 900:
+            request = httpx.Request("GET", "https://api.spoonacular.com")
+            raise httpx.HTTPStatusError(
+                "not found", request=request, response=httpx.Response(404)
+            )
+        return _info(int(recipe_id))
+
+    client = AsyncMock()
+    client.get_recipes_information_bulk = AsyncMock(side_effect=bulk)
+    client.get_recipe_information = AsyncMock(side_effect=single)
+    return client
+
+
+@pytest.fixture
+def detail_service(monkeypatch) -> RecipeDetailService:
+    service = RecipeDetailService(spoonacular_client=_spoonacular())
+    monkeypatch.setattr(recipe_details, "_default_service", service)
+    return service
+
+
+def test_recipe_detail_from_spoonacular():
+    detail = recipe_detail_from_spoonacular(_info(7))
+
+    assert detail.id == "7"
+    assert detail.ingredients == ["1 onion"]
+    assert detail.instructions == ["Chop.", "Fry."]
+    assert detail.ready_in_minutes == 25
+
+
+@pytest.mark.asyncio
+async def test_bulk_lookup_fetches_only_missing_recipes(db, detail_service):
+    spoonacular = detail_service.spoonacular_client
+
+    first = await detail_service.get_many(db, ["3", "1", "3", "950"])
+    assert [d.id for d in first] == ["3", "1"]
+    spoonacular.get_recipes_information_bulk.assert_awaited_once()
+
+    # A fresh process (empty memory tier) is served from the table
+    restarted = RecipeDetailService(spoonacular_client=spoonacular)
+    second = await restarted.get_many(db, ["1", "2", "3"])
+    assert [d.id for d in second] == ["1", "2", "3"]
+    assert restarted.store_hits == 2
+    spoonacular.get_recipe_information.assert_awaited_once_with("2")
+
+    stored = await db.execute(select(func.count()).select_from(RecipeDetailEntry))
+    assert stored.scalar_one() == 3
+
+
+@pytest.mark.asyncio
+async def test_recipe_endpoints(client: AsyncClient, detail_service):
+    response = await client.get(f"{BASE}/12")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Recipe 12"
+
+    # Second open is served from memory
+    await client.get(f"{BASE}/12")
+    assert detail_service.api_requests == 1
+
+    missing = await client.get(f"{BASE}/999")
+    assert missing.status_code == 404
+
+    bulk = await client.get(BASE, params={"ids": "12,13, 14"})
+    assert [r["id"] for r in bulk.json()] == ["12", "13", "14"]
+
+    invalid = await client.get(BASE, params={"ids": "12,abc"})
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_recipe_endpoint_reports_quota_exhaustion(client, detail_service):
+    detail_service.spoonacular_client.get_recipe_information = AsyncMock(
+        side_effect=QuotaExceededError("out of points")
+    )
+    response = await client.get(f"{BASE}/12")
+    assert response.status_code == 503
@@ -0,0 +1,94 @@
+"""EXPLAIN regression tests for the schedules indexes.
+
+Sequential scans are disabled for the session so the planner picks an index
+whenever one applies, regardless of how few rows the test table holds. A
+"Seq Scan on schedules" in the plan therefore means no index matches.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select, text, update
+
+from app.domain.enums import ActivityType
+from app.models.schedule import ScheduleItem
+from app.services.google_calendar import stored_busy_blocks
+from app.services.plan_persistence import PLAN_ACTIVITY_TYPES
+
+WEEK_START = datetime(2025, 6, 2)
+WEEK_END = datetime(2025, 6, 8, 23, 59, 59)
+
+
+async def _explain(db, stmt) -> str:
+    compiled = stmt.compile(
+        dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    result = await db.execute(text(f"EXPLAIN {compiled}"))
+    return "\n".join(row[0] for row in result.all())
+
+
+@pytest.fixture
+async def seeded(db, mock_user):
+    for day in range(14):
+        for hour, source_type in ((8, "sophros"), (12, "google_calendar")):
+            db.add(
+                ScheduleItem(
+                    user_id=mock_user.id,
+                    date=WEEK_START + timedelta(days=day, hours=hour),
+                    activity_type=ActivityType.MEAL
+                    if source_type == "sophros"
+                    else ActivityType.OTHER,
+                    duration_minutes=30,
+                    source_type=source_type,
+                )
+            )
+    await db.commit()
+    await db.execute(text("SET enable_seqscan = off"))
+    yield
+    await db.execute(text("RESET enable_seqscan"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("build", "index"),
+    [
+        pytest.param(
+            lambda user_id: select(ScheduleItem).where(
+                ScheduleItem.user_id == user_id,
+                ScheduleItem.date >= WEEK_START,
+                ScheduleItem.date <= WEEK_END,
+            ),
+            "ix_schedules_user_id_date",
+            id="week_schedule",
+        ),
+        pytest.param(
+            lambda user_id: delete(ScheduleItem).where(
+                ScheduleItem.user_id == user_id,
+                ScheduleItem.activity_type.in_(PLAN_ACTIVITY_TYPES),
+                ScheduleItem.date >= WEEK_START,
+                ScheduleItem.date <= WEEK_END,
+            ),
+            "ix_schedules_user_id_date",
+            id="plan_persistence_delete",
+        ),
+        pytest.param(
+            lambda user_id: stored_busy_blocks(user_id, WEEK_START, WEEK_END),
+            "ix_schedules_google_user_id_date",
+            id="calendar_sync_window",
+        ),
+        pytest.param(
+            lambda user_id: (
+                update(ScheduleItem)
+                .where(ScheduleItem.source_schedule_item_id == 1)
+                .values(meal_id=None)
+            ),
+            "ix_schedules_source_schedule_item_id",
+            id="leftover_swap_cascade",
+        ),
+    ],
+)
+async def test_hot_schedule_queries_use_index(db, mock_user, seeded, build, index):
+    plan = await _explain(db, build(mock_user.id))
+
+    assert "Seq Scan on schedules" not in plan, plan
+    assert index in plan, plan
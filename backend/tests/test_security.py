@@ -0,0 +1,147 @@
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import JWTError, jwk, jwt
+
+from app.core import security
+from app.core.security import AuthError, JWKSKeyStore, TokenVerifier, clerk_jwks_url
+
+
+def _rsa_pem() -> tuple[str, str]:
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+PRIVATE_A, PUBLIC_A = _rsa_pem()
+PRIVATE_B, PUBLIC_B = _rsa_pem()
+
+
+def _jwk(public_pem: str, kid: str) -> dict:
+    return {**jwk.construct(public_pem, "RS256").to_dict(), "kid": kid, "use": "sig"}
+
+
+def _token(private_pem: str, kid: str = "a", ttl: int = 60, **claims) -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": "user_123", "iat": now, "exp": now + ttl, **claims},
+        private_pem,
+        algorithm="RS256",
+        headers={"kid": kid},
+    )
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_verified_payload_is_cached_until_exp():
+    clock = FakeClock(time.time())
+    verifier = TokenVerifier(pem_public_key=PUBLIC_A, clock=clock)
+    token = _token(PRIVATE_A, ttl=60)
+
+    with patch.object(security.jwt, "decode", wraps=jwt.decode) as decode:
+        assert (await verifier.verify(token))["sub"] == "user_123"
+        assert (await verifier.verify(token))["sub"] == "user_123"
+        assert decode.call_count == 1
+
+        clock.now += 61
+        await verifier.verify(token)
+        assert decode.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalid_tokens_are_rejected_and_not_cached():
+    verifier = TokenVerifier(pem_public_key=PUBLIC_A)
+    forged = _token(PRIVATE_B)
+
+    with pytest.raises(JWTError):
+        await verifier.verify(forged)
+    assert len(verifier.cache) == 0
+
+    with pytest.raises(JWTError):
+        await verifier.verify(_token(PRIVATE_A, ttl=-10))
+
+
+@pytest.mark.asyncio
+async def test_key_store_refetches_on_rotation():
+    store = JWKSKeyStore("https://clerk.test/.well-known/jwks.json")
+    store._fetch_jwks = AsyncMock(
+        side_effect=[
+            {"keys": [_jwk(PUBLIC_A, "a")]},
+            {"keys": [_jwk(PUBLIC_A, "a"), _jwk(PUBLIC_B, "b")]},
+        ]
+    )
+    store.min_refresh_interval_seconds = 0
+    verifier = TokenVerifier(key_store=store)
+
+    assert (await verifier.verify(_token(PRIVATE_A, kid="a")))["sub"] == "user_123"
+    assert (await verifier.verify(_token(PRIVATE_B, kid="b")))["sub"] == "user_123"
+    assert store.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetch_is_rate_limited():
+    clock = FakeClock(0.0)
+    store = JWKSKeyStore(
+        "https://clerk.test/.well-known/jwks.json",
+        min_refresh_interval_seconds=30,
+        clock=clock,
+    )
+    store._fetch_jwks = AsyncMock(return_value={"keys": [_jwk(PUBLIC_A, "a")]})
+
+    await store.get_key("a")
+    for _ in range(3):
+        with pytest.raises(AuthError):
+            await store.get_key("unknown")
+    assert store.fetches == 1
+
+    clock.now = 31
+    with pytest.raises(AuthError):
+        await store.get_key("unknown")
+    assert store.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_key_store_keeps_keys_when_refresh_fails():
+    clock = FakeClock(0.0)
+    store = JWKSKeyStore("https://clerk.test/jwks", refresh_seconds=60, clock=clock)
+    store._fetch_jwks = AsyncMock(
+        side_effect=[{"keys": [_jwk(PUBLIC_A, "a")]}, RuntimeError("down")]
+    )
+
+    first = await store.get_key("a")
+    clock.now = 61
+    assert await store.get_key("a") is first
+
+
+def test_jwks_url_is_derived_from_publishable_key(monkeypatch):
+    # base64("clerk.example.com$")
+    monkeypatch.setattr(
+        security.settings, "CLERK_PUBLISHABLE_KEY", "pk_test_Y2xlcmsuZXhhbXBsZS5jb20k"
+    )
+    monkeypatch.setattr(security.settings, "CLERK_JWKS_URL", "")
+    assert clerk_jwks_url() == "https://clerk.example.com/.well-known/jwks.json"
+
+    monkeypatch.setattr(security.settings, "CLERK_JWKS_URL", "https://override/jwks")
+    assert clerk_jwks_url() == "https://override/jwks"
@@ -1,18 +1,27 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
+from app.core.config import settings
 from app.schemas.dietary import Allergy, Cuisine, DietaryConstraints
-from app.services.spoonacular import MealType, SpoonacularClient
+from app.services.meal_plan import MealPlanService
+from app.services.spoonacular import MealType, SpoonacularClient, search_flight
 
 
 @pytest.fixture
 def mock_settings_key():
-    with patch("app.services.spoonacular.settings") as mock_settings:
-        mock_settings.SPOONACULAR_API_KEY = "test_key"
+    # Only the key: the client also reads its retry and rate settings
+    with patch.object(settings, "SPOONACULAR_API_KEY", "test_key"):
         yield
 
 
+def _response(body: dict) -> httpx.Response:
+    request = httpx.Request("GET", "https://api.spoonacular.com/test")
+    return httpx.Response(200, json=body, request=request)
+
+
 @pytest.fixture
 def client(mock_settings_key):
     return SpoonacularClient()
@@ -20,8 +29,7 @@ def client(mock_settings_key):
 
 @pytest.mark.asyncio
 async def test_init_no_key():
-    with patch("app.services.spoonacular.settings") as mock_settings:
-        mock_settings.SPOONACULAR_API_KEY = None
+    with patch.object(settings, "SPOONACULAR_API_KEY", None):
         client = SpoonacularClient()
         assert client.api_key is None
 
@@ -43,11 +51,7 @@ async def test_search_recipes_success(client):
     }
 
     with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as mock_request:
-        mock_response = MagicMock()
-        mock_response.json.return_value = mock_response_data
-        mock_response.raise_for_status.return_value = None
-
-        mock_request.return_value = mock_response
+        mock_request.return_value = _response(mock_response_data)
 
         # Test with various parameters
         results = await client.search_recipes(
@@ -57,6 +61,7 @@ async def test_search_recipes_success(client):
             max_calories=500,
             diet="vegetarian",
             intolerances=["gluten", "dairy"],
+            profile="full",
         )
 
         assert len(results) == 2
@@ -89,10 +94,7 @@ async def test_search_recipes_with_constraints_and_enums(client):
     mock_response_data = {"results": []}
 
     with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as mock_request:
-        mock_response = MagicMock()
-        mock_response.json.return_value = mock_response_data
-        mock_response.raise_for_status.return_value = None
-        mock_request.return_value = mock_response
+        mock_request.return_value = _response(mock_response_data)
 
         constraints = DietaryConstraints(
             allergies=[Allergy.PEANUT, Allergy.DAIRY],
@@ -229,3 +231,114 @@ async def test_search_recipes_personalized_live():
             print(f"Calories: {cal_obj['amount']} {cal_obj['unit']}")
 
     print("\n--- TEST END ---\n")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_are_coalesced(client):
+    release = asyncio.Event()
+
+    async def slow_request(method, endpoint, params=None):
+        await release.wait()
+        return {"results": [{"id": 1}, {"id": 2}]}
+
+    stats = search_flight.stats
+    before = (stats.executions, stats.coalesced)
+    with patch.object(client, "_request", side_effect=slow_request) as mock_request:
+        calls = [
+            asyncio.create_task(
+                client.search_recipes(min_calories=400, diet=diet, number=5)
+            )
+            # Same canonical params: list order and case do not matter
+            for diet in ("vegan,Gluten Free", "gluten free,vegan", "vegan,gluten free")
+        ]
+        other = asyncio.create_task(client.search_recipes(min_calories=500, number=5))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls, other)
+
+    assert mock_request.await_count == 2
+    assert (stats.executions, stats.coalesced) == (before[0] + 2, before[1] + 2)
+    assert results[0] == results[1] == [{"id": 1}, {"id": 2}]
+    assert results[0] is not results[1]
+    assert len(search_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesced_search_failure_is_shared_then_retried(client):
+    release = asyncio.Event()
+
+    async def failing_request(method, endpoint, params=None):
+        await release.wait()
+        raise RuntimeError("quota exceeded")
+
+    with patch.object(client, "_request", side_effect=failing_request) as mock_request:
+        calls = [asyncio.create_task(client.search_recipes(number=3)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        outcomes = await asyncio.gather(*calls, return_exceptions=True)
+    assert mock_request.await_count == 1
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+
+    # The failure is not remembered: the next search goes out again
+    with patch.object(
+        client, "_request", new=AsyncMock(return_value={"results": [{"id": 7}]})
+    ):
+        assert await client.search_recipes(number=3) == [{"id": 7}]
+
+
+@pytest.mark.asyncio
+async def test_lean_search_requests_only_planner_fields(client):
+    with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = _response({"results": []})
+        await client.search_recipes(min_calories=400, max_calories=600, profile="lean")
+
+    params = mock_request.call_args[1]["params"]
+    assert params["addRecipeInformation"] is True
+    assert params["addRecipeNutrition"] is False
+    assert params["addRecipeInstructions"] is False
+    # Nutrient filters make Spoonacular report exactly the four macros
+    assert (params["minCalories"], params["maxCalories"]) == (400, 600)
+    assert params["minProtein"] == params["minCarbs"] == params["minFat"] == 0
+
+
+def test_lean_result_converts_like_a_full_one():
+    lean = {
+        "id": 5,
+        "title": "Lean Bowl",
+        "readyInMinutes": 15,
+        "nutrition": {
+            "nutrients": [
+                {"name": "Calories", "amount": 512.4, "unit": "kcal"},
+                {"name": "Protein", "amount": 31.2, "unit": "g"},
+                {"name": "Fat", "amount": 14.9, "unit": "g"},
+                {"name": "Carbohydrates", "amount": 61.0, "unit": "g"},
+            ]
+        },
+        "missedIngredients": [{"original": "1 cup rice"}],
+        "usedIngredients": [{"original": "2 eggs"}],
+        "diets": ["gluten free"],
+    }
+
+    recipe = MealPlanService._convert_to_recipe(lean)
+
+    assert recipe.nutrients.model_dump() == {
+        "calories": 512,
+        "protein": 31,
+        "carbohydrates": 61,
+        "fat": 14,
+    }
+    assert recipe.ingredients == ["1 cup rice", "2 eggs"]
+    assert recipe.preparation_time_minutes == 15
+
+
+@pytest.mark.asyncio
+async def test_get_recipe_information(client):
+    with patch("httpx.AsyncClient.request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = _response({"id": 42, "title": "Soup"})
+        info = await client.get_recipe_information(42)
+
+    assert info == {"id": 42, "title": "Soup"}
+    assert mock_request.call_args[0][1] == (
+        "https://api.spoonacular.com/recipes/42/information"
+    )
+    assert mock_request.call_args[1]["params"] == {"includeNutrition": False}
@@ -0,0 +1,167 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limit import TokenBucket
+from app.schemas.dietary import DietaryConstraints
+from app.services.meal_plan import MealPlanService
+from app.services.spoonacular import (
+    MealType,
+    QuotaExceededError,
+    SpoonacularClient,
+    SpoonacularRateLimiter,
+)
+from tests.fake_spoonacular import FakeSpoonacular
+from tests.test_meal_plan import _make_spoonacular_response
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _client(limiter: SpoonacularRateLimiter, **kwargs) -> SpoonacularClient:
+    return SpoonacularClient(
+        api_key="fake-key", limiter=limiter, backoff_base_seconds=0.001, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests_after_the_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(4):
+        await bucket.acquire()
+
+    # Two from the burst, then one every half second
+    assert clock.sleeps == [0.5, 0.5]
+    assert not bucket.try_acquire()
+    bucket.set_rate(4.0)
+    clock.now += 0.25
+    assert bucket.try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_quota_headers_are_tracked_and_the_reserve_is_kept():
+    fake = FakeSpoonacular(daily_quota=5, points_per_request=1, points_per_result=0)
+    limiter = SpoonacularRateLimiter(rate=1000, burst=10, reserve_points=2)
+    client = _client(limiter)
+
+    async with fake.installed():
+        for number in (1, 2, 3):
+            await client.search_recipes(number=number)
+        assert (limiter.stats.quota_used, limiter.stats.quota_left) == (3, 2)
+
+        with pytest.raises(QuotaExceededError):
+            await client.search_recipes(number=4)
+
+    # Refused locally: the reserve is never spent
+    assert len(fake.requests) == 3
+    assert limiter.stats.refused == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_quota_blocks_until_the_next_utc_day():
+    fake = FakeSpoonacular()
+    fake.exhaust()
+    now = datetime(2025, 6, 2, 15, 0, tzinfo=UTC)
+    limiter = SpoonacularRateLimiter(rate=1000, burst=10, now=lambda: now)
+    client = _client(limiter)
+
+    async with fake.installed():
+        with pytest.raises(QuotaExceededError):
+            await client.search_recipes(number=1)
+        with pytest.raises(QuotaExceededError):
+            await client.search_recipes(number=2)
+        # A 402 is not retried, and nothing is sent while blocked
+        assert len(fake.requests) == 1
+
+        fake.quota_used = 0
+        now += timedelta(hours=9)
+        assert len(await client.search_recipes(number=2)) == 2
+
+
+@pytest.mark.asyncio
+async def test_throttled_requests_are_retried_with_a_lower_rate():
+    fake = FakeSpoonacular()
+    fake.queued_errors = [429, 503]
+    limiter = SpoonacularRateLimiter(rate=8, burst=10)
+    client = _client(limiter)
+
+    async with fake.installed():
+        results = await client.search_recipes(number=3)
+
+    assert len(results) == 3
+    assert len(fake.requests) == 3
+    assert limiter.stats.retries == 2
+    assert limiter.stats.throttled == 1
+    # Halved by the 429, then nudged back up by the success
+    assert limiter.bucket.rate == pytest.approx(4.8)
+
+
+@pytest.mark.asyncio
+async def test_persistent_throttling_raises_quota_exceeded():
+    fake = FakeSpoonacular()
+    fake.queued_errors = [429] * 3
+    client = _client(SpoonacularRateLimiter(rate=1000, burst=10), max_retries=2)
+
+    async with fake.installed():
+        with pytest.raises(QuotaExceededError):
+            await client.search_recipes(number=3)
+    assert len(fake.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_long_retry_after_raises_quota_exceeded_without_waiting():
+    fake = FakeSpoonacular()
+    fake.queued_errors = [429]
+    fake.retry_after = "3600"
+    client = _client(SpoonacularRateLimiter(rate=1000, burst=10))
+
+    async with fake.installed():
+        with patch("app.services.spoonacular.asyncio.sleep") as sleep:
+            with pytest.raises(QuotaExceededError):
+                await client.search_recipes(number=3)
+    sleep.assert_not_called()
+    assert len(fake.requests) == 1
+
+    # A Retry-After within the cap is honoured
+    assert client._backoff(0, 2.0) == 2.0
+    assert client._backoff(5, None) <= settings.SPOONACULAR_BACKOFF_MAX_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_planner_falls_back_to_catalog_when_quota_is_exhausted():
+    fake = FakeSpoonacular()
+    fake.exhaust()
+    limiter = SpoonacularRateLimiter(rate=1000, burst=10)
+    local = [_make_spoonacular_response(7, "Catalog Stew", 600, 30, 60, 20)]
+    catalog = AsyncMock()
+    catalog.search = AsyncMock(return_value=local)
+    constraints = DietaryConstraints()
+
+    async with fake.installed():
+        service = MealPlanService(spoonacular_client=_client(limiter), catalog=catalog)
+        pool = await service._fetch_recipe_pool(
+            MealType.MAIN_COURSE, 600, constraints, 20
+        )
+        assert pool == local
+
+        without_catalog = MealPlanService(
+            spoonacular_client=_client(limiter), catalog=None
+        )
+        with pytest.raises(QuotaExceededError):
+            await without_catalog._fetch_recipe_pool(
+                MealType.MAIN_COURSE, 600, constraints, 20
+            )
@@ -1,5 +1,14 @@
+from unittest.mock import AsyncMock
+
 import pytest
-from httpx import AsyncClient
+import sqlalchemy as sa
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from app.api import deps
+from app.db.session import get_db
+from app.main import app
+from app.models.user import User
 
 BASE = "/api/v1/users"
 
@@ -54,3 +63,56 @@ async def test_update_user_me_scalar_fields(client: AsyncClient):
     data = response.json()
     assert data["age"] == 35
     assert data["weight"] == 80.0
+
+
+@pytest.fixture
+async def auth_client(db, mock_user):
+    """Client that runs the real user dependencies against the test DB."""
+
+    async def override_get_db():
+        yield db
+
+    async def override_get_auth_payload():
+        return {"sub": mock_user.id}
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[deps.get_auth_payload] = override_get_auth_payload
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        yield ac
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_profile_is_cached_until_update_user_me(auth_client, db, mock_user):
+    assert (await auth_client.get(f"{BASE}/me")).json()["age"] == 30
+
+    # A write that bypasses update_user_me is not seen until the entry expires
+    await db.execute(sa.update(User).where(User.id == mock_user.id).values(age=50))
+    await db.commit()
+    assert (await auth_client.get(f"{BASE}/me")).json()["age"] == 30
+
+    response = await auth_client.put(f"{BASE}/me", json={"weight": 81.0})
+    assert response.status_code == 200
+
+    data = (await auth_client.get(f"{BASE}/me")).json()
+    assert data["age"] == 50
+    assert data["weight"] == 81.0
+
+
+@pytest.mark.asyncio
+async def test_user_id_dependency_uses_cached_profile(db, mock_user):
+    payload = {"sub": mock_user.id}
+    assert await deps.get_current_user_id(db=db, payload=payload) == mock_user.id
+
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_user_id(db=db, payload={"sub": "missing"})
+    assert exc.value.status_code == 404
+
+    await deps.get_current_user_profile(db=db, payload=payload)
+    idle_db = AsyncMock()
+    assert await deps.get_current_user_id(db=idle_db, payload=payload) == mock_user.id
+    idle_db.execute.assert_not_awaited()
@@ -252,6 +252,10 @@ export type GoogleCalendarStatus = {
    * Needs Reconnect
    */
   needs_reconnect?: boolean;
+  /**
+   * Token Valid At
+   */
+  token_valid_at?: string | null;
 };
 
 /**
@@ -266,6 +270,18 @@ export type GoogleCalendarSyncResult = {
    * Sync Batch Id
    */
   sync_batch_id: string;
+  /**
+   * Added
+   */
+  added?: number;
+  /**
+   * Removed
+   */
+  removed?: number;
+  /**
+   * Unchanged
+   */
+  unchanged?: number;
 };
 
 /**
@@ -1346,11 +1362,34 @@ export type ConnectCalendarApiV1CalendarGoogleConnectPostResponse =
 
 export type GetStatusApiV1CalendarGoogleStatusGetData = {
   body?: never;
+  headers?: {
+    /**
+     * If-None-Match
+     */
+    'if-none-match'?: string | null;
+  };
   path?: never;
-  query?: never;
+  query?: {
+    /**
+     * Verify
+     *
+     * Ask Clerk for the Google token now instead of serving the last recorded check
+     */
+    verify?: boolean;
+  };
   url: '/api/v1/calendar/google/status';
 };
 
+export type GetStatusApiV1CalendarGoogleStatusGetErrors = {
+  /**
+   * Validation Error
+   */
+  422: HttpValidationError;
+};
+
+export type GetStatusApiV1CalendarGoogleStatusGetError =
+  GetStatusApiV1CalendarGoogleStatusGetErrors[keyof GetStatusApiV1CalendarGoogleStatusGetErrors];
+
 export type GetStatusApiV1CalendarGoogleStatusGetResponses = {
   /**
    * Successful Response
@@ -19,6 +19,7 @@ export interface GoogleCalendarStatus {
   last_synced_at: string | null;
   sync_status: string | null;
   needs_reconnect: boolean;
+  token_valid_at?: string | null;
 }
 
 export interface GoogleCalendarSyncResult {